@@ -1,6 +1,7 @@
 """ASR API Routes"""
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form
 
+from app.core.exceptions import ProviderUnavailableError
 from app.schemas.asr import ASRResponse, ASRResponseDetail, ASRRequest
 from app.services.asr_service import asr_service
 
@@ -37,6 +38,8 @@ async def recognize_audio(
                 last_package_delay=result.get("last_package_delay"),
             )
 
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -68,6 +71,8 @@ async def recognize_audio_by_path(request: ASRRequest):
             last_package_delay=result.get("last_package_delay"),
         )
 
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,17 +1,24 @@
 """Consultation API Routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
-from app.schemas.consultation import ConsultationRequest, ConsultationResponse
+from app.core.exceptions import ProviderUnavailableError
+from app.schemas.consultation import ConsultationRequest, ConsultationResponse, SymptomInfo
+from app.services.consultation_service import consultation_service
 from app.services.vector_search import vector_search_service
 
 router = APIRouter(prefix="/consultation", tags=["Consultation"])
 
 
 @router.post("/query", response_model=ConsultationResponse)
-async def query_symptoms(request: ConsultationRequest) -> ConsultationResponse:
+async def query_symptoms(request: ConsultationRequest, response: Response) -> ConsultationResponse:
     """
     Query relevant medical information based on user description
 
+    Matching symptoms are retrieved (hybrid by default: symptom
+    names/aliases + vectors) and returned with their definitions and
+    associated diseases. Per-stage latency is reported in `timings_ms` and
+    in the `Server-Timing` header.
+
     Args:
         request: Request body containing user query
 
@@ -19,23 +26,28 @@ async def query_symptoms(request: ConsultationRequest) -> ConsultationResponse:
         List of matched medical information
     """
     try:
-        # TODO: Implement query vectorization
-        query_vector: list[float] = []
-
-        # Execute vector search
-        results = await vector_search_service.search(
-            query_vector=query_vector,
-            limit=request.top_k,
-        )
-
-        return ConsultationResponse(
+        consultation = await consultation_service.query(
             query=request.query,
-            results=[],
-            total_matches=len(results),
+            limit=request.top_k,
+            mode=request.mode,
         )
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    timings = consultation["timings_ms"]
+    response.headers["Server-Timing"] = ", ".join(f"{stage};dur={ms}" for stage, ms in timings.items())
+
+    results = consultation["results"]
+    return ConsultationResponse(
+        query=request.query,
+        results=[SymptomInfo(**result) for result in results],
+        total_matches=len(results),
+        timings_ms=timings,
+        vector_status=consultation.get("vector_status"),
+    )
+
 
 @router.get("/health")
 async def health_check():
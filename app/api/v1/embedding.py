@@ -1,106 +1,407 @@
 """Embedding API Routes"""
-from fastapi import APIRouter, HTTPException, Query
+import json
+from typing import AsyncIterator
 
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.exceptions import ProviderUnavailableError
+from app.core.vectors import Vector, to_base64, to_bytes
 from app.models.vector_db import qdrant_client
-from app.schemas.embedding import EmbeddingRequest, EmbeddingResponse, StoreRequest, StoreResponse
+from app.schemas.embedding import (
+    CatalogVectorizeRequest,
+    EmbeddingBatchRequest,
+    EmbeddingEncoding,
+    EmbeddingRequest,
+    EmbeddingResponse,
+    SearchBatchItem,
+    SearchBatchRequest,
+    SearchBatchResponse,
+    SearchMode,
+    SearchRequest,
+    StoreBatchItemResult,
+    StoreBatchRequest,
+    StoreBatchResponse,
+    StoreRequest,
+    StoreResponse,
+)
+from app.services.catalog_vectorizer import catalog_vectorizer
 from app.services.embedding_service import embedding_service
+from app.services.hybrid_search import hybrid_search_service
+from app.services.ingest_service import ingest_service
 from app.services.vector_search import vector_search_service
 
 router = APIRouter(prefix="/embedding", tags=["Embedding"])
 
+BINARY_MEDIA_TYPE = "application/octet-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Payload index types that have no exact-value match
+UNFILTERABLE_SCHEMAS = ("datetime", "text", "geo")
+
+
+def _parse_filters(items: list[str] | None) -> dict | None:
+    """Parse repeated ``key:value`` filter query parameters
+
+    Values are converted to the type of the field's payload index
+    (QDRANT_PAYLOAD_INDEXES), strings otherwise. A key given more than
+    once matches any of its values. Fields indexed as datetime, text or
+    geo cannot be matched by value and are rejected.
+    """
+    if not items:
+        return None
+
+    filters: dict[str, list] = {}
+    for item in items:
+        key, sep, raw = item.partition(":")
+        key, raw = key.strip(), raw.strip()
+        if not sep or not key or not raw:
+            raise HTTPException(status_code=422, detail=f"Invalid filter {item!r}, expected key:value")
+
+        schema = settings.QDRANT_PAYLOAD_INDEXES.get(key, "keyword").lower()
+        if schema in UNFILTERABLE_SCHEMAS:
+            raise HTTPException(status_code=422, detail=f"Filtering on {schema} field {key} is not supported")
+        try:
+            if schema == "integer":
+                value = int(raw)
+            elif schema == "float":
+                value = float(raw)
+            elif schema == "bool":
+                if raw.lower() not in ("true", "false"):
+                    raise ValueError(raw)
+                value = raw.lower() == "true"
+            else:
+                value = raw
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid {schema} value for filter {key}: {raw}")
+        filters.setdefault(key, []).append(value)
+
+    return {key: values[0] if len(values) == 1 else values for key, values in filters.items()}
+
+
+async def _search(query: str, top_k: int, mode: SearchMode, filters: dict | None) -> dict:
+    """Run a search and build the response body"""
+    try:
+        # Execute search (vector mode includes embedding and retrieval)
+        search = await hybrid_search_service.search(query=query, limit=top_k, mode=mode, filters=filters)
+        results = search["results"]
+
+        response = {
+            "query": query,
+            "mode": mode,
+            "total_matches": len(results),
+            "results": results,
+        }
+        if filters:
+            response["filter"] = filters
+        if "vector_status" in search:
+            response["vector_status"] = search["vector_status"]
+        return response
+
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 
 @router.get("/search", response_model=dict)
 async def search_by_embedding(
     query: str = Query(..., description="Query text for semantic search", min_length=1, max_length=1000),
     top_k: int = Query(default=5, description="Number of results to return", ge=1, le=20),
+    mode: SearchMode = Query(default="vector", description="Retrieval mode: vector, lexical or hybrid"),
+    filter: list[str] | None = Query(
+        default=None, description="Payload condition as key:value; repeat a key to match any of its values"
+    ),
 ):
     """
     Semantic search using text embedding
 
     This endpoint:
-    1. Converts the query text to an embedding vector using Bailian text-embedding-v4
+    1. Converts the query text to an embedding vector using the configured embedding provider
     2. Searches the vector database for similar medical information
     3. Returns the most relevant results
 
+    With `mode=lexical` symptom names and aliases are searched with BM25
+    instead; `mode=hybrid` runs both and fuses the rankings (RRF). In hybrid
+    mode `vector_status` is `timeout` when lexical hits were returned
+    without waiting for a slow vector search.
+
+    Filters restrict results to points whose payload (e.g. `/embedding/store`
+    metadata) matches. Qdrant applies them during the index traversal;
+    declare frequently filtered fields in `QDRANT_PAYLOAD_INDEXES` so they
+    are indexed.
+
     - **query**: The query text to search for
     - **top_k**: Number of results to return (default: 5, max: 20)
+    - **mode**: `vector` (default), `lexical` or `hybrid`
+    - **filter**: e.g. `filter=department:cardiology&filter=department:neurology&filter=source:manual`
     """
-    try:
-        # Execute vector search (includes embedding and retrieval)
-        results = await vector_search_service.search(
-            query=query,
-            limit=top_k,
+    return await _search(query, top_k, mode, _parse_filters(filter))
+
+
+@router.post("/search", response_model=dict)
+async def search_by_embedding_post(request: SearchRequest):
+    """
+    Semantic search with a JSON body
+
+    Same as `GET /embedding/search`, with filters given as an object of
+    field -> value or list of values (match any); all fields must match.
+
+    - **query**: The query text to search for
+    - **top_k**: Number of results to return (default: 5, max: 20)
+    - **mode**: `vector` (default), `lexical` or `hybrid`
+    - **filter**: e.g. `{"department": ["cardiology", "neurology"], "source": "manual"}`
+    """
+    return await _search(request.query, request.top_k, request.mode, request.filter or None)
+
+
+def _embedding_response(
+    http_request: Request, text: str, embedding: Vector, encoding: EmbeddingEncoding
+) -> EmbeddingResponse | Response:
+    """Build an embedding response in the encoding the client asked for
+
+    Clients sending ``Accept: application/octet-stream`` get the raw
+    little-endian float32 bytes; otherwise a JSON body with the vector as a
+    float array or base64 string.
+    """
+    if BINARY_MEDIA_TYPE in http_request.headers.get("accept", ""):
+        return Response(
+            content=to_bytes(embedding),
+            media_type=BINARY_MEDIA_TYPE,
+            headers={"X-Embedding-Dimension": str(len(embedding)), "X-Embedding-Dtype": "float32-le"},
         )
 
-        return {
-            "query": query,
-            "total_matches": len(results),
-            "results": results,
-        }
+    return EmbeddingResponse(
+        text=text,
+        embedding=to_base64(embedding) if encoding == "base64" else embedding.tolist(),
+        dimension=len(embedding),
+        encoding=encoding,
+    )
 
+
+@router.post("/search/batch", response_model=SearchBatchResponse)
+async def search_by_embedding_batch(request: SearchBatchRequest):
+    """
+    Vector search for many queries at once
+
+    All queries are embedded in one provider call and searched with one
+    Qdrant batch request, so e.g. ten symptom phrases cost two round trips
+    instead of twenty. Repeated and recently searched queries are served
+    from the search cache.
+
+    - **queries**: Query texts
+    - **top_k**: Number of results to return per query (default: 5, max: 20)
+    - **filter**: Payload conditions applied to every query
+    """
+    if len(request.queries) > settings.EMBEDDING_SEARCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many queries, maximum is {settings.EMBEDDING_SEARCH_MAX_QUERIES}",
+        )
+    if any(not query or not query.strip() or len(query) > 1000 for query in request.queries):
+        raise HTTPException(status_code=422, detail="Queries must be non-empty and at most 1000 characters")
+
+    try:
+        results = await vector_search_service.search_batch(
+            request.queries, limit=request.top_k, filters=request.filter or None
+        )
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    return SearchBatchResponse(
+        total=len(request.queries),
+        results=[
+            SearchBatchItem(query=query, total_matches=len(matches), results=matches)
+            for query, matches in zip(request.queries, results)
+        ],
+    )
+
 
-@router.post("/embed", response_model=EmbeddingResponse)
-async def create_embedding(request: EmbeddingRequest):
+@router.post(
+    "/embed",
+    response_model=EmbeddingResponse,
+    responses={200: {"content": {BINARY_MEDIA_TYPE: {}}}},
+)
+async def create_embedding(request: EmbeddingRequest, http_request: Request):
     """
     Create embedding vector from text
 
     This endpoint converts the input text to an embedding vector using
-    Bailian text-embedding-v4 model.
+    the configured embedding provider (EMBEDDING_PROVIDER).
 
     - **text**: The text to convert to embedding
+    - **encoding**: `float` (JSON array) or `base64` (little-endian float32)
+
+    Send `Accept: application/octet-stream` to receive the raw float32 bytes.
     """
     try:
         embedding = await embedding_service.embed_text(request.text)
+        return _embedding_response(http_request, request.text, embedding, request.encoding)
 
-        return EmbeddingResponse(
-            text=request.text,
-            embedding=embedding,
-            dimension=len(embedding),
-        )
-
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/embed", response_model=EmbeddingResponse)
+@router.get(
+    "/embed",
+    response_model=EmbeddingResponse,
+    responses={200: {"content": {BINARY_MEDIA_TYPE: {}}}},
+)
 async def create_embedding_get(
+    http_request: Request,
     text: str = Query(..., description="Text to convert to embedding", min_length=1, max_length=2048),
+    encoding: EmbeddingEncoding = Query(default="float", description="Vector encoding: float or base64"),
 ):
     """
     Create embedding vector from text (GET method)
 
     This endpoint converts the input text to an embedding vector using
-    Bailian text-embedding-v4 model.
+    the configured embedding provider (EMBEDDING_PROVIDER).
 
     - **text**: The text to convert to embedding
+    - **encoding**: `float` (JSON array) or `base64` (little-endian float32)
+
+    Send `Accept: application/octet-stream` to receive the raw float32 bytes.
     """
     try:
         embedding = await embedding_service.embed_text(text)
+        return _embedding_response(http_request, text, embedding, encoding)
 
-        return EmbeddingResponse(
-            text=text,
-            embedding=embedding,
-            dimension=len(embedding),
-        )
-
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_ndjson_texts(body: bytes) -> list[str]:
+    """Parse texts from an NDJSON upload
+
+    Each line may be a JSON string, a JSON object with a "text" field, or
+    plain text. Blank lines are skipped.
+    """
+    texts = []
+    for line in body.decode("utf-8").splitlines():
+        raw = line.strip()
+        if not raw:
+            continue
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        if isinstance(value, dict):
+            value = value.get("text", "")
+        texts.append(value if isinstance(value, str) else raw)
+    return texts
+
+
+async def _stream_embedding_lines(texts: list[str], encoding: EmbeddingEncoding) -> AsyncIterator[bytes]:
+    """Embed texts and encode each result as one NDJSON line"""
+    async for start, results in embedding_service.stream_batch(texts):
+        lines = []
+        for offset, vector in enumerate(results):
+            if isinstance(vector, Exception):
+                item = {"index": start + offset, "error": str(vector)}
+            else:
+                item = {
+                    "index": start + offset,
+                    "embedding": to_base64(vector) if encoding == "base64" else vector.tolist(),
+                    "dimension": len(vector),
+                }
+            lines.append(json.dumps(item))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+@router.post(
+    "/embed/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": EmbeddingBatchRequest.model_json_schema()},
+                NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+            },
+            "required": True,
+        }
+    },
+)
+async def create_embeddings_batch(
+    http_request: Request,
+    encoding: EmbeddingEncoding | None = Query(
+        default=None, description="Vector encoding: float or base64 (overrides the JSON body)"
+    ),
+):
+    """
+    Embed many texts and stream the results as NDJSON
+
+    The request body is either JSON (`{"texts": [...], "encoding": "float"}`)
+    or an NDJSON upload (`Content-Type: application/x-ndjson`, one JSON
+    string, `{"text": ...}` object or plain text per line). Texts are
+    embedded in provider-sized batches and each result line
+    (`{"index", "embedding", "dimension"}` or `{"index", "error"}`) is
+    streamed as soon as its batch completes, so lines may arrive out of
+    input order.
+
+    - **encoding**: `float` (JSON array) or `base64` (little-endian float32)
+    """
+    if NDJSON_MEDIA_TYPE in http_request.headers.get("content-type", ""):
+        texts = _parse_ndjson_texts(await http_request.body())
+        if not texts:
+            raise HTTPException(status_code=422, detail="NDJSON body contains no texts")
+    else:
+        try:
+            body = EmbeddingBatchRequest.model_validate_json(await http_request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=json.loads(e.json()))
+        texts = body.texts
+        encoding = encoding or body.encoding
+
+    if len(texts) > settings.EMBEDDING_STREAM_MAX_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts, maximum is {settings.EMBEDDING_STREAM_MAX_TEXTS}",
+        )
+
+    return StreamingResponse(
+        _stream_embedding_lines(texts, encoding or "float"),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.get("/health")
 async def health_check():
     """Embedding service health check"""
+    provider = embedding_service.provider
+    service = f"{provider.name}-embedding"
     try:
-        # Try to initialize service to check if configuration is correct
-        from app.services.embedding_service import EmbeddingService
-
-        EmbeddingService()
-        return {"status": "healthy", "service": "bailian-embedding"}
+        # Check that the configured provider is usable
+        provider.ensure_ready()
+        return {
+            "status": "healthy",
+            "service": service,
+            "model": provider.model,
+            "dimension": embedding_service.dimension,
+            "provider_calls": embedding_service.provider_stats(),
+        }
     except Exception as e:
-        return {"status": "unhealthy", "service": "bailian-embedding", "error": str(e)}
+        return {"status": "unhealthy", "service": service, "error": str(e)}
+
+
+@router.get("/cache/stats")
+async def embedding_cache_stats():
+    """Embedding cache hit/miss/eviction counters"""
+    return embedding_service.cache_stats()
+
+
+@router.get("/search/cache/stats")
+async def search_cache_stats():
+    """Search result cache hit/miss/invalidation counters"""
+    return vector_search_service.cache_stats()
 
 
 @router.post("/store", response_model=StoreResponse)
@@ -109,7 +410,7 @@ async def store_embedding(request: StoreRequest):
     Store text embedding in Qdrant vector database
 
     This endpoint:
-    1. Converts the input text to an embedding vector using Bailian text-embedding-v4
+    1. Converts the input text to an embedding vector using the configured embedding provider
     2. Stores the vector and original text in Qdrant
     3. Returns the point ID and embedding info
 
@@ -126,7 +427,7 @@ async def store_embedding(request: StoreRequest):
             payload.update(request.metadata)
 
         # Store in Qdrant
-        point_id = qdrant_client.upsert_point(vector=embedding, payload=payload)
+        point_id = await qdrant_client.upsert_point(vector=embedding, payload=payload)
 
         return StoreResponse(
             point_id=point_id,
@@ -134,5 +435,73 @@ async def store_embedding(request: StoreRequest):
             dimension=len(embedding),
         )
 
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/store/batch", response_model=StoreBatchResponse)
+async def store_embeddings_batch(request: StoreBatchRequest):
+    """
+    Embed and store many texts in Qdrant
+
+    Texts are embedded in batches and upserted in large batches with
+    bounded parallelism. A failing item (empty or too-long text, provider
+    or upsert error) does not fail the request; check each item's `status`
+    and `error`.
+
+    - **items**: Texts to store, each with optional metadata
+    - **wait**: Wait until Qdrant has applied the upserts (default: false,
+      points become searchable shortly after the response)
+    """
+    if len(request.items) > settings.EMBEDDING_STORE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items, maximum is {settings.EMBEDDING_STORE_MAX_ITEMS}",
+        )
+
+    try:
+        results = await ingest_service.ingest(
+            [(item.text, item.metadata) for item in request.items],
+            wait=request.wait,
+        )
+        stored = sum(1 for result in results if result["status"] == "stored")
+
+        return StoreBatchResponse(
+            total=len(results),
+            stored=stored,
+            failed=len(results) - stored,
+            dimension=embedding_service.dimension,
+            results=[StoreBatchItemResult(**result) for result in results],
+        )
+
+    except ProviderUnavailableError as e:
+        raise HTTPException(status_code=e.code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/catalog/vectorize", status_code=202)
+async def vectorize_catalog(request: CatalogVectorizeRequest):
+    """
+    Start vectorizing the SympGAN catalog in the background
+
+    Symptoms and diseases are embedded from name, aliases and definition
+    and upserted with point IDs derived from their CUI. Only rows that are
+    new or whose content changed since the last run are embedded, and an
+    interrupted run resumes where it stopped. Same job as
+    `scripts/vectorize_catalog.py`.
+
+    - **kinds**: `symptom` and/or `disease` (default: both)
+    - **force**: Re-embed every row (e.g. after changing the embedding model)
+    """
+    if not catalog_vectorizer.start(request.kinds, force=request.force):
+        raise HTTPException(status_code=409, detail="Catalog vectorization is already running")
+    return catalog_vectorizer.status()
+
+
+@router.get("/catalog/vectorize")
+async def catalog_vectorize_status():
+    """Progress of the current or last catalog vectorization run"""
+    return catalog_vectorizer.status()
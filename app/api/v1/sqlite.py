@@ -52,7 +52,14 @@ async def get_db_session():
         yield session
 
 
+async def get_db_read_session():
+    """Dependency for getting a read-only database session (reader pool)"""
+    async with await SQLiteClientWrapper.get_read_session() as session:
+        yield session
+
+
 SessionDep = Annotated[object, Depends(get_db_session)]
+ReadSessionDep = Annotated[object, Depends(get_db_read_session)]
 
 
 # ============================================================================
@@ -76,7 +83,7 @@ async def create_disease(session: SessionDep, data: DiseaseCreate):
 
 
 @router.get("/diseases/{disease_id}", response_model=DiseaseWithSymptomsResponse)
-async def get_disease(disease_id: int, session: SessionDep):
+async def get_disease(disease_id: int, session: ReadSessionDep):
     """Get a disease by ID with symptoms
 
     Args:
@@ -123,24 +130,33 @@ async def get_disease(disease_id: int, session: SessionDep):
 
 @router.get("/diseases", response_model=DiseaseListResponse)
 async def list_diseases(
-    session: SessionDep,
-    skip: Annotated[int, Query(ge=0, description="Number of records to skip")] = 0,
+    session: ReadSessionDep,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum records to return")] = 100,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+    include_total: Annotated[bool, Query(description="Also return the total count")] = False,
+    skip: Annotated[
+        int, Query(ge=0, deprecated=True, description="Number of records to skip (use cursor instead)")
+    ] = 0,
 ):
     """List all diseases with pagination
 
     Args:
         session: Database session
-        skip: Number of records to skip
         limit: Maximum records to return
+        cursor: next_cursor of the previous page
+        include_total: Also return the total count
+        skip: Number of records to skip (deprecated)
 
     Returns:
         List of diseases
     """
-    total, diseases = await DiseaseService.list(session, skip=skip, limit=limit)
+    total, diseases, next_cursor = await DiseaseService.list(
+        session, limit=limit, cursor=cursor, include_total=include_total, skip=skip
+    )
 
     return DiseaseListResponse(
         total=total,
+        next_cursor=next_cursor,
         items=[
             DiseaseResponse(
                 id=d.id,
@@ -159,10 +175,10 @@ async def list_diseases(
 @router.get("/diseases/search/{query}", response_model=DiseaseListResponse)
 async def search_diseases(
     query: str,
-    session: SessionDep,
+    session: ReadSessionDep,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum results to return")] = 10,
 ):
-    """Search diseases by name
+    """Search diseases by name, alias and description (full-text, prefix matching)
 
     Args:
         query: Search query string
@@ -170,7 +186,7 @@ async def search_diseases(
         limit: Maximum results to return
 
     Returns:
-        List of matching diseases
+        List of matching diseases, ranked by BM25
     """
     diseases = await DiseaseService.search_by_name(session, query, limit)
 
@@ -258,7 +274,7 @@ async def create_symptom(session: SessionDep, data: SymptomCreate):
 
 
 @router.get("/symptoms/{symptom_id}", response_model=SymptomWithDiseasesResponse)
-async def get_symptom(symptom_id: int, session: SessionDep):
+async def get_symptom(symptom_id: int, session: ReadSessionDep):
     """Get a symptom by ID with diseases
 
     Args:
@@ -305,24 +321,33 @@ async def get_symptom(symptom_id: int, session: SessionDep):
 
 @router.get("/symptoms", response_model=SymptomListResponse)
 async def list_symptoms(
-    session: SessionDep,
-    skip: Annotated[int, Query(ge=0, description="Number of records to skip")] = 0,
+    session: ReadSessionDep,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum records to return")] = 100,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+    include_total: Annotated[bool, Query(description="Also return the total count")] = False,
+    skip: Annotated[
+        int, Query(ge=0, deprecated=True, description="Number of records to skip (use cursor instead)")
+    ] = 0,
 ):
     """List all symptoms with pagination
 
     Args:
         session: Database session
-        skip: Number of records to skip
         limit: Maximum records to return
+        cursor: next_cursor of the previous page
+        include_total: Also return the total count
+        skip: Number of records to skip (deprecated)
 
     Returns:
         List of symptoms
     """
-    total, symptoms = await SymptomService.list(session, skip=skip, limit=limit)
+    total, symptoms, next_cursor = await SymptomService.list(
+        session, limit=limit, cursor=cursor, include_total=include_total, skip=skip
+    )
 
     return SymptomListResponse(
         total=total,
+        next_cursor=next_cursor,
         items=[
             SymptomResponse(
                 id=s.id,
@@ -343,10 +368,10 @@ async def list_symptoms(
 @router.get("/symptoms/search/{query}", response_model=SymptomListResponse)
 async def search_symptoms(
     query: str,
-    session: SessionDep,
+    session: ReadSessionDep,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum results to return")] = 10,
 ):
-    """Search symptoms by name
+    """Search symptoms by name, alias and description (full-text, prefix matching)
 
     Args:
         query: Search query string
@@ -354,7 +379,7 @@ async def search_symptoms(
         limit: Maximum results to return
 
     Returns:
-        List of matching symptoms
+        List of matching symptoms, ranked by BM25
     """
     symptoms = await SymptomService.search_by_name(session, query, limit)
 
@@ -452,7 +477,7 @@ async def create_disease_symptom_association(
 
 
 @router.get("/diseases/{disease_id}/symptoms", response_model=SymptomListResponse)
-async def get_disease_symptoms(disease_id: int, session: SessionDep):
+async def get_disease_symptoms(disease_id: int, session: ReadSessionDep):
     """Get all symptoms associated with a disease
 
     Args:
@@ -494,7 +519,7 @@ async def get_disease_symptoms(disease_id: int, session: SessionDep):
 
 
 @router.get("/symptoms/{symptom_id}/diseases", response_model=DiseaseListResponse)
-async def get_symptom_diseases(symptom_id: int, session: SessionDep):
+async def get_symptom_diseases(symptom_id: int, session: ReadSessionDep):
     """Get all diseases associated with a symptom
 
     Args:
@@ -539,22 +564,21 @@ async def get_symptom_diseases(symptom_id: int, session: SessionDep):
 
 
 @router.post("/conversations", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
-async def create_conversation(session: SessionDep, data: ConversationCreate):
+async def create_conversation(data: ConversationCreate):
     """Create a new conversation
 
     Args:
-        session: Database session
         data: Conversation creation data
 
     Returns:
         Created conversation
     """
-    conversation = await ConversationService.create(session, data.model_dump())
+    conversation = await ConversationService.create(data.model_dump())
     return conversation
 
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationWithMessagesResponse)
-async def get_conversation(conversation_id: int, session: SessionDep):
+async def get_conversation(conversation_id: int, session: ReadSessionDep):
     """Get a conversation by ID with messages
 
     Args:
@@ -594,30 +618,40 @@ async def get_conversation(conversation_id: int, session: SessionDep):
         started_at=conversation.started_at,
         created_at=conversation.created_at,
         updated_at=conversation.updated_at,
+        message_count=conversation.message_count,
         messages=messages,
     )
 
 
 @router.get("/conversations", response_model=ConversationListResponse)
 async def list_conversations(
-    session: SessionDep,
-    skip: Annotated[int, Query(ge=0, description="Number of records to skip")] = 0,
+    session: ReadSessionDep,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum records to return")] = 100,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+    include_total: Annotated[bool, Query(description="Also return the total count")] = False,
+    skip: Annotated[
+        int, Query(ge=0, deprecated=True, description="Number of records to skip (use cursor instead)")
+    ] = 0,
 ):
     """List all conversations with pagination (most recent first)
 
     Args:
         session: Database session
-        skip: Number of records to skip
         limit: Maximum records to return
+        cursor: next_cursor of the previous page
+        include_total: Also return the total count
+        skip: Number of records to skip (deprecated)
 
     Returns:
         List of conversations
     """
-    total, conversations = await ConversationService.list(session, skip=skip, limit=limit)
+    total, conversations, next_cursor = await ConversationService.list(
+        session, limit=limit, cursor=cursor, include_total=include_total, skip=skip
+    )
 
     return ConversationListResponse(
         total=total,
+        next_cursor=next_cursor,
         items=[
             ConversationResponse(
                 id=c.id,
@@ -629,6 +663,7 @@ async def list_conversations(
                 started_at=c.started_at,
                 created_at=c.created_at,
                 updated_at=c.updated_at,
+                message_count=c.message_count,
             )
             for c in conversations
         ],
@@ -636,12 +671,11 @@ async def list_conversations(
 
 
 @router.patch("/conversations/{conversation_id}", response_model=ConversationResponse)
-async def update_conversation(conversation_id: int, session: SessionDep, data: ConversationUpdate):
+async def update_conversation(conversation_id: int, data: ConversationUpdate):
     """Update a conversation
 
     Args:
         conversation_id: Conversation ID
-        session: Database session
         data: Update data
 
     Returns:
@@ -650,7 +684,7 @@ async def update_conversation(conversation_id: int, session: SessionDep, data: C
     Raises:
         HTTPException: If conversation not found
     """
-    conversation = await ConversationService.update(session, conversation_id, data)
+    conversation = await ConversationService.update(conversation_id, data)
     if not conversation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
 
@@ -664,21 +698,21 @@ async def update_conversation(conversation_id: int, session: SessionDep, data: C
         started_at=conversation.started_at,
         created_at=conversation.created_at,
         updated_at=conversation.updated_at,
+        message_count=conversation.message_count,
     )
 
 
 @router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_conversation(conversation_id: int, session: SessionDep):
+async def delete_conversation(conversation_id: int):
     """Delete a conversation (and all associated messages)
 
     Args:
         conversation_id: Conversation ID
-        session: Database session
 
     Raises:
         HTTPException: If conversation not found
     """
-    deleted = await ConversationService.delete(session, conversation_id)
+    deleted = await ConversationService.delete(conversation_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
 
@@ -689,17 +723,16 @@ async def delete_conversation(conversation_id: int, session: SessionDep):
 
 
 @router.post("/messages", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-async def create_message(session: SessionDep, data: MessageCreate):
+async def create_message(data: MessageCreate):
     """Create a new message
 
     Args:
-        session: Database session
         data: Message creation data
 
     Returns:
         Created message
     """
-    message = await MessageService.create(session, data.model_dump())
+    message = await MessageService.create(data.model_dump())
     return MessageResponse(
         id=message.id,
         conversation_id=message.conversation_id,
@@ -711,7 +744,7 @@ async def create_message(session: SessionDep, data: MessageCreate):
 
 
 @router.get("/messages/{message_id}", response_model=MessageResponse)
-async def get_message(message_id: int, session: SessionDep):
+async def get_message(message_id: int, session: ReadSessionDep):
     """Get a message by ID
 
     Args:
@@ -741,17 +774,23 @@ async def get_message(message_id: int, session: SessionDep):
 @router.get("/conversations/{conversation_id}/messages", response_model=MessageListResponse)
 async def list_conversation_messages(
     conversation_id: int,
-    session: SessionDep,
-    skip: Annotated[int, Query(ge=0, description="Number of records to skip")] = 0,
+    session: ReadSessionDep,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum records to return")] = 100,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+    include_total: Annotated[bool, Query(description="Also return the total count")] = False,
+    skip: Annotated[
+        int, Query(ge=0, deprecated=True, description="Number of records to skip (use cursor instead)")
+    ] = 0,
 ):
     """List all messages in a conversation (oldest first for chat history)
 
     Args:
         conversation_id: Conversation ID
         session: Database session
-        skip: Number of records to skip
         limit: Maximum records to return
+        cursor: next_cursor of the previous page
+        include_total: Also return the total count
+        skip: Number of records to skip (deprecated)
 
     Returns:
         List of messages
@@ -761,12 +800,13 @@ async def list_conversation_messages(
     if not conversation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
 
-    total, messages = await MessageService.list_by_conversation(
-        session, conversation_id, skip=skip, limit=limit
+    total, messages, next_cursor = await MessageService.list_by_conversation(
+        session, conversation_id, limit=limit, cursor=cursor, include_total=include_total, skip=skip
     )
 
     return MessageListResponse(
         total=total,
+        next_cursor=next_cursor,
         items=[
             MessageResponse(
                 id=m.id,
@@ -782,12 +822,11 @@ async def list_conversation_messages(
 
 
 @router.patch("/messages/{message_id}", response_model=MessageResponse)
-async def update_message(message_id: int, session: SessionDep, data: MessageUpdate):
+async def update_message(message_id: int, data: MessageUpdate):
     """Update a message
 
     Args:
         message_id: Message ID
-        session: Database session
         data: Update data
 
     Returns:
@@ -796,7 +835,7 @@ async def update_message(message_id: int, session: SessionDep, data: MessageUpda
     Raises:
         HTTPException: If message not found
     """
-    message = await MessageService.update(session, message_id, data)
+    message = await MessageService.update(message_id, data)
     if not message:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
 
@@ -811,17 +850,16 @@ async def update_message(message_id: int, session: SessionDep, data: MessageUpda
 
 
 @router.delete("/messages/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_message(message_id: int, session: SessionDep):
+async def delete_message(message_id: int):
     """Delete a message
 
     Args:
         message_id: Message ID
-        session: Database session
 
     Raises:
         HTTPException: If message not found
     """
-    deleted = await MessageService.delete(session, message_id)
+    deleted = await MessageService.delete(message_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
 
@@ -2,10 +2,15 @@
 import os
 from pathlib import Path
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+# Repository root; relative cache and index paths resolve against it, so they
+# do not depend on the working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 # Ensure data directory exists
-DATA_DIR = Path("./data")
+DATA_DIR = PROJECT_ROOT / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
 
@@ -26,25 +31,134 @@ class Settings(BaseSettings):
     QDRANT_PORT: int = 6333
     QDRANT_COLLECTION_NAME: str = "medical_knowledge"
     QDRANT_API_KEY: str | None = None
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = False  # Use gRPC instead of REST for all operations
+    QDRANT_TIMEOUT: int = 10  # Request timeout in seconds
+    QDRANT_POOL_SIZE: int = 32  # Max pooled REST connections
+    QDRANT_KEEPALIVE_EXPIRY: float = 30.0  # Idle seconds before a pooled connection is closed
+    QDRANT_UPSERT_BATCH_SIZE: int = 256  # Points per upsert request during bulk ingest
+    QDRANT_UPSERT_CONCURRENCY: int = 4  # Max in-flight upsert requests during bulk ingest
+
+    # Qdrant storage and quantization configuration (applied when the collection is created)
+    QDRANT_QUANTIZATION: str = "none"  # none, scalar (int8, ~4x smaller) or binary (~32x smaller)
+    QDRANT_QUANTIZATION_QUANTILE: float = 0.99  # Scalar quantization outlier cut-off
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True  # Keep quantized vectors in RAM
+    QDRANT_ON_DISK_VECTORS: bool = False  # Store original vectors on disk (memmap)
+    QDRANT_SEARCH_RESCORE: bool = True  # Rescore quantized candidates with original vectors
+    QDRANT_SEARCH_OVERSAMPLING: float | None = 2.0  # Fetch limit * oversampling quantized candidates
+
+    # Qdrant index, optimizer and cluster configuration (applied when the collection is created)
+    QDRANT_HNSW_M: int = 16  # Edges per node; higher improves recall, costs memory and build time
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100  # Build-time candidate list size
+    QDRANT_HNSW_EF: int | None = None  # Search-time candidate list size; None uses Qdrant's default
+    QDRANT_INDEXING_THRESHOLD: int = 20000  # KB of vectors per segment before an HNSW index is built
+    QDRANT_DEFAULT_SEGMENT_NUMBER: int = 0  # Target segment count; 0 lets Qdrant pick (CPU count)
+    QDRANT_MEMMAP_THRESHOLD: int | None = None  # KB per segment before vectors move to memmap storage
+    QDRANT_SHARD_NUMBER: int = 1
+    QDRANT_REPLICATION_FACTOR: int = 1
+    QDRANT_WRITE_CONSISTENCY_FACTOR: int = 1
+    QDRANT_UPDATE_COLLECTION_CONFIG: bool = False  # Apply HNSW/optimizer settings to an existing collection at startup
+    # Filterable payload fields -> index type (keyword, integer, float, bool, datetime, uuid, text, geo),
+    # indexed at startup if missing
+    QDRANT_PAYLOAD_INDEXES: dict[str, str] = {"cui": "keyword", "type": "keyword", "department": "keyword", "source": "keyword"}
 
     # Vector search configuration
-    VECTOR_SIZE: int = 1024  # text-embedding-v4 output dimension
+    VECTOR_SEARCH_BACKEND: str = "qdrant"  # qdrant, local (in-process index) or fallback (local when Qdrant fails)
+    LOCAL_INDEX_PATH: str = "./data/vector_index"  # Local index snapshot directory (relative to the project root)
+    LOCAL_INDEX_MMAP: bool = True  # Memory-map the snapshot instead of reading it into RAM
+    VECTOR_SIZE: int = 1024  # Informational; collections use EMBEDDING_OUTPUT_DIMENSION
     TOP_K_RESULTS: int = 5
     SIMILARITY_THRESHOLD: float = 0.7
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_SIZE: int = 2048  # Cached (query, top_k, threshold) results
+    SEARCH_CACHE_TTL: float = 300.0  # Entry lifetime in seconds (bounds staleness across workers)
+
+    # Hybrid (lexical + vector) search configuration
+    HYBRID_VECTOR_BUDGET_MS: float = 250.0  # Return lexical hits alone if the vector leg is slower
+    HYBRID_RRF_K: int = 60  # Reciprocal rank fusion constant
+    HYBRID_CANDIDATE_MULTIPLIER: int = 3  # Candidates fetched per leg = top_k * multiplier
+    LEXICAL_BM25_K1: float = 1.2
+    LEXICAL_BM25_B: float = 0.75
+    LEXICAL_VERSION_CHECK_INTERVAL: float = 1.0  # Seconds between checks for symptom changes made elsewhere
+
+    # Consultation configuration
+    CONSULTATION_MAX_DISEASES: int = 10  # Associated diseases returned per matched symptom
 
     # Bailian ASR configuration
     BAILIAN_API_KEY: str = ""
     FUN_ASR_MODEL: str = "fun-asr-realtime"
     FUN_ASR_SAMPLE_RATE: int = 16000
     FUN_ASR_FORMAT: str = "wav"  # Supported formats: pcm, wav, mp3, opus, speex, aac, amr
+    ASR_MAX_CONCURRENCY: int = 4  # Max concurrent recognition calls per worker
+    ASR_TIMEOUT: float = 60.0  # Per-attempt timeout in seconds
+    ASR_DEADLINE: float = 120.0  # Total time budget per recognition, including retries
 
-    # Bailian Embedding configuration
+    # AI provider call resilience (shared by embedding and ASR calls)
+    PROVIDER_MAX_RETRIES: int = 2  # Retries after a retryable failure (timeout, network, status below)
+    PROVIDER_RETRY_STATUS_CODES: list[int] = [429, 500, 502, 503, 504]
+    PROVIDER_RETRY_BACKOFF: float = 0.1  # Base backoff in seconds, doubled per retry (full jitter)
+    PROVIDER_RETRY_BACKOFF_MAX: float = 2.0  # Backoff cap in seconds
+    PROVIDER_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open the circuit
+    PROVIDER_CIRCUIT_RESET_TIMEOUT: float = 30.0  # Seconds before a probe call is let through
+    PROVIDER_LATENCY_WINDOW: int = 200  # Recent call latencies kept for hedging percentiles
+    PROVIDER_HEDGE_MIN_SAMPLES: int = 20  # Latency samples needed before hedging starts
+
+    # Embedding configuration
+    EMBEDDING_PROVIDER: str = "dashscope"  # dashscope (Bailian API) or local (offline hashing encoder)
     EMBEDDING_MODEL: str = "text-embedding-v4"
     EMBEDDING_DIMENSION: int = 1024  # text-embedding-v4 output dimension
+    EMBEDDING_REDUCED_DIMENSION: int | None = None  # e.g. 256 or 512; None keeps full dimension
+    EMBEDDING_REDUCTION: str = "truncate"  # truncate (Matryoshka) or project (random projection)
+    EMBEDDING_PROJECTION_SEED: int = 42  # Seed of the projection matrix; changing it requires re-indexing
+    EMBEDDING_MAX_CONCURRENCY: int = 16  # Max in-flight provider calls per worker
+    EMBEDDING_TIMEOUT: float = 10.0  # Per-attempt timeout in seconds
+    EMBEDDING_DEADLINE: float = 15.0  # Total time budget per provider call, including retries
+    EMBEDDING_HEDGE_PERCENTILE: float | None = 95.0  # Send a duplicate request after this latency percentile; None disables
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_SIZE: int = 10000  # In-memory LRU entries
+    EMBEDDING_CACHE_TTL: float = 3600.0  # In-memory entry lifetime in seconds
+    EMBEDDING_CACHE_PATH: str = "./data/embedding_cache.db"  # Relative to the project root; empty to disable disk tier
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES: int = 200000  # Disk tier row limit, oldest pruned first; 0 disables
+    EMBEDDING_CACHE_DISK_TTL: float = 2592000.0  # Disk tier entry lifetime in seconds (30 days); 0 disables
+    EMBEDDING_BATCH_SIZE: int = 10  # Max texts per provider call
+    EMBEDDING_BATCH_MAX_CHARS: int = 24000  # Max total characters per provider call
+    EMBEDDING_STREAM_MAX_TEXTS: int = 10000  # Max texts per /embedding/embed/batch request
+    EMBEDDING_STORE_MAX_ITEMS: int = 10000  # Max items per /embedding/store/batch request
+    EMBEDDING_SEARCH_MAX_QUERIES: int = 100  # Max queries per /embedding/search/batch request
+    EMBEDDING_COALESCE_ENABLED: bool = True
+    EMBEDDING_COALESCE_WINDOW_MS: float = 5.0  # Max wait to fill a batch
+    EMBEDDING_COALESCE_MAX_BATCH: int = 10  # text-embedding-v4 accepts up to 10 texts per call
+
+    # Catalog vectorization configuration (SympGAN symptoms/diseases -> Qdrant)
+    CATALOG_VECTORIZE_BATCH_SIZE: int = 256  # Rows per page (one embed_batch, one upsert, one checkpoint)
+    CATALOG_EMBED_MAX_CHARS: int = 2000  # Embedding text (name, aliases, definition) is cut to this length
 
     # SQLite database configuration
     SQLITE_DATABASE_PATH: str = "./data/medbridge.db"
     SQLITE_ECHO: bool = False  # Set to True for SQL query logging
+    SQLITE_READ_POOL_SIZE: int = 8  # Read-only connections for catalog lookups and listings
+    SQLITE_WRITE_BATCH_SIZE: int = 64  # Max queued conversation/message writes committed together
+
+    # SQLite pragma profile (applied to every connection)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # WAL lets readers run concurrently with a writer; DELETE is SQLite's default
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # NORMAL is durable across crashes in WAL mode (may lose the last commits on power loss)
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the database file read via mmap (0 disables)
+    SQLITE_CACHE_SIZE: int = -65536  # Page cache per connection; negative values are KiB (-65536 = 64 MiB)
+    SQLITE_TEMP_STORE: str = "MEMORY"  # Temporary tables and indexes: DEFAULT, FILE or MEMORY
+    SQLITE_BUSY_TIMEOUT: int = 5000  # Milliseconds to wait for a lock before failing with "database is locked"
+
+    @field_validator("LOCAL_INDEX_PATH", "EMBEDDING_CACHE_PATH")
+    @classmethod
+    def resolve_project_path(cls, value: str) -> str:
+        """Resolve a relative path against the project root (empty stays empty)"""
+        if not value:
+            return value
+        return str(PROJECT_ROOT / value)
+
+    @property
+    def EMBEDDING_OUTPUT_DIMENSION(self) -> int:
+        """Dimension of stored and queried vectors after any reduction"""
+        return self.EMBEDDING_REDUCED_DIMENSION or self.EMBEDDING_DIMENSION
 
     class Config:
         env_file = ".env"
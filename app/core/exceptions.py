@@ -57,3 +57,25 @@ class SQLiteConnectionError(MediBridgeException):
 
     def __init__(self, message: str = "Unable to connect to SQLite database"):
         super().__init__(message, code=503)
+
+
+class ProviderResponseError(MediBridgeException):
+    """AI provider returned an error status"""
+
+    def __init__(self, message: str = "AI provider request failed", status_code: int | None = None):
+        super().__init__(message, code=502)
+        self.status_code = status_code
+
+
+class ProviderUnavailableError(MediBridgeException):
+    """AI provider unavailable (circuit open or retries exhausted)"""
+
+    def __init__(self, message: str = "AI provider temporarily unavailable"):
+        super().__init__(message, code=503)
+
+
+class LexicalIndexUnavailableError(MediBridgeException):
+    """Lexical index could not be loaded (e.g. symptom tables missing)"""
+
+    def __init__(self, message: str = "Lexical index unavailable"):
+        super().__init__(message, code=503)
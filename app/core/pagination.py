@@ -0,0 +1,112 @@
+"""Keyset (Cursor) Pagination
+
+A cursor is an opaque, URL-safe token holding the (sort_key, id) of the
+last row of a page. The next page is read with a range condition on an
+index instead of OFFSET, so every page costs the same however deep it is.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import tuple_
+
+from app.core.exceptions import InvalidQueryError
+
+
+def encode_cursor(sort_key: Any, row_id: int) -> str:
+    """
+    Encode the position after a row
+
+    Args:
+        sort_key: Value of the row's sort column (datetimes are kept as ISO 8601)
+        row_id: Row ID (tie-breaker for equal sort keys)
+
+    Returns:
+        Opaque cursor string
+    """
+    if isinstance(sort_key, datetime):
+        sort_key = {"dt": sort_key.isoformat()}
+    payload = json.dumps([sort_key, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int]:
+    """
+    Decode a cursor created by encode_cursor
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (sort_key, row_id)
+
+    Raises:
+        InvalidQueryError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if isinstance(sort_key, dict):
+            sort_key = datetime.fromisoformat(sort_key["dt"])
+        if not isinstance(row_id, int):
+            raise ValueError(row_id)
+        return sort_key, row_id
+    except Exception:
+        raise InvalidQueryError(f"Invalid pagination cursor: {cursor}")
+
+
+def paginate(stmt, sort_column, id_column, limit: int, cursor: str | None = None, descending: bool = False):
+    """
+    Apply keyset ordering, the cursor condition and the page size to a select
+
+    One extra row is fetched so the caller can tell whether there is a
+    next page (see page_result).
+
+    Args:
+        stmt: Select statement
+        sort_column: Column to order by
+        id_column: Primary key column (tie-breaker)
+        limit: Page size
+        cursor: Cursor from the previous page
+        descending: Newest/largest first
+
+    Returns:
+        Paginated select statement
+    """
+    if cursor is not None:
+        sort_key, row_id = decode_cursor(cursor)
+        position = tuple_(sort_column, id_column)
+        if sort_column is id_column:
+            stmt = stmt.where(id_column < row_id if descending else id_column > row_id)
+        elif descending:
+            stmt = stmt.where(position < tuple_(sort_key, row_id))
+        else:
+            stmt = stmt.where(position > tuple_(sort_key, row_id))
+
+    if sort_column is id_column:
+        order = [id_column.desc() if descending else id_column]
+    elif descending:
+        order = [sort_column.desc(), id_column.desc()]
+    else:
+        order = [sort_column, id_column]
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def page_result(rows: list, limit: int, sort_attribute: str) -> tuple[list, str | None]:
+    """
+    Split the rows fetched by paginate into the page and the next cursor
+
+    Args:
+        rows: Rows fetched (up to limit + 1)
+        limit: Page size
+        sort_attribute: Name of the sort attribute on each row
+
+    Returns:
+        (page rows, cursor of the next page or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attribute), last.id)
@@ -0,0 +1,111 @@
+"""Vector Representation Helpers
+
+Embeddings are held as contiguous float32 NumPy arrays end to end. Binary
+encodings are raw little-endian float32 (optionally base64-encoded).
+"""
+import base64
+from typing import Iterable, Sequence
+
+import numpy as np
+
+# 1-D float32 embedding vector
+Vector = np.ndarray
+
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+def as_vector(values: Sequence[float] | np.ndarray) -> Vector:
+    """Convert values to a contiguous float32 vector (no copy if already one)"""
+    return np.ascontiguousarray(values, dtype=VECTOR_DTYPE)
+
+
+def as_matrix(rows: Iterable[Sequence[float] | np.ndarray] | np.ndarray) -> np.ndarray:
+    """Convert rows to a contiguous (n, dimension) float32 matrix"""
+    if not isinstance(rows, np.ndarray):
+        rows = list(rows)
+    return np.ascontiguousarray(rows, dtype=VECTOR_DTYPE)
+
+
+def to_bytes(vector: Vector) -> bytes:
+    """Encode a vector as raw little-endian float32 bytes"""
+    return as_vector(vector).tobytes()
+
+
+def from_bytes(data: bytes) -> Vector:
+    """Decode raw little-endian float32 bytes (read-only view, no copy)"""
+    return np.frombuffer(data, dtype=VECTOR_DTYPE)
+
+
+def to_base64(vector: Vector) -> str:
+    """Encode a vector as base64 of its little-endian float32 bytes"""
+    return base64.b64encode(to_bytes(vector)).decode("ascii")
+
+
+def from_base64(data: str) -> Vector:
+    """Decode a base64-encoded float32 vector"""
+    return from_bytes(base64.b64decode(data))
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a matrix (zero rows are left as-is)"""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(VECTOR_DTYPE, copy=False)
+
+
+class DimensionReducer:
+    """Reduce embedding dimension for smaller, faster vector indexes
+
+    Modes:
+        truncate: keep the leading dimensions (Matryoshka-style embeddings
+            such as text-embedding-v4 concentrate information there)
+        project: multiply by a fixed random orthonormal projection
+
+    Outputs are re-normalized so cosine scores stay comparable. The
+    projection is seeded, so query and stored vectors are always reduced the
+    same way across processes.
+    """
+
+    MODES = ("truncate", "project")
+
+    def __init__(self, input_dimension: int, output_dimension: int, mode: str = "truncate", seed: int = 0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown reduction mode: {mode}, supported modes: {', '.join(self.MODES)}")
+        if not 0 < output_dimension <= input_dimension:
+            raise ValueError(
+                f"Reduced dimension must be between 1 and {input_dimension}, got {output_dimension}"
+            )
+
+        self.input_dimension = input_dimension
+        self.output_dimension = output_dimension
+        self.mode = mode
+        self._projection: np.ndarray | None = None
+
+        if mode == "project":
+            rng = np.random.default_rng(seed)
+            gaussian = rng.standard_normal((input_dimension, output_dimension))
+            # Orthonormal columns preserve inner products as well as possible
+            q, _ = np.linalg.qr(gaussian)
+            self._projection = q.astype(VECTOR_DTYPE)
+
+    @property
+    def key(self) -> str:
+        """Identifier of this reduction (for cache keys)"""
+        return f"{self.mode}:{self.input_dimension}->{self.output_dimension}"
+
+    def reduce(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Reduce a (n, input_dimension) matrix or a single vector
+
+        Args:
+            matrix: float32 vectors
+
+        Returns:
+            Re-normalized float32 vectors with output_dimension columns
+        """
+        matrix = np.asarray(matrix, dtype=VECTOR_DTYPE)
+        if self.mode == "truncate":
+            reduced = matrix[..., : self.output_dimension]
+        else:
+            reduced = matrix @ self._projection
+        return np.ascontiguousarray(normalize_rows(reduced))
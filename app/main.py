@@ -9,7 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import api_router
 from app.core.config import settings
-from app.core.exceptions import MediBridgeException
+from app.core.exceptions import MediBridgeException, VectorSearchError
 from app.schemas.health import HealthResponse
 
 
@@ -24,10 +24,46 @@ async def lifespan(app: FastAPI):
     await SQLiteClientWrapper.health_check()
     print("SQLite database initialized.")
 
+    # Open the pooled Qdrant client and provision the collection
+    from app.models.vector_db import qdrant_client
+    await qdrant_client.open()
+    if settings.VECTOR_SEARCH_BACKEND != "local":
+        try:
+            await qdrant_client.ensure_collection()
+            print(f"Qdrant collection {settings.QDRANT_COLLECTION_NAME} is ready.")
+        except VectorSearchError:
+            # Configuration error (e.g. vector size mismatch): refuse to start
+            raise
+        except Exception as e:
+            # Qdrant may come up later; the first write retries provisioning
+            print(f"Qdrant collection not provisioned: {e}")
+
+    # Load the in-process vector index (local and fallback backends)
+    from app.services.vector_search import vector_search_service
+    if settings.VECTOR_SEARCH_BACKEND != "qdrant":
+        try:
+            count = await vector_search_service.load_local_index()
+            print(f"Local vector index loaded ({count} points).")
+        except VectorSearchError:
+            raise
+        except Exception as e:
+            print(f"Local vector index not loaded: {e}")
+
     yield
     # Execute on shutdown
     print(f"{settings.APP_NAME} is shutting down...")
 
+    from app.services.embedding_service import embedding_service
+    from app.services.asr_service import asr_service
+    embedding_service.close()
+    asr_service.client.close()
+    vector_search_service.save_local_index()
+    await qdrant_client.close()
+
+    from app.models.sqlite_writer import sqlite_writer
+    await sqlite_writer.close()
+    await SQLiteClientWrapper.close()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -54,14 +90,16 @@ app.add_middleware(
 async def root():
     """Root path health check"""
     from app.models.sqlite_db import SQLiteClientWrapper
+    from app.models.vector_db import qdrant_client
 
     sqlite_connected = await SQLiteClientWrapper.health_check()
+    qdrant_connected = await qdrant_client.health_check()
 
     return HealthResponse(
         status="ok",
         service=settings.APP_NAME,
         version=settings.APP_VERSION,
-        qdrant_connected=True,  # TODO: Actually check connection status
+        qdrant_connected=qdrant_connected,
         sqlite_connected=sqlite_connected,
     )
 
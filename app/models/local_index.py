@@ -0,0 +1,334 @@
+"""In-Process Vector Index
+
+Brute-force cosine search over a float32 matrix held in this process. Used
+as the search engine for single-node deployments (VECTOR_SEARCH_BACKEND=local)
+and as a fallback when Qdrant is unreachable (VECTOR_SEARCH_BACKEND=fallback).
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.exceptions import VectorSearchError
+from app.core.vectors import VECTOR_DTYPE, Vector, as_matrix, as_vector, normalize_rows
+
+VECTORS_FILE = "vectors.npy"
+META_FILE = "meta.json"
+
+
+def matches_filters(payload: dict | None, filters: dict | None) -> bool:
+    """
+    Check a payload against field conditions (same semantics as Qdrant's filter)
+
+    Args:
+        payload: Point payload
+        filters: Payload field -> value (exact match) or list of values
+            (match any); all fields must match
+
+    Returns:
+        True if every condition matches; a list-valued payload field
+        matches if any of its elements does
+    """
+    if not filters:
+        return True
+    payload = payload or {}
+    for key, expected in filters.items():
+        accepted = expected if isinstance(expected, (list, tuple)) else (expected,)
+        value = payload.get(key)
+        values = value if isinstance(value, list) else (value,)
+        if not any(v is not None and v in accepted for v in values):
+            return False
+    return True
+
+
+def payload_terms(payload: dict | None):
+    """
+    Yield the (field, value) pairs a payload can be matched on
+
+    List-valued fields yield each element; None and unhashable values are
+    skipped (matches_filters never matches them either).
+    """
+    for key, value in (payload or {}).items():
+        for item in value if isinstance(value, list) else (value,):
+            if item is None:
+                continue
+            try:
+                hash(item)
+            except TypeError:
+                continue
+            yield key, item
+
+
+class LocalVectorIndex:
+    """NumPy vector index with exact cosine top-k
+
+    Rows are stored L2-normalized, so a search is one matrix-vector product
+    followed by argpartition. The matrix grows geometrically on insert and
+    can be saved to / loaded from a snapshot directory; a loaded snapshot is
+    memory-mapped read-only until the next insert copies it into RAM.
+
+    Filtered searches use an inverted index ((field, value) -> rows), built
+    on the first filtered search and kept up to date by add(), so the row
+    mask is assembled with NumPy instead of testing every payload.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._vectors = np.zeros((0, dimension), dtype=VECTOR_DTYPE)
+        self._size = 0
+        self.ids: list[str | int] = []
+        self.payloads: list[dict] = []
+        self._rows: dict[str | int, int] = {}
+        self._postings: dict[tuple, set[int]] | None = None
+        self._posting_arrays: dict[tuple, np.ndarray] = {}
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """(len, dimension) matrix of normalized vectors"""
+        return self._vectors[: self._size]
+
+    def _reserve(self, size: int) -> None:
+        """Grow the backing matrix to hold at least size rows"""
+        if size <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        capacity = max(size, 2 * len(self._vectors), 1024)
+        grown = np.zeros((capacity, self.dimension), dtype=VECTOR_DTYPE)
+        grown[: self._size] = self.vectors
+        self._vectors = grown
+
+    def add(self, ids: list[str | int], vectors: list[Vector] | np.ndarray, payloads: list[dict]) -> None:
+        """
+        Insert or replace points
+
+        Args:
+            ids: Point IDs
+            vectors: Vectors of self.dimension
+            payloads: Payload for each point
+        """
+        if not len(ids):
+            return
+        matrix = normalize_rows(as_matrix(vectors))
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional vectors, got {matrix.shape[1]}")
+
+        new = sum(1 for point_id in dict.fromkeys(ids) if point_id not in self._rows)
+        self._reserve(self._size + new)
+
+        for point_id, vector, payload in zip(ids, matrix, payloads):
+            row = self._rows.get(point_id)
+            if row is None:
+                row = self._size
+                self._rows[point_id] = row
+                self.ids.append(point_id)
+                self.payloads.append(payload)
+                self._size += 1
+            else:
+                self._unindex_payload(row, self.payloads[row])
+                self.payloads[row] = payload
+            self._index_payload(row, payload)
+            self._vectors[row] = vector
+
+        self.dirty = True
+
+    def _index_payload(self, row: int, payload: dict | None) -> None:
+        """Add a row to the inverted index (if it has been built)"""
+        if self._postings is None:
+            return
+        for term in payload_terms(payload):
+            self._postings.setdefault(term, set()).add(row)
+            self._posting_arrays.pop(term, None)
+
+    def _unindex_payload(self, row: int, payload: dict | None) -> None:
+        """Remove a row from the inverted index (if it has been built)"""
+        if self._postings is None:
+            return
+        for term in payload_terms(payload):
+            self._postings.get(term, set()).discard(row)
+            self._posting_arrays.pop(term, None)
+
+    def _posting_rows(self, term: tuple) -> np.ndarray:
+        """Rows whose payload contains a (field, value) pair"""
+        if self._postings is None:
+            self._postings = {}
+            for row in range(self._size):
+                self._index_payload(row, self.payloads[row])
+        try:
+            rows = self._posting_arrays.get(term)
+        except TypeError:
+            # Unhashable filter value: never indexed, never matched
+            return np.zeros(0, dtype=np.int64)
+        if rows is None:
+            postings = self._postings.get(term, ())
+            rows = self._posting_arrays[term] = np.fromiter(postings, dtype=np.int64, count=len(postings))
+        return rows
+
+    def filter_rows(self, filters: dict) -> np.ndarray:
+        """
+        Rows whose payload matches field conditions
+
+        Args:
+            filters: Payload conditions (see matches_filters)
+
+        Returns:
+            Matching row numbers, ascending
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for key, expected in filters.items():
+            accepted = expected if isinstance(expected, (list, tuple)) else (expected,)
+            field_mask = np.zeros(self._size, dtype=bool)
+            for value in accepted:
+                field_mask[self._posting_rows((key, value))] = True
+            mask &= field_mask
+        return np.flatnonzero(mask)
+
+    def search(
+        self,
+        query_vector: Vector,
+        limit: int,
+        score_threshold: float | None = None,
+        filters: dict | None = None,
+    ) -> list[dict]:
+        """
+        Exact cosine top-k search
+
+        Args:
+            query_vector: Query vector
+            limit: Number of results to return
+            score_threshold: Minimum cosine similarity
+            filters: Payload conditions (see matches_filters); only matching
+                points are ranked
+
+        Returns:
+            Results as dicts with id, score and payload, best first
+        """
+        if not self._size or limit <= 0:
+            return []
+
+        query = normalize_rows(as_vector(query_vector))
+        if filters:
+            rows = self.filter_rows(filters)
+            if 2 * len(rows) >= self._size:
+                # Gathering most of the matrix costs more than scoring all of it
+                scores = (self.vectors @ query)[rows]
+            else:
+                scores = self.vectors[rows] @ query
+        else:
+            rows = None
+            scores = self.vectors @ query
+
+        k = min(limit, len(scores))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for i in top:
+            row = i if rows is None else rows[i]
+            score = float(scores[i])
+            if score_threshold is not None and score < score_threshold:
+                break
+            results.append({"id": self.ids[row], "score": score, "payload": self.payloads[row]})
+        return results
+
+    def save(self, path: str | Path) -> None:
+        """Write a snapshot (vectors.npy + meta.json) into a directory"""
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Write to temporary files first so a crash never leaves a torn snapshot
+        vectors_tmp = directory / f"{VECTORS_FILE}.tmp"
+        meta_tmp = directory / f"{META_FILE}.tmp"
+        with open(vectors_tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.vectors))
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump({"dimension": self.dimension, "ids": self.ids, "payloads": self.payloads}, f, ensure_ascii=False)
+        os.replace(vectors_tmp, directory / VECTORS_FILE)
+        os.replace(meta_tmp, directory / META_FILE)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True, dimension: int | None = None) -> "LocalVectorIndex":
+        """
+        Load a snapshot written by save()
+
+        Args:
+            path: Snapshot directory
+            mmap: Memory-map the vectors instead of reading them into RAM
+            dimension: Expected vector dimension; a snapshot of another
+                dimension raises VectorSearchError
+
+        Returns:
+            Loaded index
+        """
+        directory = Path(path)
+        with open(directory / META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if dimension is not None and meta["dimension"] != dimension:
+            raise VectorSearchError(
+                f"Local index snapshot {directory} stores {meta['dimension']}-dimensional vectors "
+                f"but EMBEDDING_OUTPUT_DIMENSION is {dimension}; delete the snapshot to rebuild it "
+                f"or set LOCAL_INDEX_PATH to a new directory"
+            )
+        vectors = np.load(directory / VECTORS_FILE, mmap_mode="r" if mmap else None)
+
+        index = cls(meta["dimension"])
+        index._vectors = vectors
+        index._size = len(vectors)
+        index.ids = meta["ids"]
+        index.payloads = meta["payloads"]
+        index._rows = {point_id: row for row, point_id in enumerate(index.ids)}
+        return index
+
+    def replace(self, other: "LocalVectorIndex") -> None:
+        """Take over the contents of another index"""
+        self.dimension = other.dimension
+        self._vectors, self._size = other._vectors, other._size
+        self.ids, self.payloads, self._rows = other.ids, other.payloads, other._rows
+        self._postings, self._posting_arrays = other._postings, other._posting_arrays
+        self.dirty = other.dirty
+
+    async def load_from_qdrant(self, client, collection_name: str, batch_size: int = 1000) -> int:
+        """
+        Replace the contents with all points scrolled from a Qdrant collection
+
+        Args:
+            client: AsyncQdrantClient
+            collection_name: Collection to read
+            batch_size: Points per scroll page
+
+        Returns:
+            Number of points loaded
+        """
+        index = LocalVectorIndex(self.dimension)
+        offset = None
+        while True:
+            points, offset = await client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            index.add(
+                [point.id for point in points],
+                [point.vector for point in points],
+                [point.payload or {} for point in points],
+            )
+            if offset is None:
+                break
+
+        self.replace(index)
+        self.dirty = True
+        return len(self)
+
+
+# Global instance
+local_vector_index = LocalVectorIndex(settings.EMBEDDING_OUTPUT_DIMENSION)
@@ -8,18 +8,22 @@ from typing import Optional
 
 from sqlalchemy import (
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     create_engine,
     event,
+    text,
 )
-from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -31,12 +35,78 @@ from app.core.config import settings
 from app.core.exceptions import SQLiteConnectionError
 
 
-# Enable foreign key constraints for SQLite
-@event.listens_for(Engine, "connect")
+# Accepted values of the string pragmas (pragmas cannot take bound parameters)
+PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """Build the per-connection pragma profile from settings
+
+    Returns:
+        Pragma name -> value, in the order they are applied
+
+    Raises:
+        SQLiteConnectionError: If a setting has an unsupported value
+    """
+    pragmas = {
+        "foreign_keys": "ON",
+        "busy_timeout": int(settings.SQLITE_BUSY_TIMEOUT),
+        "journal_mode": settings.SQLITE_JOURNAL_MODE.upper(),
+        "synchronous": settings.SQLITE_SYNCHRONOUS.upper(),
+        "cache_size": int(settings.SQLITE_CACHE_SIZE),
+        "mmap_size": int(settings.SQLITE_MMAP_SIZE),
+        "temp_store": settings.SQLITE_TEMP_STORE.upper(),
+    }
+    for name, choices in PRAGMA_CHOICES.items():
+        if pragmas[name] not in choices:
+            raise SQLiteConnectionError(
+                f"Unsupported SQLite {name}: {pragmas[name]}, supported values: {', '.join(sorted(choices))}"
+            )
+    return pragmas
+
+
 def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Enable foreign key support for SQLite"""
+    """Apply the pragma profile to a new SQLite connection
+
+    busy_timeout is set first so the journal_mode switch waits for other
+    connections instead of failing when the database is busy.
+    """
+    cursor = dbapi_conn.cursor()
+    for name, value in sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def set_sqlite_writer_mode(dbapi_conn, connection_record):
+    """Let SQLAlchemy issue BEGIN itself on read-write connections
+
+    The driver otherwise defers BEGIN until the first INSERT/UPDATE, so a
+    leading SAVEPOINT would open (and its RELEASE commit) the transaction.
+    """
+    dbapi_conn.isolation_level = None
+
+
+def begin_sqlite_transaction(conn):
+    """Emit BEGIN with the mode of the sqlite_begin execution option (default DEFERRED)
+
+    IMMEDIATE takes the write lock up front, so a writer waits on
+    busy_timeout instead of failing when it later upgrades a read lock
+    (in WAL mode that upgrade fails at once if another connection
+    committed after the transaction's first read).
+    """
+    mode = conn.get_execution_options().get("sqlite_begin", "DEFERRED")
+    conn.exec_driver_sql(f"BEGIN {mode}")
+
+
+def set_sqlite_read_only_pragma(dbapi_conn, connection_record):
+    """Apply the pragma profile to a reader connection and make it read-only"""
+    set_sqlite_pragma(dbapi_conn, connection_record)
     cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA query_only=ON")
     cursor.close()
 
 
@@ -159,6 +229,8 @@ class Conversation(Base):
     """
 
     __tablename__ = "conversations"
+    # Keyset pagination order (most recent first)
+    __table_args__ = (Index("ix_conversations_started_at_id", "started_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -169,6 +241,8 @@ class Conversation(Base):
     department: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     patient_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     progress: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Maintained by triggers on messages (see install_row_counts)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, default=lambda: datetime.utcnow()
     )
@@ -194,6 +268,8 @@ class Message(Base):
     """
 
     __tablename__ = "messages"
+    # Keyset pagination order within a conversation (oldest first)
+    __table_args__ = (Index("ix_messages_conversation_sent_at_id", "conversation_id", "sent_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     conversation_id: Mapped[int] = mapped_column(
@@ -217,6 +293,245 @@ class Message(Base):
         return f"<Message(id={self.id}, conversation_id={self.conversation_id}, role='{self.role}')>"
 
 
+class VectorSyncState(Base):
+    """Vector sync state model
+
+    Records which catalog rows (symptoms, diseases) have been embedded and
+    upserted to the vector database, and the hash of the content that was
+    embedded. Used to resume interrupted vectorization runs and to
+    re-embed only rows whose content changed.
+    """
+
+    __tablename__ = "vector_sync_state"
+    __table_args__ = (UniqueConstraint("kind", "cui"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    cui: Mapped[str] = mapped_column(String(50), nullable=False)
+    point_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        default=lambda: datetime.utcnow(),
+        onupdate=lambda: datetime.utcnow(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<VectorSyncState(kind='{self.kind}', cui='{self.cui}', point_id='{self.point_id}')>"
+
+
+class TableStats(Base):
+    """Table stats model
+
+    Row count of each table in COUNTED_TABLES, maintained by triggers so
+    list endpoints can report totals without a COUNT(*) scan. version is
+    bumped by every insert, update and delete, so in-process caches built
+    from a table (e.g. the lexical index) can detect changes made by other
+    processes with one primary-key lookup.
+    """
+
+    __tablename__ = "table_stats"
+
+    table_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return (
+            f"<TableStats(table_name='{self.table_name}', row_count={self.row_count}, "
+            f"version={self.version})>"
+        )
+
+
+# Tables whose row counts are kept in table_stats
+COUNTED_TABLES = ("diseases", "symptoms", "disease_symptom_associations", "conversations", "messages")
+
+
+def row_count_triggers() -> dict[str, str]:
+    """DDL of the triggers maintaining table_stats and conversations.message_count, by trigger name"""
+    triggers = {}
+    for table in COUNTED_TABLES:
+        for event_name, delta in (("INSERT", "+ 1"), ("DELETE", "- 1"), ("UPDATE", "")):
+            name = f"trg_{table}_count_{event_name.lower()}"
+            row_count = f"row_count = row_count {delta}, " if delta else ""
+            triggers[name] = (
+                f"CREATE TRIGGER {name} AFTER {event_name} ON {table} BEGIN "
+                f"UPDATE table_stats SET {row_count}version = version + 1 WHERE table_name = '{table}'; "
+                f"END"
+            )
+    triggers["trg_messages_conversation_count_insert"] = (
+        "CREATE TRIGGER trg_messages_conversation_count_insert "
+        "AFTER INSERT ON messages BEGIN "
+        "UPDATE conversations SET message_count = message_count + 1 WHERE id = NEW.conversation_id; "
+        "END"
+    )
+    triggers["trg_messages_conversation_count_delete"] = (
+        "CREATE TRIGGER trg_messages_conversation_count_delete "
+        "AFTER DELETE ON messages BEGIN "
+        "UPDATE conversations SET message_count = message_count - 1 WHERE id = OLD.conversation_id; "
+        "END"
+    )
+    triggers["trg_messages_conversation_count_move"] = (
+        "CREATE TRIGGER trg_messages_conversation_count_move "
+        "AFTER UPDATE OF conversation_id ON messages "
+        "WHEN OLD.conversation_id IS NOT NEW.conversation_id BEGIN "
+        "UPDATE conversations SET message_count = message_count - 1 WHERE id = OLD.conversation_id; "
+        "UPDATE conversations SET message_count = message_count + 1 WHERE id = NEW.conversation_id; "
+        "END"
+    )
+    return triggers
+
+
+def rebuild_row_counts(conn) -> None:
+    """Recompute table_stats and conversations.message_count from the tables
+
+    Args:
+        conn: Sync connection or session, inside a write transaction
+    """
+    for table in COUNTED_TABLES:
+        # Upsert rather than replace: version must keep increasing
+        conn.execute(
+            text(
+                "INSERT INTO table_stats (table_name, row_count, version) "
+                f"SELECT :table_name, COUNT(*), 1 FROM {table} WHERE true "
+                "ON CONFLICT (table_name) DO UPDATE SET "
+                "row_count = excluded.row_count, version = table_stats.version + 1"
+            ),
+            {"table_name": table},
+        )
+    conn.execute(
+        text(
+            "UPDATE conversations SET message_count = "
+            "(SELECT COUNT(*) FROM messages WHERE messages.conversation_id = conversations.id)"
+        )
+    )
+
+
+def check_row_counts(conn) -> dict:
+    """Compare the maintained row counts with the actual ones
+
+    Args:
+        conn: Sync connection or session
+
+    Returns:
+        Dict with "tables" ({table: {"stored", "actual"}}) and
+        "conversations" ([{"id", "stored", "actual"}]), listing mismatches only
+    """
+    stored = dict(conn.execute(text("SELECT table_name, row_count FROM table_stats")).all())
+    tables = {}
+    for table in COUNTED_TABLES:
+        actual = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+        if stored.get(table) != actual:
+            tables[table] = {"stored": stored.get(table), "actual": actual}
+
+    rows = conn.execute(
+        text(
+            "SELECT c.id, c.message_count, COUNT(m.id) FROM conversations c "
+            "LEFT JOIN messages m ON m.conversation_id = c.id "
+            "GROUP BY c.id HAVING c.message_count != COUNT(m.id)"
+        )
+    ).all()
+    conversations = [{"id": row[0], "stored": row[1], "actual": row[2]} for row in rows]
+    return {"tables": tables, "conversations": conversations}
+
+
+def install_row_counts(conn) -> None:
+    """Install the row count triggers, backfilling counts on first use
+
+    Adds conversations.message_count and table_stats.version to databases
+    created before they existed, and rebuilds all counts when the column
+    or a table_stats row was missing (the triggers only track changes made
+    after they exist). Triggers are recreated so databases pick up changes
+    to their definition.
+    """
+    rebuild = False
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(conversations)")).all()}
+    if "message_count" not in columns:
+        conn.execute(text("ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0"))
+        rebuild = True
+
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(table_stats)")).all()}
+    if "version" not in columns:
+        conn.execute(text("ALTER TABLE table_stats ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+
+    tracked = {row[0] for row in conn.execute(text("SELECT table_name FROM table_stats")).all()}
+    if not set(COUNTED_TABLES) <= tracked:
+        rebuild = True
+
+    for name, statement in row_count_triggers().items():
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text(statement))
+    if rebuild:
+        rebuild_row_counts(conn)
+
+
+# FTS5 full-text indexes over the catalog: index table -> (content table, indexed columns).
+# External content: the index stores only tokens and reads rows back from the content table.
+FTS_TABLES = {
+    "diseases_fts": ("diseases", ("name", "alias", "definition")),
+    "symptoms_fts": ("symptoms", ("name", "alias", "definition", "summary")),
+}
+
+
+def fts_ddl(fts_table: str) -> list[str]:
+    """DDL of an FTS5 index and the triggers keeping it in sync with its content table"""
+    table, columns = FTS_TABLES[fts_table]
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});"
+    return [
+        # prefix='2 3': index 2- and 3-character prefixes so short prefix queries stay fast
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_insert AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_delete AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_update AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def rebuild_fts(conn) -> None:
+    """Rebuild the FTS5 indexes from their content tables and merge their segments
+
+    Args:
+        conn: Sync connection or session, inside a write transaction
+    """
+    for fts_table in FTS_TABLES:
+        conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')"))
+        conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('optimize')"))
+
+
+def install_fts(conn) -> None:
+    """Create the FTS5 indexes and their triggers, indexing existing rows on first use"""
+    existing = {
+        row[0]
+        for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).all()
+    }
+    for fts_table in FTS_TABLES:
+        for statement in fts_ddl(fts_table):
+            conn.execute(text(statement))
+        if fts_table not in existing:
+            conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')"))
+
+
+def create_missing_indexes(conn) -> None:
+    """Create declared indexes missing from existing tables
+
+    create_all only creates indexes together with their (new) table, so
+    indexes added to an existing model would otherwise never reach a
+    database created by an earlier version.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 # ============================================================================
 # Client Wrapper
 # ============================================================================
@@ -227,10 +542,19 @@ class SQLiteClientWrapper:
 
     This class provides a singleton-like interface to the async SQLite database.
     Tables are created automatically on first access.
+
+    Two engines share the database file: the read-write engine behind
+    get_session(), whose transactions begin IMMEDIATE (holding the write
+    lock until commit, so keep them short), and a pool of SQLITE_READ_POOL_SIZE read-only
+    (query_only) connections behind get_read_session() for catalog lookups
+    and listings. In WAL mode readers never wait for the writer, so read
+    throughput scales with the pool.
     """
 
-    _engine: Optional[AsyncSession] = None
+    _engine: Optional[AsyncEngine] = None
     _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    _read_engine: Optional[AsyncEngine] = None
+    _read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
     _initialized: bool = False
 
     @classmethod
@@ -242,12 +566,20 @@ class SQLiteClientWrapper:
         # Build database URL for async SQLite
         db_url = f"sqlite+aiosqlite:///{settings.SQLITE_DATABASE_PATH}"
 
-        # Create async engine
+        # Create async engine. Its sessions may read before they write, so
+        # they take the write lock at BEGIN; plain reads use the reader pool.
         cls._engine = create_async_engine(
             db_url,
             echo=settings.SQLITE_ECHO,
+            execution_options={"sqlite_begin": "IMMEDIATE"},
         )
 
+        # Apply the pragma profile to every connection of this engine, and
+        # let SQLAlchemy control BEGIN so savepoints nest correctly
+        event.listen(cls._engine.sync_engine, "connect", set_sqlite_pragma)
+        event.listen(cls._engine.sync_engine, "connect", set_sqlite_writer_mode)
+        event.listen(cls._engine.sync_engine, "begin", begin_sqlite_transaction)
+
         # Create session factory
         cls._session_factory = async_sessionmaker(
             bind=cls._engine,
@@ -258,6 +590,24 @@ class SQLiteClientWrapper:
         # Create all tables
         async with cls._engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_indexes)
+            await conn.run_sync(install_row_counts)
+            await conn.run_sync(install_fts)
+
+        # Read-only connection pool (created after the tables and WAL mode exist)
+        cls._read_engine = create_async_engine(
+            db_url,
+            echo=settings.SQLITE_ECHO,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.SQLITE_READ_POOL_SIZE,
+            max_overflow=0,
+        )
+        event.listen(cls._read_engine.sync_engine, "connect", set_sqlite_read_only_pragma)
+        cls._read_session_factory = async_sessionmaker(
+            bind=cls._read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
 
         cls._initialized = True
 
@@ -282,6 +632,30 @@ class SQLiteClientWrapper:
 
         return cls._session_factory()
 
+    @classmethod
+    async def get_read_session(cls) -> AsyncSession:
+        """Get a new read-only database session from the reader pool
+
+        Writes through this session fail with "attempt to write a readonly
+        database".
+
+        Returns:
+            AsyncSession: A new SQLAlchemy async session
+
+        Raises:
+            SQLiteConnectionError: If database connection fails
+        """
+        if not cls._initialized:
+            try:
+                await cls._ensure_tables_exist()
+            except Exception as e:
+                raise SQLiteConnectionError(f"Failed to initialize database: {e}") from e
+
+        if cls._read_session_factory is None:
+            raise SQLiteConnectionError("Session factory not initialized")
+
+        return cls._read_session_factory()
+
     @classmethod
     async def health_check(cls) -> bool:
         """Check if database connection is healthy
@@ -303,6 +677,10 @@ class SQLiteClientWrapper:
     @classmethod
     async def close(cls) -> None:
         """Close database connection"""
+        if cls._read_engine is not None:
+            await cls._read_engine.dispose()
+            cls._read_engine = None
+            cls._read_session_factory = None
         if cls._engine is not None:
             await cls._engine.dispose()
             cls._initialized = False
@@ -0,0 +1,148 @@
+"""SQLite Single-Writer Queue
+
+SQLite allows one writer at a time. Instead of letting request handlers race
+for the write lock (and fail with "database is locked"), conversation and
+message writes are queued and executed by one writer task. Writes that
+queue up while a transaction is running are group-committed: each runs in
+its own savepoint, so a failing write only rolls back itself, and the whole
+group pays for a single commit (one fsync).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import SQLiteServiceError
+from app.models.sqlite_db import SQLiteClientWrapper
+
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class SQLiteWriteQueue:
+    """Serializes writes through one writer task with group commit"""
+
+    def __init__(self, max_batch_size: int | None = None):
+        self.max_batch_size = max_batch_size or settings.SQLITE_WRITE_BATCH_SIZE
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.commits = 0
+        self.writes = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        """Start the writer task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        """
+        Run a write operation on the writer session
+
+        The operation must not commit or roll back; it may flush. Its result
+        is returned once the group it ran in has been committed.
+
+        Args:
+            operation: Async callable taking the writer's AsyncSession
+
+        Returns:
+            The operation's result
+
+        Raises:
+            Whatever the operation raised (only its own changes are rolled
+            back), or SQLiteServiceError if the group commit failed
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._ensure_started().put_nowait((operation, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Writer loop: take everything queued (up to max_batch_size) and commit it together"""
+        queue = self._queue
+        batch: list[tuple[WriteOperation, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < self.max_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                await self._commit_batch(batch)
+        finally:
+            # Stopped: fail the interrupted group and everything still queued
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(SQLiteServiceError("SQLite writer stopped"))
+
+    async def _commit_batch(self, batch: list[tuple[WriteOperation, asyncio.Future]]) -> None:
+        """Run queued operations in savepoints of one transaction and commit once"""
+        outcomes: list[tuple[asyncio.Future, Any, BaseException | None]] = []
+        try:
+            session = await SQLiteClientWrapper.get_session()
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        try:
+            # Take the write lock up front rather than on the first write
+            await session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+            for operation, future in batch:
+                if future.done():
+                    # The caller gave up (e.g. client disconnected)
+                    continue
+                try:
+                    async with session.begin_nested():
+                        result = await operation(session)
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+            await session.commit()
+            self.commits += 1
+            self.writes += sum(1 for _, _, error in outcomes if error is None)
+        except Exception as e:
+            await session.rollback()
+            error = SQLiteServiceError(f"Write transaction failed: {e}")
+            outcomes = [(future, None, own or error) for future, _, own in outcomes]
+            # Operations that never ran (failure before or during the group)
+            handled = {id(future) for future, _, _ in outcomes}
+            outcomes += [(future, None, error) for _, future in batch if id(future) not in handled]
+        finally:
+            await session.close()
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def stats(self) -> dict:
+        """Get writer counters"""
+        return {
+            "commits": self.commits,
+            "writes": self.writes,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def close(self) -> None:
+        """Stop the writer task (writes still queued fail with SQLiteServiceError)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        self._queue = None
+        self._loop = None
+
+
+# Global instance
+sqlite_writer = SQLiteWriteQueue()
@@ -1,70 +1,301 @@
 """Vector Database Client"""
+import asyncio
 import uuid
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+
+import httpx
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    MatchAny,
+    MatchValue,
+    OptimizersConfigDiff,
+    PayloadSchemaType,
+    PointStruct,
+    Range,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 
 from app.core.config import settings
-from app.core.exceptions import QdrantConnectionError
+from app.core.exceptions import QdrantConnectionError, VectorSearchError
+from app.core.vectors import Vector
+from app.models.local_index import local_vector_index
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 
 class QdrantClientWrapper:
-    """Qdrant client wrapper"""
+    """Qdrant client wrapper
+
+    Wraps AsyncQdrantClient so vector queries never block the event loop.
+    REST requests share a pooled, keep-alive httpx connection pool; with
+    QDRANT_PREFER_GRPC the client talks gRPC over a persistent channel
+    instead. The client is opened and closed by the application lifespan.
+
+    The collection is provisioned once at startup (ensure_collection) and
+    its existence is cached, so writes do not pay an extra round trip.
+    Payload fields declared in QDRANT_PAYLOAD_INDEXES are indexed at the
+    same time, so filtered searches are resolved inside the HNSW traversal.
+    """
 
     def __init__(self):
-        self._client: QdrantClient | None = None
+        self._client: AsyncQdrantClient | None = None
+        self._collection_ready = False
+        self._collection_lock: asyncio.Lock | None = None
+        # Bumped on every write, so result caches can tell the data changed
+        self.collection_version = 0
 
     @property
-    def client(self) -> QdrantClient:
+    def client(self) -> AsyncQdrantClient:
         """Get Qdrant client instance"""
         if self._client is None:
             self._client = self._create_client()
         return self._client
 
-    def _create_client(self) -> QdrantClient:
+    def _create_client(self) -> AsyncQdrantClient:
         """Create Qdrant client"""
         try:
-            if settings.QDRANT_API_KEY:
-                client = QdrantClient(
-                    host=settings.QDRANT_HOST,
-                    port=settings.QDRANT_PORT,
-                    api_key=settings.QDRANT_API_KEY,
+            return AsyncQdrantClient(
+                host=settings.QDRANT_HOST,
+                port=settings.QDRANT_PORT,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                api_key=settings.QDRANT_API_KEY or None,
+                timeout=settings.QDRANT_TIMEOUT,
+                # REST transport: bounded pool with keep-alive (the client
+                # default disables keep-alive, reconnecting per request)
+                limits=httpx.Limits(
+                    max_connections=settings.QDRANT_POOL_SIZE,
+                    max_keepalive_connections=settings.QDRANT_POOL_SIZE,
+                    keepalive_expiry=settings.QDRANT_KEEPALIVE_EXPIRY,
+                ),
+                # gRPC transport: keep the channel alive between queries
+                grpc_options={
+                    "grpc.keepalive_time_ms": int(settings.QDRANT_KEEPALIVE_EXPIRY * 1000),
+                    "grpc.keepalive_permit_without_calls": 1,
+                },
+            )
+        except Exception as e:
+            raise QdrantConnectionError(f"Qdrant connection failed: {str(e)}")
+
+    async def open(self) -> None:
+        """Create the client (called on application startup)"""
+        _ = self.client
+
+    async def close(self) -> None:
+        """Close pooled connections (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        self._collection_ready = False
+        self._collection_lock = None
+
+    @staticmethod
+    def _quantization_config() -> ScalarQuantization | BinaryQuantization | None:
+        """Build the quantization config selected by QDRANT_QUANTIZATION"""
+        mode = settings.QDRANT_QUANTIZATION.lower()
+        if mode == "none":
+            return None
+        if mode == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=settings.QDRANT_QUANTIZATION_QUANTILE,
+                    always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
                 )
+            )
+        if mode == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM)
+            )
+        raise VectorSearchError(
+            f"Unsupported quantization: {settings.QDRANT_QUANTIZATION}, "
+            "supported values: none, scalar, binary"
+        )
+
+    @staticmethod
+    def _hnsw_config() -> HnswConfigDiff:
+        """Build the HNSW index config from settings"""
+        return HnswConfigDiff(m=settings.QDRANT_HNSW_M, ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT)
+
+    @staticmethod
+    def _optimizers_config() -> OptimizersConfigDiff:
+        """Build the segment optimizer config from settings"""
+        return OptimizersConfigDiff(
+            indexing_threshold=settings.QDRANT_INDEXING_THRESHOLD,
+            default_segment_number=settings.QDRANT_DEFAULT_SEGMENT_NUMBER,
+            memmap_threshold=settings.QDRANT_MEMMAP_THRESHOLD,
+        )
+
+    @staticmethod
+    def search_params() -> SearchParams | None:
+        """Build query-time search params (hnsw_ef, quantization rescoring/oversampling)"""
+        quantization = None
+        if settings.QDRANT_QUANTIZATION.lower() != "none":
+            quantization = QuantizationSearchParams(
+                rescore=settings.QDRANT_SEARCH_RESCORE,
+                oversampling=settings.QDRANT_SEARCH_OVERSAMPLING,
+            )
+        if quantization is None and settings.QDRANT_HNSW_EF is None:
+            return None
+        return SearchParams(hnsw_ef=settings.QDRANT_HNSW_EF, quantization=quantization)
+
+    @staticmethod
+    def build_filter(filters: dict | None) -> Filter | None:
+        """
+        Build a Qdrant filter from field conditions
+
+        Args:
+            filters: Payload field -> value (exact match) or list of values
+                (match any); all fields must match. Float values, which
+                Qdrant cannot match exactly, become closed ranges.
+
+        Returns:
+            Qdrant filter, or None when there are no conditions
+        """
+        if not filters:
+            return None
+        conditions = []
+        for key, value in filters.items():
+            values = list(value) if isinstance(value, (list, tuple)) else [value]
+            if any(isinstance(v, float) for v in values):
+                ranges = [FieldCondition(key=key, range=Range(gte=v, lte=v)) for v in values]
+                conditions.append(ranges[0] if len(ranges) == 1 else Filter(should=ranges))
+            elif isinstance(value, (list, tuple)):
+                conditions.append(FieldCondition(key=key, match=MatchAny(any=values)))
             else:
-                client = QdrantClient(
-                    host=settings.QDRANT_HOST,
-                    port=settings.QDRANT_PORT,
+                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+        return Filter(must=conditions)
+
+    async def create_payload_indexes(self) -> None:
+        """Create the payload indexes declared in QDRANT_PAYLOAD_INDEXES that are missing"""
+        name = settings.QDRANT_COLLECTION_NAME
+        collection = await self.client.get_collection(name)
+        existing = collection.payload_schema or {}
+        for field, schema in settings.QDRANT_PAYLOAD_INDEXES.items():
+            if field in existing:
+                continue
+            try:
+                field_schema = PayloadSchemaType(schema.lower())
+            except ValueError:
+                raise VectorSearchError(
+                    f"Unsupported payload index type for {field}: {schema}, supported values: "
+                    f"{', '.join(t.value for t in PayloadSchemaType)}"
                 )
-            return client
-        except Exception as e:
-            raise QdrantConnectionError(f"Qdrant connection failed: {str(e)}")
+            await self.client.create_payload_index(
+                collection_name=name,
+                field_name=field,
+                field_schema=field_schema,
+            )
 
-    def create_collection(self) -> None:
-        """Create collection"""
-        self.client.create_collection(
+    async def create_collection(self) -> None:
+        """Create collection
+
+        Original vectors can be kept on disk while quantized copies stay in
+        RAM (QDRANT_ON_DISK_VECTORS + QDRANT_QUANTIZATION). HNSW, optimizer
+        and sharding parameters come from settings.
+        """
+        await self.client.create_collection(
             collection_name=settings.QDRANT_COLLECTION_NAME,
             vectors_config=VectorParams(
-                size=settings.VECTOR_SIZE, distance=Distance.COSINE
+                size=settings.EMBEDDING_OUTPUT_DIMENSION,
+                distance=Distance.COSINE,
+                on_disk=settings.QDRANT_ON_DISK_VECTORS,
             ),
+            shard_number=settings.QDRANT_SHARD_NUMBER,
+            replication_factor=settings.QDRANT_REPLICATION_FACTOR,
+            write_consistency_factor=settings.QDRANT_WRITE_CONSISTENCY_FACTOR,
+            hnsw_config=self._hnsw_config(),
+            optimizers_config=self._optimizers_config(),
+            quantization_config=self._quantization_config(),
         )
 
-    def health_check(self) -> bool:
+    async def check_vector_size(self) -> None:
+        """
+        Check that the existing collection stores vectors of the configured size
+
+        Raises:
+            VectorSearchError: The collection was created for another
+                EMBEDDING_OUTPUT_DIMENSION (e.g. before EMBEDDING_REDUCED_DIMENSION
+                was changed); it has to be re-created or a new one configured
+        """
+        name = settings.QDRANT_COLLECTION_NAME
+        collection = await self.client.get_collection(name)
+        vectors = collection.config.params.vectors
+        size = vectors.size if isinstance(vectors, VectorParams) else None
+        expected = settings.EMBEDDING_OUTPUT_DIMENSION
+        if size != expected:
+            raise VectorSearchError(
+                f"Collection {name} stores {size}-dimensional vectors but EMBEDDING_OUTPUT_DIMENSION "
+                f"is {expected}; set QDRANT_COLLECTION_NAME to a new collection and re-vectorize, "
+                f"or restore the previous embedding dimension"
+            )
+
+    async def ensure_collection(self) -> None:
+        """
+        Make sure the collection and its payload indexes exist, creating them if needed
+
+        The result is cached, so only the first call talks to Qdrant.
+        Connection errors are raised as QdrantConnectionError and never
+        treated as a missing collection. An existing collection must store
+        vectors of EMBEDDING_OUTPUT_DIMENSION (VectorSearchError otherwise).
+        With QDRANT_UPDATE_COLLECTION_CONFIG, HNSW and optimizer settings
+        are also applied to an existing collection (Qdrant re-indexes it in
+        the background).
+        """
+        if self._collection_ready:
+            return
+
+        if self._collection_lock is None:
+            self._collection_lock = asyncio.Lock()
+
+        async with self._collection_lock:
+            if self._collection_ready:
+                return
+
+            name = settings.QDRANT_COLLECTION_NAME
+            try:
+                if not await self.client.collection_exists(name):
+                    try:
+                        await self.create_collection()
+                    except UnexpectedResponse:
+                        # Created concurrently by another worker
+                        if not await self.client.collection_exists(name):
+                            raise
+                        await self.check_vector_size()
+                else:
+                    await self.check_vector_size()
+                    if settings.QDRANT_UPDATE_COLLECTION_CONFIG:
+                        await self.client.update_collection(
+                            collection_name=name,
+                            hnsw_config=self._hnsw_config(),
+                            optimizers_config=self._optimizers_config(),
+                        )
+                await self.create_payload_indexes()
+            except VectorSearchError:
+                raise
+            except Exception as e:
+                raise QdrantConnectionError(f"Unable to provision collection {name}: {str(e)}")
+
+            self._collection_ready = True
+
+    async def health_check(self) -> bool:
         """Health check"""
         try:
-            collections = self.client.get_collections()
+            collections = await self.client.get_collections()
             return True
         except Exception:
             return False
 
-    def _ensure_collection_exists(self) -> None:
-        """Ensure collection exists, create if not"""
-        try:
-            self.client.get_collection(collection_name=settings.QDRANT_COLLECTION_NAME)
-        except (UnexpectedResponse, Exception):
-            # Collection doesn't exist, create it
-            self.create_collection()
-
-    def upsert_point(self, vector: list[float], payload: dict) -> str:
+    async def upsert_point(self, vector: Vector, payload: dict) -> str:
         """
         Insert or update a point in the collection
 
@@ -75,16 +306,53 @@ class QdrantClientWrapper:
         Returns:
             Point ID
         """
-        # Ensure collection exists before upsert
-        self._ensure_collection_exists()
+        point_ids = await self.upsert_points([vector], [payload])
+        return point_ids[0]
 
-        point_id = str(uuid.uuid4())
-        point = PointStruct(id=point_id, vector=vector, payload=payload)
-        self.client.upsert(
-            collection_name=settings.QDRANT_COLLECTION_NAME,
-            points=[point],
-        )
-        return point_id
+    async def upsert_points(
+        self,
+        vectors: list[Vector],
+        payloads: list[dict],
+        ids: list[str] | None = None,
+        wait: bool = True,
+    ) -> list[str]:
+        """
+        Insert or update many points in one request
+
+        With VECTOR_SEARCH_BACKEND=fallback the points are also mirrored
+        into the local index; with local they are only stored there.
+
+        Args:
+            vectors: Embedding vectors
+            payloads: Payload for each vector
+            ids: Point IDs (random UUIDs when omitted)
+            wait: Wait until the points are applied; with False the call
+                returns once Qdrant has accepted the batch
+
+        Returns:
+            Point IDs, in input order
+        """
+        ids = ids or [str(uuid.uuid4()) for _ in vectors]
+
+        if settings.VECTOR_SEARCH_BACKEND != "local":
+            # Ensure collection exists before upsert (cached after the first call)
+            await self.ensure_collection()
+
+            points = [
+                PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+                for point_id, vector, payload in zip(ids, vectors, payloads)
+            ]
+            await self.client.upsert(
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                points=points,
+                wait=wait,
+            )
+
+        if settings.VECTOR_SEARCH_BACKEND != "qdrant":
+            local_vector_index.add(ids, vectors, payloads)
+
+        self.collection_version += 1
+        return ids
 
 
 # Global instance
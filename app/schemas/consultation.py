@@ -1,12 +1,15 @@
 """Consultation Related Data Models"""
 from pydantic import BaseModel, Field
 
+from app.schemas.embedding import SearchMode
+
 
 class ConsultationRequest(BaseModel):
     """Consultation request"""
 
     query: str = Field(..., description="User-described symptoms or questions", min_length=1, max_length=1000)
     top_k: int = Field(default=5, description="Number of results to return", ge=1, le=20)
+    mode: SearchMode = Field(default="hybrid", description="Retrieval mode: vector, lexical or hybrid")
 
 
 class SymptomInfo(BaseModel):
@@ -15,7 +18,20 @@ class SymptomInfo(BaseModel):
     symptom_name: str = Field(..., description="Symptom name")
     description: str = Field(..., description="Symptom description")
     possible_diseases: list[str] = Field(default_factory=list, description="Possible related diseases")
-    confidence_score: float = Field(..., description="Confidence score", ge=0, le=1)
+    confidence_score: float | None = Field(
+        default=None,
+        description="Cosine similarity between the query and the symptom (clamped to 0-1); "
+        "null for keyword-only matches, which have no comparable confidence",
+        ge=0,
+        le=1,
+    )
+    rank_score: float = Field(
+        ...,
+        description="Score the results are ordered by (0-1): cosine similarity in vector mode, "
+        "BM25 relative to the best hit in lexical mode, normalized RRF score in hybrid mode",
+        ge=0,
+        le=1,
+    )
 
 
 class ConsultationResponse(BaseModel):
@@ -24,3 +40,10 @@ class ConsultationResponse(BaseModel):
     query: str = Field(..., description="Original query")
     results: list[SymptomInfo] = Field(default_factory=list, description="Matched symptom information")
     total_matches: int = Field(default=0, description="Total number of matched results")
+    timings_ms: dict[str, float] = Field(
+        default_factory=dict,
+        description="Milliseconds per pipeline stage (embed, vector_search, lexical_search, fusion, hydrate, total)",
+    )
+    vector_status: str | None = Field(
+        default=None, description="Hybrid mode only: ok, or timeout/error when lexical hits were returned alone"
+    )
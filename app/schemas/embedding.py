@@ -1,19 +1,51 @@
 """Embedding Related Data Models"""
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+# JSON encodings for embedding vectors: a float array, or base64 of the raw
+# little-endian float32 bytes
+EmbeddingEncoding = Literal["float", "base64"]
+
+# Retrieval modes: embedding similarity, BM25 over symptom names/aliases, or
+# both fused with reciprocal rank fusion
+SearchMode = Literal["vector", "lexical", "hybrid"]
+
+# Max characters of a stored text
+STORE_TEXT_MAX_LENGTH = 2048
+
+# Payload filter: field -> value (exact match) or list of values (match any)
+FilterValue = str | int | float | bool
+SearchFilter = dict[str, FilterValue | list[FilterValue]]
+
 
 class EmbeddingRequest(BaseModel):
     """Embedding request"""
 
     text: str = Field(..., description="Text to embed", min_length=1, max_length=2048)
+    encoding: EmbeddingEncoding = Field(
+        default="float", description="Vector encoding: float array or base64 little-endian float32"
+    )
 
 
 class EmbeddingResponse(BaseModel):
     """Embedding response"""
 
     text: str = Field(..., description="Original text")
-    embedding: list[float] = Field(..., description="Embedding vector")
+    embedding: list[float] | str = Field(
+        ..., description="Embedding vector (float array, or base64 string when encoding=base64)"
+    )
     dimension: int = Field(..., description="Vector dimension")
+    encoding: EmbeddingEncoding = Field(default="float", description="Vector encoding")
+
+
+class EmbeddingBatchRequest(BaseModel):
+    """Batch embedding request"""
+
+    texts: list[str] = Field(..., description="Texts to embed", min_length=1)
+    encoding: EmbeddingEncoding = Field(
+        default="float", description="Vector encoding: float array or base64 little-endian float32"
+    )
 
 
 class SearchRequest(BaseModel):
@@ -21,12 +53,51 @@ class SearchRequest(BaseModel):
 
     query: str = Field(..., description="Query text", min_length=1, max_length=1000)
     top_k: int = Field(default=5, description="Number of results to return", ge=1, le=20)
+    mode: SearchMode = Field(default="vector", description="Retrieval mode: vector, lexical or hybrid")
+    filter: SearchFilter | None = Field(
+        default=None,
+        description="Payload conditions, e.g. {\"department\": [\"cardiology\", \"neurology\"]}; all must match",
+    )
+
+
+class SearchBatchRequest(BaseModel):
+    """Multi-query search request"""
+
+    queries: list[str] = Field(..., description="Query texts (e.g. one per symptom phrase)", min_length=1)
+    top_k: int = Field(default=5, description="Number of results to return per query", ge=1, le=20)
+    filter: SearchFilter | None = Field(default=None, description="Payload conditions applied to every query")
+
+
+class SearchBatchItem(BaseModel):
+    """Results of one query in a multi-query search"""
+
+    query: str = Field(..., description="Query text")
+    total_matches: int = Field(..., description="Number of matched results")
+    results: list[dict] = Field(..., description="Matched points with id, score and payload")
+
+
+class SearchBatchResponse(BaseModel):
+    """Multi-query search response"""
+
+    total: int = Field(..., description="Number of queries in the request")
+    results: list[SearchBatchItem] = Field(..., description="Per-query results, in request order")
 
 
 class StoreRequest(BaseModel):
     """Store embedding request"""
 
-    text: str = Field(..., description="Text to embed and store", min_length=1, max_length=2048)
+    text: str = Field(..., description="Text to embed and store", min_length=1, max_length=STORE_TEXT_MAX_LENGTH)
+    metadata: dict | None = Field(default=None, description="Optional metadata to store with the text")
+
+
+class StoreBatchItem(BaseModel):
+    """Bulk store item
+
+    Text length is checked per item by the ingest pipeline, so an empty or
+    too-long text fails that item rather than the whole request.
+    """
+
+    text: str = Field(..., description=f"Text to embed and store (1-{STORE_TEXT_MAX_LENGTH} characters)")
     metadata: dict | None = Field(default=None, description="Optional metadata to store with the text")
 
 
@@ -36,3 +107,41 @@ class StoreResponse(BaseModel):
     point_id: str = Field(..., description="ID of the stored point")
     text: str = Field(..., description="Original text")
     dimension: int = Field(..., description="Vector dimension")
+
+
+class StoreBatchRequest(BaseModel):
+    """Bulk store embedding request"""
+
+    items: list[StoreBatchItem] = Field(..., description="Texts (with optional metadata) to store", min_length=1)
+    wait: bool = Field(
+        default=False,
+        description="Wait until Qdrant has applied each upsert (slower; default returns once accepted)",
+    )
+
+
+class StoreBatchItemResult(BaseModel):
+    """Per-item result of a bulk store"""
+
+    index: int = Field(..., description="Index of the item in the request")
+    status: Literal["stored", "failed"] = Field(..., description="Item status")
+    point_id: str | None = Field(default=None, description="ID of the stored point")
+    error: str | None = Field(default=None, description="Failure reason")
+
+
+class StoreBatchResponse(BaseModel):
+    """Bulk store embedding response"""
+
+    total: int = Field(..., description="Number of items in the request")
+    stored: int = Field(..., description="Number of items stored")
+    failed: int = Field(..., description="Number of items that failed")
+    dimension: int = Field(..., description="Vector dimension")
+    results: list[StoreBatchItemResult] = Field(..., description="Per-item results, in request order")
+
+
+class CatalogVectorizeRequest(BaseModel):
+    """Catalog vectorization request"""
+
+    kinds: list[Literal["symptom", "disease"]] = Field(
+        default=["symptom", "disease"], description="Catalog tables to vectorize", min_length=1
+    )
+    force: bool = Field(default=False, description="Re-embed every row, not only new or changed ones")
@@ -62,7 +62,12 @@ class DiseaseResponse(DiseaseBase, TimestampMixin):
 class DiseaseListResponse(BaseModel):
     """Schema for disease list response"""
 
-    total: int = Field(description="Total number of diseases")
+    total: int | None = Field(
+        default=None, description="Total number of diseases (list endpoints: only with include_total=true)"
+    )
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page (None on the last page)"
+    )
     items: list[DiseaseResponse] = Field(description="List of diseases")
 
 
@@ -113,7 +118,12 @@ class SymptomResponse(SymptomBase, TimestampMixin):
 class SymptomListResponse(BaseModel):
     """Schema for symptom list response"""
 
-    total: int = Field(description="Total number of symptoms")
+    total: int | None = Field(
+        default=None, description="Total number of symptoms (list endpoints: only with include_total=true)"
+    )
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page (None on the last page)"
+    )
     items: list[SymptomResponse] = Field(description="List of symptoms")
 
 
@@ -200,6 +210,7 @@ class ConversationResponse(ConversationBase, TimestampMixin):
 
     id: int = Field(description="Conversation ID")
     user_id: Optional[int] = Field(None, description="Current logged-in user ID")
+    message_count: int = Field(0, description="Number of messages in this conversation")
 
     class Config:
         from_attributes = True
@@ -208,7 +219,12 @@ class ConversationResponse(ConversationBase, TimestampMixin):
 class ConversationListResponse(BaseModel):
     """Schema for conversation list response"""
 
-    total: int = Field(description="Total number of conversations")
+    total: int | None = Field(
+        default=None, description="Total number of conversations (list endpoints: only with include_total=true)"
+    )
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page (None on the last page)"
+    )
     items: list[ConversationResponse] = Field(description="List of conversations")
 
 
@@ -261,5 +277,10 @@ class MessageResponse(MessageBase):
 class MessageListResponse(BaseModel):
     """Schema for message list response"""
 
-    total: int = Field(description="Total number of messages")
+    total: int | None = Field(
+        default=None, description="Total number of messages (list endpoints: only with include_total=true)"
+    )
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page (None on the last page)"
+    )
     items: list[MessageResponse] = Field(description="List of messages")
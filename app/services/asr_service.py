@@ -9,14 +9,32 @@ from dashscope.audio.asr import Recognition
 from http import HTTPStatus
 
 from app.core.config import settings
-from app.core.exceptions import ASRServiceError, InvalidAudioFileError
+from app.core.exceptions import (
+    ASRServiceError,
+    InvalidAudioFileError,
+    ProviderResponseError,
+    ProviderUnavailableError,
+)
+from app.services.provider_client import ProviderClient
 
 
 class ASRService:
-    """Bailian ASR service"""
+    """Bailian ASR service
+
+    Recognition calls are blocking, so they run in a worker pool through a
+    ProviderClient (retries, circuit breaker, ASR_DEADLINE). They are not
+    hedged: a duplicate recognition of a long file costs as much as the
+    original.
+    """
 
     def __init__(self):
         self._initialized = False
+        self.client = ProviderClient(
+            "asr",
+            max_workers=settings.ASR_MAX_CONCURRENCY,
+            timeout=settings.ASR_TIMEOUT,
+            deadline=settings.ASR_DEADLINE,
+        )
 
     def _ensure_initialized(self):
         """Ensure API Key is configured"""
@@ -35,6 +53,32 @@ class ASRService:
 
         self._initialized = True
 
+    @staticmethod
+    def _recognize(file_path: str, audio_format: str, sample_rate: int):
+        """
+        Run one blocking recognition call (executed in the worker pool)
+
+        Returns:
+            Tuple of (Recognition instance, recognition result)
+        """
+        # Create Recognition instance
+        recognition = Recognition(
+            model=settings.FUN_ASR_MODEL,
+            format=audio_format,
+            sample_rate=sample_rate,
+            callback=None,
+        )
+
+        # Synchronous recognition call
+        result = recognition.call(file_path)
+
+        if result.status_code != HTTPStatus.OK:
+            raise ProviderResponseError(
+                f"Speech recognition failed: {result.message} (code: {result.status_code})",
+                status_code=result.status_code,
+            )
+        return recognition, result
+
     async def recognize_file(
         self,
         file_path: str,
@@ -66,22 +110,10 @@ class ASRService:
             raise InvalidAudioFileError("Audio file is empty")
 
         try:
-            # Create Recognition instance
-            recognition = Recognition(
-                model=settings.FUN_ASR_MODEL,
-                format=audio_format,
-                sample_rate=sample_rate,
-                callback=None,
+            recognition, result = await self.client.call(
+                self._recognize, file_path, audio_format, sample_rate
             )
 
-            # Synchronous recognition call
-            result = recognition.call(file_path)
-
-            if result.status_code != HTTPStatus.OK:
-                raise ASRServiceError(
-                    f"Speech recognition failed: {result.message} (code: {result.status_code})"
-                )
-
             # Get recognition result
             sentences = result.get_sentence()
 
@@ -109,10 +141,10 @@ class ASRService:
                 "last_package_delay": recognition.get_last_package_delay(),
             }
 
-        except InvalidAudioFileError:
-            raise
-        except ASRServiceError:
+        except (InvalidAudioFileError, ASRServiceError, ProviderUnavailableError):
             raise
+        except ProviderResponseError as e:
+            raise ASRServiceError(e.message)
         except Exception as e:
             raise ASRServiceError(f"Speech recognition error: {str(e)}")
 
@@ -0,0 +1,272 @@
+"""Catalog Vectorization
+
+Embeds the SympGAN catalog (symptoms and diseases) from SQLite into the
+vector database. Rows are streamed in pages; each page is embedded with one
+embed_batch call, upserted with deterministic point IDs (derived from the
+CUI, so re-runs overwrite instead of duplicating) and checkpointed in the
+vector_sync_state table together with a hash of the embedded content.
+An interrupted run therefore resumes where it stopped, and later runs only
+re-embed rows whose content (or embedding model) changed.
+"""
+import asyncio
+import hashlib
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from app.core.config import settings
+from app.core.exceptions import MediBridgeException, VectorSearchError
+from app.models.sqlite_db import Disease, SQLiteClientWrapper, Symptom, VectorSyncState
+from app.models.sqlite_writer import sqlite_writer
+from app.models.vector_db import qdrant_client
+from app.services.embedding_service import embedding_service
+
+# Catalog tables that can be vectorized, by kind
+CATALOG_MODELS = {"symptom": Symptom, "disease": Disease}
+
+# Namespace for point IDs: uuid5(namespace, "<kind>:<cui>")
+POINT_ID_NAMESPACE = uuid.UUID("6f1c5c9e-2b1d-5e4a-9a57-3d0e8b4f7c21")
+
+
+def catalog_point_id(kind: str, cui: str) -> str:
+    """Deterministic Qdrant point ID of a catalog row"""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{kind}:{cui}"))
+
+
+def build_embedding_text(name: str, alias: str | None, definition: str | None) -> str:
+    """
+    Build the text embedded for a catalog row
+
+    Args:
+        name: Preferred name
+        alias: Pipe-separated aliases
+        definition: Definition text
+
+    Returns:
+        "name (alias, alias, ...): definition", cut to CATALOG_EMBED_MAX_CHARS
+    """
+    aliases = [a.strip() for a in (alias or "").split("|") if a.strip() and a.strip() != name]
+    text = name
+    if aliases:
+        text += f" ({', '.join(dict.fromkeys(aliases))})"
+    if definition:
+        text += f": {definition}"
+    return text[: settings.CATALOG_EMBED_MAX_CHARS]
+
+
+def content_hash(model_key: str, dimension: int, text: str) -> str:
+    """Hash of what determines a row's vector (text and embedding model)"""
+    return hashlib.sha256(f"{model_key}\0{dimension}\0{text}".encode("utf-8")).hexdigest()
+
+
+class CatalogVectorizer:
+    """Resumable, incremental vectorization of the SympGAN catalog
+
+    One run at a time can be started in the background (start); its
+    progress is available from status().
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self.progress: dict = {"status": "idle"}
+
+    @property
+    def running(self) -> bool:
+        """Whether a background run is in progress"""
+        return self._task is not None and not self._task.done()
+
+    async def run(
+        self,
+        kinds: list[str] | None = None,
+        batch_size: int | None = None,
+        force: bool = False,
+        on_batch: Callable[[str, int], None] | None = None,
+    ) -> dict:
+        """
+        Vectorize catalog rows that are new or changed
+
+        Args:
+            kinds: Catalog kinds to process (default: symptom and disease)
+            batch_size: Rows per page (one embed_batch and one upsert each)
+            force: Re-embed every row, ignoring stored content hashes
+            on_batch: Called with (kind, rows processed) after each page
+
+        Returns:
+            Run progress with per-kind counters (total, scanned, embedded,
+            unchanged, failed)
+        """
+        kinds = kinds or list(CATALOG_MODELS)
+        unknown = [kind for kind in kinds if kind not in CATALOG_MODELS]
+        if unknown:
+            raise VectorSearchError(
+                f"Unknown catalog kind: {', '.join(unknown)}, "
+                f"supported kinds: {', '.join(CATALOG_MODELS)}"
+            )
+        batch_size = batch_size or settings.CATALOG_VECTORIZE_BATCH_SIZE
+
+        self.progress = {
+            "status": "running",
+            "force": force,
+            "started_at": time.time(),
+            "kinds": {
+                kind: {"total": 0, "scanned": 0, "embedded": 0, "unchanged": 0, "failed": 0}
+                for kind in kinds
+            },
+        }
+        try:
+            if settings.VECTOR_SEARCH_BACKEND != "local":
+                await qdrant_client.ensure_collection()
+            for kind in kinds:
+                await self._sync_kind(kind, batch_size, force, self.progress["kinds"][kind], on_batch)
+            self.progress["status"] = "completed"
+        except Exception as e:
+            self.progress["status"] = "failed"
+            self.progress["error"] = str(e)
+            raise
+        finally:
+            self.progress["finished_at"] = time.time()
+        return self.progress
+
+    async def _sync_kind(
+        self,
+        kind: str,
+        batch_size: int,
+        force: bool,
+        stats: dict,
+        on_batch: Callable[[str, int], None] | None,
+    ) -> None:
+        """Vectorize one catalog table, page by page (keyset pagination on id)
+
+        Pages are read with short read-only sessions, and no write
+        transaction is held while a page is embedded and upserted.
+        """
+        model = CATALOG_MODELS[kind]
+        model_key, dimension = embedding_service.model_key, embedding_service.dimension
+
+        async with await SQLiteClientWrapper.get_read_session() as session:
+            stats["total"] = (await session.execute(select(func.count()).select_from(model))).scalar()
+
+        last_id = 0
+        while True:
+            async with await SQLiteClientWrapper.get_read_session() as session:
+                result = await session.execute(
+                    select(model.id, model.cui, model.name, model.alias, model.definition)
+                    .where(model.id > last_id)
+                    .order_by(model.id)
+                    .limit(batch_size)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                result = await session.execute(
+                    select(VectorSyncState.cui, VectorSyncState.content_hash).where(
+                        VectorSyncState.kind == kind,
+                        VectorSyncState.cui.in_([row.cui for row in rows]),
+                    )
+                )
+                synced = dict(result.all())
+
+            pending = []
+            for row in rows:
+                text = build_embedding_text(row.name, row.alias, row.definition)
+                digest = content_hash(model_key, dimension, text)
+                if force or synced.get(row.cui) != digest:
+                    pending.append((row, text, digest))
+
+            stats["scanned"] += len(rows)
+            stats["unchanged"] += len(rows) - len(pending)
+            if pending:
+                await self._sync_rows(kind, pending, stats)
+
+            if on_batch is not None:
+                on_batch(kind, len(rows))
+
+    @staticmethod
+    async def _sync_rows(kind: str, pending: list[tuple], stats: dict) -> None:
+        """Embed and upsert one page of changed rows, then checkpoint them"""
+        vectors = await embedding_service.embed_batch([text for _, text, _ in pending], return_exceptions=True)
+
+        stored = [
+            (row, text, digest, vector)
+            for (row, text, digest), vector in zip(pending, vectors)
+            if not isinstance(vector, MediBridgeException)
+        ]
+        stats["failed"] += len(pending) - len(stored)
+        if not stored:
+            return
+
+        point_ids = [catalog_point_id(kind, row.cui) for row, _, _, _ in stored]
+        await qdrant_client.upsert_points(
+            [vector for _, _, _, vector in stored],
+            [
+                {
+                    "text": text,
+                    "cui": row.cui,
+                    "name": row.name,
+                    "definition": row.definition,
+                    "type": kind,
+                    "source": "sympgan",
+                }
+                for row, text, _, _ in stored
+            ],
+            ids=point_ids,
+            wait=True,
+        )
+
+        # Checkpoint only after Qdrant has applied the points, in a short
+        # transaction of its own on the single-writer queue
+        stmt = insert(VectorSyncState).values([
+            {"kind": kind, "cui": row.cui, "point_id": point_id, "content_hash": digest}
+            for (row, _, digest, _), point_id in zip(stored, point_ids)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "cui"],
+            set_={
+                "point_id": stmt.excluded.point_id,
+                "content_hash": stmt.excluded.content_hash,
+                "synced_at": func.current_timestamp(),
+            },
+        )
+
+        async def write(session) -> None:
+            await session.execute(stmt)
+
+        await sqlite_writer.submit(write)
+        stats["embedded"] += len(stored)
+
+    def start(self, kinds: list[str] | None = None, force: bool = False) -> bool:
+        """
+        Start a run in the background
+
+        Args:
+            kinds: Catalog kinds to process (default: all)
+            force: Re-embed every row
+
+        Returns:
+            False if a run is already in progress
+        """
+        if self.running:
+            return False
+        self.progress = {"status": "running", "force": force, "started_at": time.time(), "kinds": {}}
+        self._task = asyncio.create_task(self.run(kinds, force=force))
+        self._task.add_done_callback(self._finished)
+        return True
+
+    @staticmethod
+    def _finished(task: asyncio.Task) -> None:
+        """Retrieve a background run's exception (recorded in progress)"""
+        if not task.cancelled():
+            task.exception()
+
+    def status(self) -> dict:
+        """Progress of the current or last run"""
+        return {**self.progress, "running": self.running}
+
+
+# Global service instance
+catalog_vectorizer = CatalogVectorizer()
@@ -0,0 +1,130 @@
+"""Consultation Service
+
+End-to-end symptom consultation: retrieve matching symptoms (lexical,
+vector or hybrid), then hydrate them with their SympGAN details and
+associated diseases from SQLite.
+"""
+import time
+
+from app.core.config import settings
+from app.models.sqlite_db import SQLiteClientWrapper
+from app.services.hybrid_search import hybrid_search_service
+from app.services.sqlite_crud import SymptomService
+
+# Only symptom points: catalog diseases share the collection and CUI namespace
+SYMPTOM_FILTER = {"type": "symptom"}
+
+
+class ConsultationService:
+    """Symptom consultation pipeline
+
+    Stages: retrieval (embed + vector_search and/or lexical_search, then
+    fusion) and hydrate. All hits are hydrated with one batched query, not
+    one query per hit. The milliseconds spent in each stage are returned
+    with the results.
+    """
+
+    @staticmethod
+    async def query(query: str, limit: int | None = None, mode: str = "hybrid") -> dict:
+        """
+        Run a consultation query
+
+        Args:
+            query: User-described symptoms
+            limit: Number of symptoms to return
+            mode: Retrieval mode (vector, lexical or hybrid)
+
+        Returns:
+            Dict with results (symptom_name, description, possible_diseases,
+            confidence_score, rank_score), timings_ms and, in hybrid mode,
+            vector_status
+        """
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+
+        search = await hybrid_search_service.search(
+            query=query, limit=limit, mode=mode, filters=SYMPTOM_FILTER, timings=timings
+        )
+
+        hydrate_start = time.perf_counter()
+        results = await ConsultationService._hydrate(search["results"], mode)
+        end = time.perf_counter()
+
+        timings["hydrate"] = (end - hydrate_start) * 1000
+        timings["total"] = (end - start) * 1000
+
+        response = {
+            "results": results,
+            # Copied: a timed-out vector leg may still record into timings
+            "timings_ms": {stage: round(ms, 3) for stage, ms in dict(timings).items()},
+        }
+        if "vector_status" in search:
+            response["vector_status"] = search["vector_status"]
+        return response
+
+    @staticmethod
+    async def _hydrate(hits: list[dict], mode: str) -> list[dict]:
+        """
+        Attach symptom details and associated diseases to search hits
+
+        Symptom hits are matched to symptoms by the CUI in their payload;
+        hits of any other type (or without a known CUI) keep their payload
+        text. Repeated (type, CUI) pairs keep the best-ranked hit.
+
+        The confidence is the hit's cosine similarity, which only vector
+        hits have: a fused hybrid score or a relative BM25 score says how a
+        hit ranks against the others, not how well it matches.
+
+        Args:
+            hits: Search results, best first
+            mode: Retrieval mode the hits come from
+
+        Returns:
+            Consultation results, best first
+        """
+        cuis = [
+            payload["cui"]
+            for payload in (hit.get("payload") or {} for hit in hits)
+            if payload.get("cui") and payload.get("type") == "symptom"
+        ]
+
+        symptoms: dict[str, dict] = {}
+        if cuis:
+            session = await SQLiteClientWrapper.get_read_session()
+            try:
+                symptoms = await SymptomService.get_many_with_diseases(
+                    session, cuis, max_diseases=settings.CONSULTATION_MAX_DISEASES
+                )
+            finally:
+                await session.close()
+
+        results = []
+        seen: set[tuple] = set()
+        for hit in hits:
+            payload = hit.get("payload") or {}
+            cui = payload.get("cui")
+            if cui:
+                key = (payload.get("type"), cui)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            symptom = symptoms.get(cui, {}) if payload.get("type") == "symptom" else {}
+            cosine = hit["score"] if mode == "vector" else hit.get("vector_score")
+            results.append({
+                "symptom_name": symptom.get("name") or payload.get("name") or payload.get("text", ""),
+                "description": symptom.get("definition") or payload.get("definition") or "",
+                "possible_diseases": symptom.get("diseases", []),
+                "confidence_score": _clamp(cosine) if cosine is not None else None,
+                "rank_score": _clamp(hit["score"]),
+            })
+        return results
+
+
+def _clamp(score: float) -> float:
+    """Clamp a score into 0-1"""
+    return max(0.0, min(1.0, score))
+
+
+# Global service instance
+consultation_service = ConsultationService()
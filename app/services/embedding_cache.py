@@ -0,0 +1,255 @@
+"""Embedding Cache
+
+Two-tier, content-addressed cache for embedding vectors: an in-process LRU
+in front of a SQLite file that survives restarts. Entries are keyed by a
+hash of (model, dimension, normalized text).
+
+The disk tier is bounded by row count and entry age, and its blocking
+sqlite3 calls run on a dedicated thread when used from async code
+(aget_many / aset_many).
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.vectors import Vector, from_bytes, to_bytes
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups (NFKC, collapsed whitespace)"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache (memory LRU + SQLite)"""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_size: int | None = None,
+        ttl: float | None = None,
+        disk_max_entries: int | None = None,
+        disk_ttl: float | None = None,
+    ):
+        self.path = settings.EMBEDDING_CACHE_PATH if path is None else path
+        self.memory: LRUCache[Vector] = LRUCache(
+            max_size=settings.EMBEDDING_CACHE_SIZE if max_size is None else max_size,
+            ttl=settings.EMBEDDING_CACHE_TTL if ttl is None else ttl,
+        )
+        self.disk_max_entries = (
+            settings.EMBEDDING_CACHE_DISK_MAX_ENTRIES if disk_max_entries is None else disk_max_entries
+        )
+        self.disk_ttl = settings.EMBEDDING_CACHE_DISK_TTL if disk_ttl is None else disk_ttl
+        # Prune after this many disk writes, so the row limit is overshot by at most ~10%
+        self._prune_interval = max(1, self.disk_max_entries // 10) if self.disk_max_entries else 1000
+        self._writes_since_prune = 0
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self.disk_pruned = 0
+
+    @staticmethod
+    def make_key(model: str, dimension: int, text: str) -> str:
+        """Build the content-addressed cache key"""
+        raw = f"{model}\x1f{dimension}\x1f{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get_conn(self) -> sqlite3.Connection | None:
+        """Open the on-disk store lazily (disabled when path is empty), pruning it on open"""
+        if not self.path:
+            return None
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embedding_cache_created_at ON embedding_cache (created_at)"
+            )
+            self._conn = conn
+            self._prune(conn)
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Delete expired entries, then the oldest ones beyond the row limit"""
+        pruned = 0
+        with conn:
+            if self.disk_ttl:
+                pruned += conn.execute(
+                    "DELETE FROM embedding_cache WHERE created_at < ?",
+                    (time.time() - self.disk_ttl,),
+                ).rowcount
+            if self.disk_max_entries:
+                count = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+                if count > self.disk_max_entries:
+                    pruned += conn.execute(
+                        "DELETE FROM embedding_cache WHERE key IN ("
+                        "SELECT key FROM embedding_cache ORDER BY created_at LIMIT ?)",
+                        (count - self.disk_max_entries,),
+                    ).rowcount
+        self.disk_pruned += pruned
+        self._writes_since_prune = 0
+
+    def _run_in_thread(self, func, *args):
+        """Run a blocking disk-tier call on the cache's own thread"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-cache")
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _get_memory(self, keys: list[str]) -> tuple[dict[str, Vector], list[str]]:
+        """Split keys into memory hits and misses"""
+        found: dict[str, Vector] = {}
+        missing: list[str] = []
+        for key in keys:
+            vector = self.memory.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                found[key] = vector
+        return found, missing
+
+    def _get_disk(self, keys: list[str]) -> dict[str, Vector]:
+        """Look up keys on disk, promoting hits into the memory tier"""
+        found: dict[str, Vector] = {}
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return found
+            placeholders = ",".join("?" * len(keys))
+            min_created_at = time.time() - self.disk_ttl if self.disk_ttl else 0.0
+            rows = conn.execute(
+                f"SELECT key, vector FROM embedding_cache "
+                f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                [*keys, min_created_at],
+            ).fetchall()
+            for key, blob in rows:
+                vector = from_bytes(blob)
+                self.memory.set(key, vector)
+                found[key] = vector
+            self.disk_hits += len(rows)
+        return found
+
+    def _set_disk(self, items: dict[str, Vector]) -> None:
+        """Write vectors to disk, pruning every _prune_interval writes"""
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (key, vector, created_at) "
+                    "VALUES (?, ?, ?)",
+                    [(key, to_bytes(vector), now) for key, vector in items.items()],
+                )
+            self.disk_writes += len(items)
+            self._writes_since_prune += len(items)
+            if self._writes_since_prune >= self._prune_interval:
+                self._prune(conn)
+
+    def get_many(self, keys: list[str]) -> dict[str, Vector]:
+        """
+        Look up several keys, memory first and then disk
+
+        Disk hits are promoted into the memory tier. Blocks on disk I/O;
+        use aget_many from async code.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to vectors
+        """
+        found, missing = self._get_memory(keys)
+        if missing and self.path:
+            found.update(self._get_disk(missing))
+        return found
+
+    async def aget_many(self, keys: list[str]) -> dict[str, Vector]:
+        """Async get_many: the disk lookup runs on the cache thread"""
+        found, missing = self._get_memory(keys)
+        if missing and self.path:
+            found.update(await self._run_in_thread(self._get_disk, missing))
+        return found
+
+    def get(self, key: str) -> Vector | None:
+        """Look up a single key"""
+        return self.get_many([key]).get(key)
+
+    async def aget(self, key: str) -> Vector | None:
+        """Async get"""
+        return (await self.aget_many([key])).get(key)
+
+    def set_many(self, items: dict[str, Vector]) -> None:
+        """Store vectors in both tiers (blocks on disk I/O; use aset_many from async code)"""
+        if not items:
+            return
+
+        for key, vector in items.items():
+            self.memory.set(key, vector)
+        if self.path:
+            self._set_disk(items)
+
+    async def aset_many(self, items: dict[str, Vector]) -> None:
+        """Async set_many: the disk write runs on the cache thread"""
+        if not items:
+            return
+
+        for key, vector in items.items():
+            self.memory.set(key, vector)
+        if self.path:
+            await self._run_in_thread(self._set_disk, dict(items))
+
+    def set(self, key: str, vector: Vector) -> None:
+        """Store a single vector"""
+        self.set_many({key: vector})
+
+    async def aset(self, key: str, vector: Vector) -> None:
+        """Async set"""
+        await self.aset_many({key: vector})
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        self.memory.clear()
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                with conn:
+                    conn.execute("DELETE FROM embedding_cache")
+
+    def stats(self) -> dict:
+        """Get cache counters"""
+        memory = self.memory.stats()
+        return {
+            "memory": memory,
+            "disk_enabled": bool(self.path),
+            "disk_hits": self.disk_hits,
+            "disk_writes": self.disk_writes,
+            "disk_pruned": self.disk_pruned,
+            "hits": memory["hits"] + self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits,
+            "evictions": memory["evictions"],
+        }
+
+    def close(self) -> None:
+        """Close the on-disk store and stop the cache thread"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,92 @@
+"""Embedding Request Coalescer
+
+Gathers concurrent single-text embedding requests for a short window and
+sends them to the provider as one batch call.
+"""
+import asyncio
+from typing import Awaitable, Callable
+
+from app.core.vectors import Vector
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[list[Vector | Exception]]]
+
+
+class EmbeddingCoalescer:
+    """Micro-batching coalescer for concurrent embed_text calls
+
+    A batch is flushed when max_batch_size requests are waiting or window
+    seconds after the first request arrived, whichever comes first. Identical
+    texts in the same batch are embedded once. embed_batch may return an
+    exception in place of a vector, which fails only that text's callers.
+    """
+
+    def __init__(self, embed_batch: EmbedBatchFn, window: float, max_batch_size: int):
+        self._embed_batch = embed_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.requests = 0
+        self.batches = 0
+
+    async def submit(self, text: str) -> Vector:
+        """
+        Queue a text for the next batch and wait for its vector
+
+        Args:
+            text: Input text
+
+        Returns:
+            Embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the pending requests to a background batch call"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Embed one batch and route each vector back to its caller"""
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.batches += 1
+
+        try:
+            vectors = dict(zip(texts, await self._embed_batch(texts)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for text, future in batch:
+            if future.done():
+                continue
+            if isinstance(vectors[text], Exception):
+                future.set_exception(vectors[text])
+            else:
+                future.set_result(vectors[text])
+
+    def stats(self) -> dict:
+        """Get coalescing counters"""
+        return {"requests": self.requests, "batches": self.batches}
@@ -0,0 +1,160 @@
+"""Embedding Providers
+
+Backends that turn texts into vectors. EmbeddingService selects one via
+settings.EMBEDDING_PROVIDER and runs its blocking embed() in a worker pool.
+"""
+import hashlib
+import os
+import unicodedata
+from abc import ABC, abstractmethod
+
+import dashscope
+import numpy as np
+from dashscope import TextEmbedding
+
+from app.core.config import settings
+from app.core.exceptions import ProviderResponseError, VectorSearchError
+from app.core.vectors import VECTOR_DTYPE, as_matrix
+
+
+class EmbeddingProvider(ABC):
+    """Base class for embedding backends"""
+
+    name: str = ""
+
+    def __init__(self, model: str, dimension: int):
+        self.model = model
+        self.dimension = dimension
+
+    def ensure_ready(self) -> None:
+        """Check the provider is configured, raising VectorSearchError if not"""
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed texts (blocking)
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            float32 matrix of shape (len(texts), dimension), in input order
+        """
+
+
+class DashScopeEmbeddingProvider(EmbeddingProvider):
+    """Bailian (dashscope) text embedding provider"""
+
+    name = "dashscope"
+
+    def __init__(self):
+        super().__init__(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSION)
+        self._initialized = False
+
+    def ensure_ready(self) -> None:
+        """Ensure API Key is configured"""
+        if self._initialized:
+            return
+
+        # Set API Key
+        if settings.BAILIAN_API_KEY:
+            dashscope.api_key = settings.BAILIAN_API_KEY
+        else:
+            # Try to get from environment variable BAILIAN_API_KEY
+            api_key = os.environ.get("BAILIAN_API_KEY")
+            if not api_key:
+                raise VectorSearchError("BAILIAN_API_KEY not configured")
+            dashscope.api_key = api_key
+
+        self._initialized = True
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Call TextEmbedding for a batch of texts"""
+        resp = TextEmbedding.call(
+            model=self.model,
+            input=texts if len(texts) > 1 else texts[0],
+            dimension=self.dimension,
+        )
+
+        if resp.status_code != 200:
+            raise ProviderResponseError(
+                f"Embedding API error: {resp.message} (code: {resp.status_code})",
+                status_code=resp.status_code,
+            )
+
+        # Extract embedding vectors
+        items = sorted(resp.output["embeddings"], key=lambda item: item.get("text_index", 0))
+        return as_matrix(item["embedding"] for item in items)
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Offline CPU embedding provider based on feature hashing
+
+    Word tokens and character 1-3 grams are hashed into a signed
+    EMBEDDING_DIMENSION-sized vector and L2-normalized. It needs no network
+    or model files, which makes it suitable for load tests, CI benchmarks and
+    air-gapped deployments. Similarity is lexical rather than semantic.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        super().__init__("local-hashing", settings.EMBEDDING_DIMENSION)
+
+    @staticmethod
+    def _features(text: str) -> list[str]:
+        """Extract word and character n-gram features"""
+        text = unicodedata.normalize("NFKC", text).lower()
+        features = [f"w:{word}" for word in text.split()]
+        padded = f" {' '.join(text.split())} "
+        for n in (1, 2, 3):
+            features.extend(f"c{n}:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+        return features
+
+    def _embed_one(self, text: str, out: np.ndarray) -> None:
+        """Hash one text into a normalized vector, written into out"""
+        indices, signs = [], []
+        for feature in self._features(text):
+            digest = int.from_bytes(
+                hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            indices.append(digest % self.dimension)
+            signs.append(1.0 if (digest >> 63) & 1 else -1.0)
+
+        np.add.at(out, indices, signs)
+        norm = np.linalg.norm(out)
+        if norm:
+            out /= norm
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts locally"""
+        matrix = np.zeros((len(texts), self.dimension), dtype=VECTOR_DTYPE)
+        for row, text in zip(matrix, texts):
+            self._embed_one(text, row)
+        return matrix
+
+
+EMBEDDING_PROVIDERS: dict[str, type[EmbeddingProvider]] = {
+    DashScopeEmbeddingProvider.name: DashScopeEmbeddingProvider,
+    HashingEmbeddingProvider.name: HashingEmbeddingProvider,
+}
+
+
+def get_embedding_provider(name: str | None = None) -> EmbeddingProvider:
+    """
+    Create the embedding provider selected by configuration
+
+    Args:
+        name: Provider name (defaults to settings.EMBEDDING_PROVIDER)
+
+    Returns:
+        Embedding provider instance
+    """
+    name = name or settings.EMBEDDING_PROVIDER
+    provider_class = EMBEDDING_PROVIDERS.get(name)
+    if provider_class is None:
+        raise VectorSearchError(
+            f"Unknown embedding provider: {name}, "
+            f"available providers: {', '.join(EMBEDDING_PROVIDERS)}"
+        )
+    return provider_class()
@@ -1,38 +1,188 @@
-"""Bailian Embedding Service"""
-import os
+"""Text Embedding Service"""
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Iterable
 
-import dashscope
-from dashscope import TextEmbedding
+import numpy as np
 
 from app.core.config import settings
-from app.core.exceptions import VectorSearchError
+from app.core.exceptions import (
+    MediBridgeException,
+    ProviderResponseError,
+    ProviderUnavailableError,
+    VectorSearchError,
+)
+from app.core.vectors import DimensionReducer, Vector
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_coalescer import EmbeddingCoalescer
+from app.services.embedding_providers import EmbeddingProvider, get_embedding_provider
+from app.services.provider_client import ProviderClient
 
 
 class EmbeddingService:
-    """Bailian text embedding service"""
+    """Text embedding service
 
-    def __init__(self):
-        self._initialized = False
-        self.model = "text-embedding-v4"
+    Texts are embedded by the provider selected with EMBEDDING_PROVIDER.
+    Provider calls are blocking, so they go through a ProviderClient that
+    runs them in a bounded thread pool with retries, hedging, a circuit
+    breaker and a per-call deadline. Vectors
+    are served from a two-tier embedding cache when possible, and concurrent
+    cache misses are coalesced into batch calls. When
+    EMBEDDING_REDUCED_DIMENSION is set, every vector (stored or queried) is
+    reduced the same way before it leaves the service.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider | None = None,
+        reducer: DimensionReducer | None = None,
+    ):
+        self.provider = provider or get_embedding_provider()
+        self.reducer = reducer or get_dimension_reducer(self.provider.dimension)
+        self.model = self.provider.model
+        self.dimension = self.reducer.output_dimension if self.reducer else self.provider.dimension
+        self.client = ProviderClient(
+            f"embedding-{self.provider.name}",
+            max_workers=settings.EMBEDDING_MAX_CONCURRENCY,
+            timeout=settings.EMBEDDING_TIMEOUT,
+            deadline=settings.EMBEDDING_DEADLINE,
+            hedge_percentile=settings.EMBEDDING_HEDGE_PERCENTILE,
+        )
+        self._semaphore: asyncio.Semaphore | None = None
+        self.cache = EmbeddingCache() if settings.EMBEDDING_CACHE_ENABLED else None
+        self.coalescer = (
+            EmbeddingCoalescer(
+                self._embed_many,
+                window=settings.EMBEDDING_COALESCE_WINDOW_MS / 1000,
+                max_batch_size=settings.EMBEDDING_COALESCE_MAX_BATCH,
+            )
+            if settings.EMBEDDING_COALESCE_ENABLED
+            else None
+        )
 
     def _ensure_initialized(self):
-        """Ensure API Key is configured"""
-        if self._initialized:
-            return
+        """Ensure the provider is configured"""
+        self.provider.ensure_ready()
 
-        # Set API Key
-        if settings.BAILIAN_API_KEY:
-            dashscope.api_key = settings.BAILIAN_API_KEY
-        else:
-            # Try to get from environment variable BAILIAN_API_KEY
-            api_key = os.environ.get("BAILIAN_API_KEY")
-            if not api_key:
-                raise VectorSearchError("BAILIAN_API_KEY not configured")
-            dashscope.api_key = api_key
+    async def _request_embeddings(self, texts: list[str]) -> np.ndarray:
+        """
+        Request embeddings for texts from the provider (no caching)
+
+        Concurrency is bounded by EMBEDDING_MAX_CONCURRENCY. Transient
+        failures are retried by the provider client within
+        EMBEDDING_DEADLINE; a ProviderUnavailableError means the provider is
+        down or too slow.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            float32 matrix of shape (len(texts), self.dimension), in input order
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.EMBEDDING_MAX_CONCURRENCY)
+
+        async with self._semaphore:
+            matrix = await self.client.call(self.provider.embed, texts)
+
+        if self.reducer is not None:
+            matrix = self.reducer.reduce(matrix)
+        return matrix
+
+    @staticmethod
+    def _split_chunks(texts: list[str]) -> list[tuple[int, list[str]]]:
+        """
+        Split texts into provider-sized chunks
+
+        A chunk is closed once it holds EMBEDDING_BATCH_SIZE texts or adding
+        the next text would exceed EMBEDDING_BATCH_MAX_CHARS.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List of (offset of first text, chunk texts)
+        """
+        chunks: list[tuple[int, list[str]]] = []
+        start, chars = 0, 0
+        for i, text in enumerate(texts):
+            size = i - start
+            if size and (
+                size >= settings.EMBEDDING_BATCH_SIZE
+                or chars + len(text) > settings.EMBEDDING_BATCH_MAX_CHARS
+            ):
+                chunks.append((start, texts[start:i]))
+                start, chars = i, 0
+            chars += len(text)
+        chunks.append((start, texts[start:]))
+        return chunks
+
+    async def _embed_chunk(self, texts: list[str]) -> list[Vector | MediBridgeException]:
+        """
+        Embed one chunk, isolating bad items
 
-        self._initialized = True
+        Transient failures are already retried by the provider client. If
+        the provider rejects the chunk, it is bisected so one bad item only
+        fails itself. When the provider is unavailable every item gets that
+        error without further calls.
 
-    async def embed_text(self, text: str) -> list[float]:
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            Vector or error for each text, in input order
+        """
+        try:
+            return list(await self._request_embeddings(texts))
+        except ProviderUnavailableError as e:
+            return [e] * len(texts)
+        except ProviderResponseError as e:
+            error = VectorSearchError(e.message)
+        except VectorSearchError as e:
+            error = e
+        except Exception as e:
+            error = VectorSearchError(f"Batch embedding failed: {str(e)}")
+
+        if len(texts) == 1:
+            return [error]
+
+        middle = len(texts) // 2
+        left, right = await asyncio.gather(
+            self._embed_chunk(texts[:middle]),
+            self._embed_chunk(texts[middle:]),
+        )
+        return left + right
+
+    async def _embed_many(self, texts: list[str]) -> list[Vector | MediBridgeException]:
+        """
+        Embed any number of texts (no caching)
+
+        Chunks are dispatched concurrently; the provider semaphore bounds how
+        many are in flight. Results are reassembled in input order.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            Vector or error for each text, in input order
+        """
+        chunks = self._split_chunks(texts)
+        results = await asyncio.gather(*(self._embed_chunk(chunk) for _, chunk in chunks))
+
+        embeddings: list[Vector | MediBridgeException] = [None] * len(texts)
+        for (start, chunk), vectors in zip(chunks, results):
+            embeddings[start : start + len(chunk)] = vectors
+        return embeddings
+
+    @property
+    def model_key(self) -> str:
+        """Identifies the vectors this service produces (model and reduction)"""
+        return f"{self.model}/{self.reducer.key}" if self.reducer else self.model
+
+    def _cache_key(self, text: str) -> str:
+        """Build the embedding cache key for a text"""
+        return EmbeddingCache.make_key(self.model_key, self.dimension, text)
+
+    async def embed_text(self, text: str) -> Vector:
         """
         Convert text to embedding vector
 
@@ -40,67 +190,205 @@ class EmbeddingService:
             text: Input text
 
         Returns:
-            Embedding vector
+            Embedding vector (float32)
         """
-        self._ensure_initialized()
-
         if not text or not text.strip():
             raise VectorSearchError("Input text cannot be empty")
 
-        try:
-            resp = TextEmbedding.call(
-                model=self.model,
-                input=text,
-            )
-
-            if resp.status_code != 200:
-                raise VectorSearchError(
-                    f"Embedding API error: {resp.message} (code: {resp.status_code})"
-                )
+        if self.cache is not None:
+            key = self._cache_key(text)
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
 
-            # Extract embedding vector
-            embedding = resp.output["embeddings"][0]["embedding"]
-            return embedding
+        self._ensure_initialized()
 
-        except VectorSearchError:
+        try:
+            if self.coalescer is not None:
+                # Share a batch call with other requests arriving concurrently
+                embedding = await self.coalescer.submit(text)
+            else:
+                embedding = (await self._request_embeddings([text]))[0]
+        except (VectorSearchError, ProviderUnavailableError):
             raise
+        except ProviderResponseError as e:
+            raise VectorSearchError(e.message)
         except Exception as e:
             raise VectorSearchError(f"Embedding failed: {str(e)}")
 
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if self.cache is not None:
+            await self.cache.aset(key, embedding)
+        return embedding
+
+    async def embed_batch(
+        self, texts: list[str], return_exceptions: bool = False
+    ) -> list[Vector | MediBridgeException]:
         """
         Convert multiple texts to embedding vectors (batch processing)
 
+        Cached texts are served locally; the misses are split into
+        provider-sized chunks and embedded concurrently. Inputs of any size
+        are accepted.
+
         Args:
             texts: List of input texts
+            return_exceptions: Return the error (VectorSearchError or
+                ProviderUnavailableError) in place of each text that failed
+                instead of raising
 
         Returns:
-            List of embedding vectors
+            List of float32 embedding vectors, in input order
         """
-        self._ensure_initialized()
-
         if not texts:
             raise VectorSearchError("Input texts list cannot be empty")
 
+        if self.cache is None:
+            keys = list(range(len(texts)))
+            found: dict = {}
+        else:
+            keys = [self._cache_key(text) for text in texts]
+            found = await self.cache.aget_many(keys)
+
+        # Embed each missing key once, even if repeated in the input
+        pending: dict = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+
+        if pending:
+            self._ensure_initialized()
+            results = dict(zip(pending.keys(), await self._embed_many(list(pending.values()))))
+
+            fresh = {
+                key: vector
+                for key, vector in results.items()
+                if not isinstance(vector, MediBridgeException)
+            }
+            if self.cache is not None:
+                await self.cache.aset_many(fresh)
+            found.update(results)
+
+        embeddings = [found[key] for key in keys]
+        if not return_exceptions:
+            for i, vector in enumerate(embeddings):
+                if isinstance(vector, ProviderUnavailableError):
+                    raise vector
+                if isinstance(vector, VectorSearchError):
+                    raise VectorSearchError(f"Batch embedding failed at index {i}: {vector.message}")
+        return embeddings
+
+    async def stream_batch(
+        self, texts: AsyncIterable[str] | Iterable[str]
+    ) -> AsyncIterator[tuple[int, list[Vector | MediBridgeException]]]:
+        """
+        Embed a stream of texts, yielding results chunk by chunk
+
+        Texts are consumed incrementally and grouped into EMBEDDING_BATCH_SIZE
+        chunks. At most EMBEDDING_MAX_CONCURRENCY chunks are in flight, so
+        memory stays bounded however long the input is. Chunks are yielded
+        as soon as they complete, which may be out of input order.
+
+        Args:
+            texts: Input texts (sync or async iterable)
+
+        Yields:
+            (index of the chunk's first text, vector or error per text)
+        """
+        in_flight: set[asyncio.Task] = set()
+
+        async def embed_chunk(start: int, chunk: list[str]):
+            results = [None] * len(chunk)
+            valid = [i for i, text in enumerate(chunk) if text and text.strip()]
+            for i in set(range(len(chunk))) - set(valid):
+                results[i] = VectorSearchError("Input text cannot be empty")
+            if valid:
+                vectors = await self.embed_batch([chunk[i] for i in valid], return_exceptions=True)
+                for i, vector in zip(valid, vectors):
+                    results[i] = vector
+            return start, results
+
+        async def chunks():
+            if isinstance(texts, AsyncIterable):
+                source = texts
+            else:
+                source = _aiter(texts)
+
+            chunk: list[str] = []
+            start = 0
+            async for text in source:
+                chunk.append(text)
+                if len(chunk) >= settings.EMBEDDING_BATCH_SIZE:
+                    yield start, chunk
+                    start, chunk = start + len(chunk), []
+            if chunk:
+                yield start, chunk
+
         try:
-            resp = TextEmbedding.call(
-                model=self.model,
-                input=texts,
-            )
+            async for start, chunk in chunks():
+                in_flight.add(asyncio.create_task(embed_chunk(start, chunk)))
+                if len(in_flight) >= settings.EMBEDDING_MAX_CONCURRENCY:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
 
-            if resp.status_code != 200:
-                raise VectorSearchError(
-                    f"Batch embedding API error: {resp.message} (code: {resp.status_code})"
-                )
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer went away (e.g. client disconnected)
+            for task in in_flight:
+                task.cancel()
 
-            # Extract embedding vectors
-            embeddings = [item["embedding"] for item in resp.output["embeddings"]]
-            return embeddings
+    def cache_stats(self) -> dict:
+        """Get embedding cache counters"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
 
-        except VectorSearchError:
-            raise
-        except Exception as e:
-            raise VectorSearchError(f"Batch embedding failed: {str(e)}")
+    def provider_stats(self) -> dict:
+        """Get provider call counters (retries, hedges, circuit state)"""
+        return self.client.stats()
+
+    def close(self) -> None:
+        """Shut down the provider worker pool"""
+        self.client.close()
+        self._semaphore = None
+        if self.cache is not None:
+            self.cache.close()
+
+
+async def _aiter(items: Iterable):
+    """Adapt a plain iterable to an async iterator"""
+    for item in items:
+        yield item
+
+
+def get_dimension_reducer(input_dimension: int) -> DimensionReducer | None:
+    """
+    Create the dimension reducer selected by configuration
+
+    Args:
+        input_dimension: Dimension produced by the provider
+
+    Returns:
+        Dimension reducer, or None when vectors keep their full dimension
+    """
+    output_dimension = settings.EMBEDDING_REDUCED_DIMENSION
+    if not output_dimension or output_dimension == input_dimension:
+        return None
+
+    try:
+        return DimensionReducer(
+            input_dimension,
+            output_dimension,
+            mode=settings.EMBEDDING_REDUCTION,
+            seed=settings.EMBEDDING_PROJECTION_SEED,
+        )
+    except ValueError as e:
+        raise VectorSearchError(f"Invalid embedding reduction settings: {e}")
 
 
 # Global service instance (lazy initialization)
@@ -0,0 +1,206 @@
+"""Hybrid Search Service
+
+Runs lexical (BM25 over symptom names/aliases) and vector retrieval in
+parallel and merges them with reciprocal rank fusion (RRF).
+"""
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.exceptions import LexicalIndexUnavailableError, VectorSearchError
+from app.models.local_index import matches_filters
+from app.services.lexical_search import symptom_lexical_search
+from app.services.vector_search import vector_search_service
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+
+def fusion_key(result: dict):
+    """Identity of a hit across legs: (type, CUI) when the payload has a CUI
+
+    Symptoms and diseases share the CUI namespace and the collection, so a
+    disease point must not merge with a symptom hit of the same CUI.
+    """
+    payload = result.get("payload") or {}
+    if payload.get("cui"):
+        return payload.get("type"), payload["cui"]
+    return result["id"]
+
+
+def reciprocal_rank_fusion(rankings: dict[str, list[dict]], k: int) -> list[dict]:
+    """
+    Merge ranked result lists with reciprocal rank fusion
+
+    Each hit scores sum(1 / (k + rank)) over the lists it appears in. The
+    fused score is scaled so a hit ranked first in every list scores 1.0.
+
+    Args:
+        rankings: Ranked results per source (e.g. {"lexical": [...], "vector": [...]})
+        k: RRF constant (larger values flatten rank differences)
+
+    Returns:
+        Fused results with id, score, payload, sources and per-source scores
+    """
+    fused: dict = {}
+    for source, results in rankings.items():
+        for rank, result in enumerate(results, start=1):
+            key = fusion_key(result)
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {
+                    "id": result["id"],
+                    "score": 0.0,
+                    "payload": dict(result.get("payload") or {}),
+                    "sources": [],
+                }
+            else:
+                # Keep fields from both legs (e.g. vector text + lexical name)
+                entry["payload"] = {**(result.get("payload") or {}), **entry["payload"]}
+            entry["score"] += 1.0 / (k + rank)
+            entry["sources"].append(source)
+            entry[f"{source}_score"] = result["score"]
+
+    best = len(rankings) / (k + 1) if rankings else 1.0
+    results = sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)
+    for entry in results:
+        entry["score"] = entry["score"] / best
+    return results
+
+
+class HybridSearchService:
+    """Lexical, vector or hybrid (RRF-fused) search
+
+    In hybrid mode the vector leg gets HYBRID_VECTOR_BUDGET_MS. If it is
+    slower and the lexical leg found something, lexical hits are returned
+    immediately; the vector query keeps running in the background so its
+    embedding is cached for the next request.
+
+    Payload filters are applied inside the vector search; the lexical leg
+    is filtered on its symptom payload (symptom_id, cui, name, alias,
+    type), so filters on other fields leave only vector hits.
+    """
+
+    def __init__(self):
+        self.lexical = symptom_lexical_search
+        self.vector = vector_search_service
+        self._background: set[asyncio.Task] = set()
+
+    async def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        mode: str = "hybrid",
+        filters: dict | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> dict:
+        """
+        Execute a search
+
+        Args:
+            query: Query text
+            limit: Number of results to return
+            mode: vector, lexical or hybrid
+            filters: Payload field -> value (exact match) or list of values
+                (match any); all fields must match
+            timings: If given, receives the milliseconds spent per stage
+                (embed, vector_search, lexical_search, fusion)
+
+        Returns:
+            Dict with results and, in hybrid mode, vector_status
+            (ok, timeout or error)
+        """
+        if mode not in SEARCH_MODES:
+            raise VectorSearchError(
+                f"Unknown search mode: {mode}, supported modes: {', '.join(SEARCH_MODES)}"
+            )
+        limit = limit or settings.TOP_K_RESULTS
+
+        if mode == "vector":
+            return {"results": await self.vector.search(query, limit, filters, timings)}
+
+        candidates = limit * settings.HYBRID_CANDIDATE_MULTIPLIER
+        if mode == "lexical":
+            # The BM25 index has no payload index: over-fetch when filtering
+            fetch = candidates if filters else limit
+            return {"results": await self._search_lexical(query, limit, fetch, filters, timings)}
+
+        vector_task = asyncio.create_task(self.vector.search(query, candidates, filters, timings))
+
+        try:
+            lexical = await self._search_lexical(query, candidates, candidates, filters, timings)
+        except LexicalIndexUnavailableError:
+            # No lexical index (e.g. empty database): vector results only
+            lexical = []
+        except Exception:
+            logger.exception("Lexical search failed, using vector results only")
+            lexical = []
+
+        rankings = {"lexical": lexical} if lexical else {}
+        vector_status = "ok"
+        try:
+            if lexical:
+                # Shielded: on timeout the query still finishes and warms the caches
+                vector = await asyncio.wait_for(
+                    asyncio.shield(vector_task), timeout=settings.HYBRID_VECTOR_BUDGET_MS / 1000
+                )
+            else:
+                vector = await vector_task
+            rankings["vector"] = vector
+        except asyncio.TimeoutError:
+            vector_status = "timeout"
+            self._background.add(vector_task)
+            vector_task.add_done_callback(self._discard_background)
+        except Exception:
+            if not lexical:
+                raise
+            vector_status = "error"
+
+        start = time.perf_counter()
+        results = reciprocal_rank_fusion(rankings, settings.HYBRID_RRF_K)[:limit]
+        if timings is not None:
+            timings["fusion"] = (time.perf_counter() - start) * 1000
+        return {"results": results, "vector_status": vector_status}
+
+    async def _search_lexical(
+        self,
+        query: str,
+        limit: int,
+        fetch: int,
+        filters: dict | None,
+        timings: dict[str, float] | None = None,
+    ) -> list[dict]:
+        """
+        Run the lexical leg, keeping only hits whose payload matches the filters
+
+        Args:
+            query: Query text
+            limit: Number of hits to return
+            fetch: Number of BM25 hits to rank before filtering (the caller
+                sizes any over-fetch)
+            filters: Payload conditions (see matches_filters)
+            timings: If given, receives the lexical_search milliseconds
+
+        Returns:
+            Matching hits, best first
+        """
+        start = time.perf_counter()
+        hits = await self.lexical.search(query, fetch)
+        if filters:
+            hits = [hit for hit in hits if matches_filters(hit["payload"], filters)]
+        hits = hits[:limit]
+        if timings is not None:
+            timings["lexical_search"] = (time.perf_counter() - start) * 1000
+        return hits
+
+    def _discard_background(self, task: asyncio.Task) -> None:
+        """Forget a finished background vector query (and its exception)"""
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+
+# Global service instance
+hybrid_search_service = HybridSearchService()
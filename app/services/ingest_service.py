@@ -0,0 +1,98 @@
+"""Bulk Ingest Service"""
+import asyncio
+
+from app.core.config import settings
+from app.models.vector_db import qdrant_client
+from app.schemas.embedding import STORE_TEXT_MAX_LENGTH
+from app.services.embedding_service import embedding_service
+
+
+class IngestService:
+    """Bulk embed-and-store pipeline
+
+    Texts are embedded in provider-sized batches (EmbeddingService.stream_batch)
+    and the vectors are buffered into QDRANT_UPSERT_BATCH_SIZE upserts. Up
+    to QDRANT_UPSERT_CONCURRENCY upserts run while embedding continues;
+    when they are all busy, embedding pauses, so memory stays bounded.
+    Invalid items (empty or over STORE_TEXT_MAX_LENGTH characters) fail
+    individually without being sent to the provider.
+    """
+
+    def __init__(self):
+        self.client = qdrant_client
+
+    async def ingest(self, items: list[tuple[str, dict | None]], wait: bool = False) -> list[dict]:
+        """
+        Embed and store many texts
+
+        Args:
+            items: (text, metadata) pairs
+            wait: Wait until Qdrant has applied each upsert
+
+        Returns:
+            Per-item result dicts (index, status, point_id or error), in input order
+        """
+        results: list[dict | None] = [None] * len(items)
+        # Input indices of the texts sent for embedding (stream positions map back through this)
+        embedded: list[int] = []
+        for index, (text, _) in enumerate(items):
+            if len(text) > STORE_TEXT_MAX_LENGTH:
+                results[index] = {
+                    "index": index,
+                    "status": "failed",
+                    "error": f"Text is too long ({len(text)} characters, maximum is {STORE_TEXT_MAX_LENGTH})",
+                }
+            else:
+                embedded.append(index)
+        semaphore = asyncio.Semaphore(settings.QDRANT_UPSERT_CONCURRENCY)
+        tasks: list[asyncio.Task] = []
+
+        def payload(index: int) -> dict:
+            text, metadata = items[index]
+            return {"text": text, **(metadata or {})}
+
+        async def upsert(batch: list[tuple[int, object]]) -> None:
+            try:
+                point_ids = await self.client.upsert_points(
+                    vectors=[vector for _, vector in batch],
+                    payloads=[payload(index) for index, _ in batch],
+                    wait=wait,
+                )
+            except Exception as e:
+                for index, _ in batch:
+                    results[index] = {"index": index, "status": "failed", "error": f"Upsert failed: {str(e)}"}
+            else:
+                for (index, _), point_id in zip(batch, point_ids):
+                    results[index] = {"index": index, "status": "stored", "point_id": point_id}
+            finally:
+                semaphore.release()
+
+        async def flush(batch: list[tuple[int, object]]) -> None:
+            # Blocks while all upsert slots are busy (backpressure on embedding)
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(upsert(batch)))
+
+        buffer: list[tuple[int, object]] = []
+        try:
+            async for start, vectors in embedding_service.stream_batch(items[index][0] for index in embedded):
+                for offset, vector in enumerate(vectors):
+                    index = embedded[start + offset]
+                    if isinstance(vector, Exception):
+                        results[index] = {"index": index, "status": "failed", "error": str(vector)}
+                    else:
+                        buffer.append((index, vector))
+
+                if len(buffer) >= settings.QDRANT_UPSERT_BATCH_SIZE:
+                    await flush(buffer)
+                    buffer = []
+
+            if buffer:
+                await flush(buffer)
+        finally:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return results
+
+
+# Global service instance
+ingest_service = IngestService()
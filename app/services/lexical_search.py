@@ -0,0 +1,253 @@
+"""Lexical Symptom Search
+
+In-memory BM25 index over symptom names and their pipe-separated aliases.
+Catches exact clinical terms and abbreviations that embedding search tends
+to miss, without the full-table scan of an ILIKE '%q%' query.
+"""
+import asyncio
+import re
+import time
+import unicodedata
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.exceptions import LexicalIndexUnavailableError, SQLiteConnectionError
+from app.models.sqlite_db import SQLiteClientWrapper, Symptom, TableStats
+
+# Latin words/numbers, or single CJK characters
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens (CJK text into characters)"""
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text).lower())
+
+
+def normalize_term(text: str) -> str:
+    """Normalize a whole name or alias for exact-match lookups"""
+    return " ".join(tokenize(text))
+
+
+class BM25Index:
+    """Okapi BM25 index with exact-term boosting
+
+    Per-posting BM25 weights are precomputed at build time, so a query is a
+    handful of vectorized adds over the posting lists of its tokens.
+    Documents whose name or an alias equals the whole query are ranked
+    above all partial matches.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: list = []
+        self.payloads: list[dict] = []
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._exact: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def build(self, ids: list, fields: list[list[str]], payloads: list[dict]) -> None:
+        """
+        Build the index
+
+        Args:
+            ids: Document IDs
+            fields: Text fields of each document (e.g. name and aliases)
+            payloads: Payload returned with each hit
+        """
+        term_freqs: list[dict[str, int]] = []
+        lengths = np.zeros(len(ids), dtype=np.float32)
+        document_freq: dict[str, int] = {}
+        exact: dict[str, list[int]] = {}
+
+        for doc, doc_fields in enumerate(fields):
+            counts: dict[str, int] = {}
+            for field in doc_fields:
+                tokens = tokenize(field)
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                if tokens:
+                    exact.setdefault(" ".join(tokens), []).append(doc)
+            for token in counts:
+                document_freq[token] = document_freq.get(token, 0) + 1
+            term_freqs.append(counts)
+            lengths[doc] = sum(counts.values())
+
+        n = len(ids)
+        average_length = float(lengths.mean()) if n else 0.0
+        postings: dict[str, tuple[list[int], list[float]]] = {}
+        for doc, counts in enumerate(term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * lengths[doc] / (average_length or 1.0))
+            for token, tf in counts.items():
+                idf = np.log(1 + (n - document_freq[token] + 0.5) / (document_freq[token] + 0.5))
+                docs, weights = postings.setdefault(token, ([], []))
+                docs.append(doc)
+                weights.append(idf * tf * (self.k1 + 1) / (tf + norm))
+
+        self.ids = list(ids)
+        self.payloads = list(payloads)
+        self._postings = {
+            token: (np.asarray(docs, dtype=np.int64), np.asarray(weights, dtype=np.float32))
+            for token, (docs, weights) in postings.items()
+        }
+        self._exact = {term: sorted(set(docs)) for term, docs in exact.items()}
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        """
+        Rank documents for a query
+
+        Args:
+            query: Query text
+            limit: Number of results to return
+
+        Returns:
+            Hits as dicts with id, score (relative to the best hit, 0-1),
+            bm25 (raw score) and payload, best first
+        """
+        tokens = [token for token in dict.fromkeys(tokenize(query)) if token in self._postings]
+        if not tokens or limit <= 0:
+            return []
+
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for token in tokens:
+            docs, weights = self._postings[token]
+            scores[docs] += weights
+
+        # Whole-name / whole-alias matches outrank every partial match
+        boost = float(scores.max()) + 1.0
+        for doc in self._exact.get(normalize_term(query), []):
+            scores[doc] += boost
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        top = float(scores[candidates[0]])
+        return [
+            {
+                "id": self.ids[doc],
+                "score": float(scores[doc]) / top,
+                "bm25": float(scores[doc]),
+                "payload": self.payloads[doc],
+            }
+            for doc in candidates
+        ]
+
+
+class SymptomLexicalSearch:
+    """BM25 search over Symptom.name and Symptom.alias
+
+    The index is built from SQLite on first use and rebuilt after
+    invalidate() (called when symptoms are created, updated or deleted in
+    this process). Changes made elsewhere (other workers, the import
+    script, direct edits) are detected through the symptoms version in
+    table_stats, checked at most every LEXICAL_VERSION_CHECK_INTERVAL
+    seconds.
+    """
+
+    def __init__(self):
+        self.index: BM25Index | None = None
+        self.version: int | None = None
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock: asyncio.Lock | None = None
+
+    def invalidate(self) -> None:
+        """Mark the index for rebuild on next search"""
+        self._stale = True
+
+    @staticmethod
+    async def _read_version(session) -> int | None:
+        """Current symptoms version (bumped by triggers on every change)"""
+        result = await session.execute(
+            select(TableStats.version).where(TableStats.table_name == Symptom.__tablename__)
+        )
+        return result.scalar()
+
+    async def _changed(self) -> bool:
+        """Whether symptoms changed since the index was built (rate-limited check)"""
+        now = time.monotonic()
+        if now - self._checked_at < settings.LEXICAL_VERSION_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        async with await SQLiteClientWrapper.get_read_session() as session:
+            return await self._read_version(session) != self.version
+
+    async def _load(self) -> BM25Index:
+        """Read all symptoms and build a fresh index"""
+        session = await SQLiteClientWrapper.get_read_session()
+        try:
+            # Read before the rows: a change landing in between triggers another rebuild
+            version = await self._read_version(session)
+            result = await session.execute(
+                select(Symptom.id, Symptom.cui, Symptom.name, Symptom.alias)
+            )
+            rows = result.all()
+        finally:
+            await session.close()
+
+        index = BM25Index(k1=settings.LEXICAL_BM25_K1, b=settings.LEXICAL_BM25_B)
+        await asyncio.to_thread(
+            index.build,
+            [row.cui for row in rows],
+            [[row.name, *(row.alias or "").split("|")] for row in rows],
+            [
+                {"symptom_id": row.id, "cui": row.cui, "name": row.name, "alias": row.alias, "type": "symptom"}
+                for row in rows
+            ],
+        )
+        self.version = version
+        self._checked_at = time.monotonic()
+        return index
+
+    async def ensure_loaded(self) -> BM25Index:
+        """
+        Build the index if missing, invalidated or changed elsewhere
+
+        Raises:
+            LexicalIndexUnavailableError: The symptoms could not be read
+                (e.g. database not created or not imported yet)
+        """
+        if self.index is not None and not self._stale:
+            if not await self._changed():
+                return self.index
+            self._stale = True
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.index is None or self._stale:
+                self._stale = False
+                try:
+                    self.index = await self._load()
+                except (SQLAlchemyError, SQLiteConnectionError) as e:
+                    self._stale = True
+                    raise LexicalIndexUnavailableError(f"Lexical index could not be loaded: {e}") from e
+                except Exception:
+                    self._stale = True
+                    raise
+        return self.index
+
+    async def search(self, query: str, limit: int | None = None) -> list[dict]:
+        """
+        Search symptoms by name and alias
+
+        Args:
+            query: Query text
+            limit: Number of results to return
+
+        Returns:
+            Hits (id is the symptom CUI), best first
+        """
+        index = await self.ensure_loaded()
+        return index.search(query, limit or settings.TOP_K_RESULTS)
+
+
+# Global service instance
+symptom_lexical_search = SymptomLexicalSearch()
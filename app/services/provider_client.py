@@ -0,0 +1,257 @@
+"""Resilient AI Provider Client
+
+Shared call layer for blocking AI provider SDK calls (dashscope embedding
+and ASR). Each call runs in a worker thread and gets:
+
+- a per-attempt timeout and an overall deadline,
+- jittered exponential retry on retryable failures,
+- an optional hedged duplicate request once the attempt is slower than a
+  recent latency percentile,
+- a circuit breaker that fails fast while the provider is down.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.exceptions import ProviderResponseError, ProviderUnavailableError
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+
+    closed: calls pass through. After failure_threshold consecutive
+    failures the circuit opens and calls fail fast. After reset_timeout
+    seconds one probe call is let through (half-open); its outcome closes
+    or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may be made now"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call"""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold"""
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class ProviderClient:
+    """Resilient caller for one blocking provider SDK"""
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        timeout: float,
+        deadline: float,
+        hedge_percentile: float | None = None,
+        max_retries: int | None = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.max_retries = settings.PROVIDER_MAX_RETRIES if max_retries is None else max_retries
+        self.breaker = CircuitBreaker(
+            settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD, settings.PROVIDER_CIRCUIT_RESET_TIMEOUT
+        )
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._latencies: deque[float] = deque(maxlen=settings.PROVIDER_LATENCY_WINDOW)
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool for blocking SDK calls"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix=self.name
+            )
+        return self._executor
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """Whether a failed attempt is worth retrying"""
+        if isinstance(error, ProviderResponseError):
+            return error.status_code in settings.PROVIDER_RETRY_STATUS_CODES
+        # Attempt timeouts and network errors (requests errors are OSErrors)
+        return isinstance(error, (asyncio.TimeoutError, OSError))
+
+    def _hedge_delay(self) -> float | None:
+        """Latency after which a duplicate request is sent (None: no hedging)"""
+        if self.hedge_percentile is None or len(self._latencies) < settings.PROVIDER_HEDGE_MIN_SAMPLES:
+            return None
+        return float(np.percentile(self._latencies, self.hedge_percentile))
+
+    async def _attempt(self, fn: Callable, args: tuple, timeout: float) -> Any:
+        """
+        Run one attempt in the worker pool, hedging if it is slow
+
+        Args:
+            fn: Blocking function
+            args: Positional arguments for fn
+            timeout: Attempt timeout in seconds
+
+        Returns:
+            Result of whichever request finished successfully first
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        started = loop.time()
+        primary = loop.run_in_executor(executor, fn, *args)
+        pending = {primary}
+        error: BaseException | None = None
+
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    # Primary is slower than usual: race a duplicate request
+                    self.hedges += 1
+                    pending.add(loop.run_in_executor(executor, fn, *args))
+
+            while pending:
+                remaining = timeout - (loop.time() - started)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    if future.exception() is None:
+                        self._latencies.append(loop.time() - started)
+                        if future is not primary:
+                            self.hedge_wins += 1
+                        return future.result()
+                    error = future.exception()
+
+            if error is not None and not pending:
+                raise error
+            raise asyncio.TimeoutError()
+        finally:
+            for future in pending:
+                # Threads cannot be interrupted; drop the result when it arrives
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                future.cancel()
+
+    async def call(self, fn: Callable, *args: Any, deadline: float | None = None) -> Any:
+        """
+        Call a blocking provider function with retry, hedging and circuit breaking
+
+        Args:
+            fn: Blocking function (must be safe to call more than once)
+            *args: Positional arguments for fn
+            deadline: Overall time budget in seconds (defaults to self.deadline)
+
+        Returns:
+            Result of fn
+
+        Raises:
+            ProviderUnavailableError: Circuit open, deadline exceeded or
+                retries exhausted
+            Exception: Non-retryable errors raised by fn, unchanged
+        """
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise ProviderUnavailableError(f"{self.name} provider unavailable (circuit open)")
+
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (self.deadline if deadline is None else deadline)
+        self.calls += 1
+        error: BaseException | None = None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = expires - loop.time()
+            if remaining <= 0:
+                break
+            if attempt:
+                self.retries += 1
+
+            try:
+                result = await self._attempt(fn, args, min(self.timeout, remaining))
+            except Exception as e:
+                if not self.is_retryable(e):
+                    # The provider answered, so it is up; the request itself is bad
+                    self.breaker.record_success()
+                    raise
+                error = e
+                self.breaker.record_failure()
+                if self.breaker.state == CircuitBreaker.OPEN:
+                    break
+            else:
+                self.breaker.record_success()
+                return result
+
+            # Full jitter: sleep a random time up to the exponential backoff
+            backoff = min(
+                settings.PROVIDER_RETRY_BACKOFF_MAX, settings.PROVIDER_RETRY_BACKOFF * 2**attempt
+            )
+            delay = random.uniform(0, backoff)
+            if attempt == self.max_retries or loop.time() + delay >= expires:
+                break
+            await asyncio.sleep(delay)
+
+        if isinstance(error, asyncio.TimeoutError) or error is None:
+            reason = "timed out"
+        else:
+            reason = getattr(error, "message", None) or str(error)
+        raise ProviderUnavailableError(f"{self.name} provider call failed: {reason}")
+
+    def stats(self) -> dict:
+        """Get call counters and recent latency percentiles"""
+        latencies = list(self._latencies)
+        return {
+            "circuit": self.breaker.state,
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rejected": self.rejected,
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1) if latencies else None,
+            "latency_p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 1) if latencies else None,
+        }
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,75 @@
+"""Semantic Search Result Cache
+
+Caches vector search results in process, keyed by normalized query text,
+result limit, score threshold and the collection version. Any write to the
+collection through QdrantClientWrapper bumps the version, which drops all
+cached results.
+"""
+from typing import Hashable
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.embedding_cache import normalize_text
+
+
+class SearchResultCache:
+    """LRU + TTL cache of search results, invalidated by collection writes
+
+    Writes made by other processes are not seen; SEARCH_CACHE_TTL bounds
+    how long such results can stay stale. Upserts sent with wait=False may
+    become visible shortly after the version bump, which TTL also covers.
+    """
+
+    def __init__(self, max_size: int | None = None, ttl: float | None = None):
+        self.entries: LRUCache[list[dict]] = LRUCache(
+            max_size=settings.SEARCH_CACHE_SIZE if max_size is None else max_size,
+            ttl=settings.SEARCH_CACHE_TTL if ttl is None else ttl,
+        )
+        self.version = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, limit: int, threshold: float | None, **options: Hashable) -> tuple:
+        """Build the cache key for a search"""
+        return (normalize_text(query), limit, threshold, tuple(sorted(options.items())))
+
+    def _sync_version(self, version: int) -> bool:
+        """Drop all entries if the collection changed; False if version is stale"""
+        if version > self.version:
+            self.entries.clear()
+            self.version = version
+            self.invalidations += 1
+        return version == self.version
+
+    def get(self, key: tuple, version: int) -> list[dict] | None:
+        """
+        Look up cached results
+
+        Args:
+            key: Key from make_key
+            version: Current collection version
+
+        Returns:
+            A copy of the cached results, or None
+        """
+        if not self._sync_version(version):
+            return None
+        results = self.entries.get(key)
+        return None if results is None else [dict(result) for result in results]
+
+    def set(self, key: tuple, version: int, results: list[dict]) -> None:
+        """
+        Cache results computed against a collection version
+
+        Results computed before a later write are discarded.
+        """
+        if self._sync_version(version):
+            self.entries.set(key, [dict(result) for result in results])
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache counters"""
+        return {**self.entries.stats(), "version": self.version, "invalidations": self.invalidations}
@@ -2,8 +2,14 @@
 
 This module implements CRUD operations for all SQLite database entities.
 """
+# Service classes define a list() method, which would otherwise shadow the
+# builtin in later annotations such as list[Symptom]
+from __future__ import annotations
+
 import os
+import re
 import sys
+import unicodedata
 from pathlib import Path
 from typing import Optional
 
@@ -12,18 +18,23 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 os.chdir(project_root)
 
-from sqlalchemy import func, select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import SQLiteServiceError
+from app.core.pagination import page_result, paginate
 from app.models.sqlite_db import (
     Conversation,
     Disease,
     DiseaseSymptomAssociation,
     Message,
     Symptom,
+    TableStats,
+    check_row_counts,
+    rebuild_row_counts,
 )
+from app.models.sqlite_writer import sqlite_writer
 from app.schemas.sqlite import (
     DiseaseSymptomAssociationCreate,
     DiseaseUpdate,
@@ -32,6 +43,35 @@ from app.schemas.sqlite import (
     SymptomUpdate,
     ConversationUpdate,
 )
+from app.services.lexical_search import symptom_lexical_search
+
+# Words as split by the FTS5 unicode61 tokenizer
+FTS_TOKEN_PATTERN = re.compile(r"\w+")
+
+# bm25() column weights: a match in the name outranks one in an alias,
+# which outranks one in the definition or summary
+DISEASE_FTS_WEIGHTS = (10.0, 5.0, 1.0)
+SYMPTOM_FTS_WEIGHTS = (10.0, 5.0, 1.0, 1.0)
+
+
+def fts_match_query(query: str) -> str | None:
+    """
+    Build an FTS5 MATCH expression from free text
+
+    Every word becomes a quoted prefix term ("chest pa" matches
+    "chest pain"), and all words must match. Quoting keeps FTS5 operators
+    and punctuation in user input from being interpreted.
+
+    Args:
+        query: Search query string
+
+    Returns:
+        MATCH expression, or None if the query contains no words
+    """
+    tokens = FTS_TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", query).lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
 
 
 # ============================================================================
@@ -132,30 +172,40 @@ class DiseaseService:
 
     @staticmethod
     async def list(
-        session: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> tuple[int, list[Disease]]:
-        """List all diseases with pagination
+        session: AsyncSession,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_total: bool = False,
+        skip: int = 0,
+    ) -> tuple[int | None, list[Disease], str | None]:
+        """List all diseases with keyset pagination (by ID)
 
         Args:
             session: Database session
-            skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: next_cursor of the previous page
+            include_total: Also return the total count (from table_stats)
+            skip: Number of records to skip (deprecated, ignored with a cursor)
 
         Returns:
-            Tuple of (total count, list of diseases)
+            Tuple of (total count or None, list of diseases, next cursor or None)
+
+        Raises:
+            InvalidQueryError: If the cursor is malformed
         """
+        stmt = paginate(select(Disease), Disease.id, Disease.id, limit, cursor)
+        if cursor is None and skip:
+            stmt = stmt.offset(skip)
+
         try:
-            # Get total count
-            count_stmt = select(func.count()).select_from(Disease)
-            count_result = await session.execute(count_stmt)
-            total = count_result.scalar()
+            total = None
+            if include_total:
+                total = await TableStatsService.count(session, "diseases")
 
-            # Get paginated results
-            stmt = select(Disease).offset(skip).limit(limit).order_by(Disease.id)
             result = await session.execute(stmt)
-            diseases = result.scalars().all()
+            diseases, next_cursor = page_result(list(result.scalars().all()), limit, "id")
 
-            return total, list(diseases)
+            return total, diseases, next_cursor
         except Exception as e:
             raise SQLiteServiceError(f"Failed to list diseases: {e}") from e
 
@@ -163,21 +213,29 @@ class DiseaseService:
     async def search_by_name(
         session: AsyncSession, query: str, limit: int = 10
     ) -> list[Disease]:
-        """Search diseases by name (LIKE query)
+        """Search diseases by name, alias and definition (FTS5, BM25-ranked)
 
         Args:
             session: Database session
-            query: Search query string
+            query: Search query string (words are prefix-matched)
             limit: Maximum results to return
 
         Returns:
-            List of matching diseases
+            List of matching diseases, best match first
         """
+        match = fts_match_query(query)
+        if match is None:
+            return []
+
         try:
-            stmt = (
-                select(Disease)
-                .where(Disease.name.ilike(f"%{query}%"))
-                .limit(limit)
+            weights = ", ".join(str(weight) for weight in DISEASE_FTS_WEIGHTS)
+            stmt = select(Disease).from_statement(
+                text(
+                    "SELECT diseases.* FROM diseases_fts "
+                    "JOIN diseases ON diseases.id = diseases_fts.rowid "
+                    "WHERE diseases_fts MATCH :match "
+                    f"ORDER BY bm25(diseases_fts, {weights}) LIMIT :limit"
+                ).bindparams(match=match, limit=limit)
             )
             result = await session.execute(stmt)
             return list(result.scalars().all())
@@ -271,6 +329,7 @@ class SymptomService:
             session.add(symptom)
             await session.commit()
             await session.refresh(symptom)
+            symptom_lexical_search.invalidate()
             return symptom
         except Exception as e:
             await session.rollback()
@@ -340,32 +399,88 @@ class SymptomService:
         except Exception as e:
             raise SQLiteServiceError(f"Failed to get symptom with diseases: {e}") from e
 
+    @staticmethod
+    async def get_many_with_diseases(
+        session: AsyncSession, cuis: list[str], max_diseases: int | None = None
+    ) -> dict[str, dict]:
+        """Get many symptoms by CUI with their associated disease names
+
+        Symptoms and diseases are loaded with a single joined query,
+        however many CUIs are requested.
+
+        Args:
+            session: Database session
+            cuis: Symptom CUIs
+            max_diseases: Maximum number of disease names per symptom
+
+        Returns:
+            Mapping of CUI -> {"id", "name", "definition", "diseases"} for
+            the CUIs that exist
+
+        Raises:
+            SQLiteServiceError: If query fails
+        """
+        if not cuis:
+            return {}
+        try:
+            stmt = (
+                select(Symptom.id, Symptom.cui, Symptom.name, Symptom.definition, Disease.name)
+                .outerjoin(DiseaseSymptomAssociation, DiseaseSymptomAssociation.symptom_id == Symptom.id)
+                .outerjoin(Disease, Disease.id == DiseaseSymptomAssociation.disease_id)
+                .where(Symptom.cui.in_(set(cuis)))
+                .order_by(Symptom.id, Disease.name)
+            )
+            result = await session.execute(stmt)
+
+            symptoms: dict[str, dict] = {}
+            for symptom_id, cui, name, definition, disease_name in result.all():
+                symptom = symptoms.setdefault(
+                    cui, {"id": symptom_id, "name": name, "definition": definition, "diseases": []}
+                )
+                diseases = symptom["diseases"]
+                if disease_name is not None and disease_name not in diseases:
+                    if max_diseases is None or len(diseases) < max_diseases:
+                        diseases.append(disease_name)
+            return symptoms
+        except Exception as e:
+            raise SQLiteServiceError(f"Failed to get symptoms with diseases: {e}") from e
+
     @staticmethod
     async def list(
-        session: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> tuple[int, list[Symptom]]:
-        """List all symptoms with pagination
+        session: AsyncSession,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_total: bool = False,
+        skip: int = 0,
+    ) -> tuple[int | None, list[Symptom], str | None]:
+        """List all symptoms with keyset pagination (by ID)
 
         Args:
             session: Database session
-            skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: next_cursor of the previous page
+            include_total: Also return the total count (from table_stats)
+            skip: Number of records to skip (deprecated, ignored with a cursor)
 
         Returns:
-            Tuple of (total count, list of symptoms)
+            Tuple of (total count or None, list of symptoms, next cursor or None)
+
+        Raises:
+            InvalidQueryError: If the cursor is malformed
         """
+        stmt = paginate(select(Symptom), Symptom.id, Symptom.id, limit, cursor)
+        if cursor is None and skip:
+            stmt = stmt.offset(skip)
+
         try:
-            # Get total count
-            count_stmt = select(func.count()).select_from(Symptom)
-            count_result = await session.execute(count_stmt)
-            total = count_result.scalar()
+            total = None
+            if include_total:
+                total = await TableStatsService.count(session, "symptoms")
 
-            # Get paginated results
-            stmt = select(Symptom).offset(skip).limit(limit).order_by(Symptom.id)
             result = await session.execute(stmt)
-            symptoms = result.scalars().all()
+            symptoms, next_cursor = page_result(list(result.scalars().all()), limit, "id")
 
-            return total, list(symptoms)
+            return total, symptoms, next_cursor
         except Exception as e:
             raise SQLiteServiceError(f"Failed to list symptoms: {e}") from e
 
@@ -373,21 +488,29 @@ class SymptomService:
     async def search_by_name(
         session: AsyncSession, query: str, limit: int = 10
     ) -> list[Symptom]:
-        """Search symptoms by name (LIKE query)
+        """Search symptoms by name, alias, definition and summary (FTS5, BM25-ranked)
 
         Args:
             session: Database session
-            query: Search query string
+            query: Search query string (words are prefix-matched)
             limit: Maximum results to return
 
         Returns:
-            List of matching symptoms
+            List of matching symptoms, best match first
         """
+        match = fts_match_query(query)
+        if match is None:
+            return []
+
         try:
-            stmt = (
-                select(Symptom)
-                .where(Symptom.name.ilike(f"%{query}%"))
-                .limit(limit)
+            weights = ", ".join(str(weight) for weight in SYMPTOM_FTS_WEIGHTS)
+            stmt = select(Symptom).from_statement(
+                text(
+                    "SELECT symptoms.* FROM symptoms_fts "
+                    "JOIN symptoms ON symptoms.id = symptoms_fts.rowid "
+                    "WHERE symptoms_fts MATCH :match "
+                    f"ORDER BY bm25(symptoms_fts, {weights}) LIMIT :limit"
+                ).bindparams(match=match, limit=limit)
             )
             result = await session.execute(stmt)
             return list(result.scalars().all())
@@ -422,6 +545,7 @@ class SymptomService:
 
             await session.commit()
             await session.refresh(symptom)
+            symptom_lexical_search.invalidate()
             return symptom
         except Exception as e:
             await session.rollback()
@@ -448,6 +572,7 @@ class SymptomService:
 
             await session.delete(symptom)
             await session.commit()
+            symptom_lexical_search.invalidate()
             return True
         except Exception as e:
             await session.rollback()
@@ -583,11 +708,10 @@ class ConversationService:
     """CRUD operations for conversations"""
 
     @staticmethod
-    async def create(session: AsyncSession, data: dict) -> Conversation:
-        """Create a new conversation
+    async def create(data: dict) -> Conversation:
+        """Create a new conversation (through the single-writer queue)
 
         Args:
-            session: Database session
             data: Conversation data dictionary
 
         Returns:
@@ -596,14 +720,16 @@ class ConversationService:
         Raises:
             SQLiteServiceError: If creation fails
         """
-        try:
+
+        async def write(session: AsyncSession) -> Conversation:
             conversation = Conversation(**data)
             session.add(conversation)
-            await session.commit()
-            await session.refresh(conversation)
+            await session.flush()
             return conversation
+
+        try:
+            return await sqlite_writer.submit(write)
         except Exception as e:
-            await session.rollback()
             raise SQLiteServiceError(f"Failed to create conversation: {e}") from e
 
     @staticmethod
@@ -650,46 +776,51 @@ class ConversationService:
 
     @staticmethod
     async def list(
-        session: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> tuple[int, list[Conversation]]:
-        """List all conversations with pagination
+        session: AsyncSession,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_total: bool = False,
+        skip: int = 0,
+    ) -> tuple[int | None, list[Conversation], str | None]:
+        """List all conversations with keyset pagination (most recent first)
 
         Args:
             session: Database session
-            skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: next_cursor of the previous page
+            include_total: Also return the total count (from table_stats)
+            skip: Number of records to skip (deprecated, ignored with a cursor)
 
         Returns:
-            Tuple of (total count, list of conversations)
+            Tuple of (total count or None, list of conversations, next cursor or None)
+
+        Raises:
+            InvalidQueryError: If the cursor is malformed
         """
+        # Served by the (started_at, id) index
+        stmt = paginate(
+            select(Conversation), Conversation.started_at, Conversation.id, limit, cursor, descending=True
+        )
+        if cursor is None and skip:
+            stmt = stmt.offset(skip)
+
         try:
-            # Get total count
-            count_stmt = select(func.count()).select_from(Conversation)
-            count_result = await session.execute(count_stmt)
-            total = count_result.scalar()
+            total = None
+            if include_total:
+                total = await TableStatsService.count(session, "conversations")
 
-            # Get paginated results (most recent first)
-            stmt = (
-                select(Conversation)
-                .offset(skip)
-                .limit(limit)
-                .order_by(Conversation.started_at.desc())
-            )
             result = await session.execute(stmt)
-            conversations = result.scalars().all()
+            conversations, next_cursor = page_result(list(result.scalars().all()), limit, "started_at")
 
-            return total, list(conversations)
+            return total, conversations, next_cursor
         except Exception as e:
             raise SQLiteServiceError(f"Failed to list conversations: {e}") from e
 
     @staticmethod
-    async def update(
-        session: AsyncSession, conversation_id: int, data: ConversationUpdate
-    ) -> Optional[Conversation]:
-        """Update a conversation
+    async def update(conversation_id: int, data: ConversationUpdate) -> Optional[Conversation]:
+        """Update a conversation (through the single-writer queue)
 
         Args:
-            session: Database session
             conversation_id: Conversation ID
             data: Update data
 
@@ -699,7 +830,8 @@ class ConversationService:
         Raises:
             SQLiteServiceError: If update fails
         """
-        try:
+
+        async def write(session: AsyncSession) -> Optional[Conversation]:
             conversation = await ConversationService.get(session, conversation_id)
             if not conversation:
                 return None
@@ -708,19 +840,19 @@ class ConversationService:
             for field, value in update_data.items():
                 setattr(conversation, field, value)
 
-            await session.commit()
-            await session.refresh(conversation)
+            await session.flush()
             return conversation
+
+        try:
+            return await sqlite_writer.submit(write)
         except Exception as e:
-            await session.rollback()
             raise SQLiteServiceError(f"Failed to update conversation: {e}") from e
 
     @staticmethod
-    async def delete(session: AsyncSession, conversation_id: int) -> bool:
-        """Delete a conversation (and all associated messages)
+    async def delete(conversation_id: int) -> bool:
+        """Delete a conversation and all associated messages (through the single-writer queue)
 
         Args:
-            session: Database session
             conversation_id: Conversation ID
 
         Returns:
@@ -729,16 +861,19 @@ class ConversationService:
         Raises:
             SQLiteServiceError: If deletion fails
         """
-        try:
+
+        async def write(session: AsyncSession) -> bool:
             conversation = await ConversationService.get(session, conversation_id)
             if not conversation:
                 return False
 
             await session.delete(conversation)
-            await session.commit()
+            await session.flush()
             return True
+
+        try:
+            return await sqlite_writer.submit(write)
         except Exception as e:
-            await session.rollback()
             raise SQLiteServiceError(f"Failed to delete conversation: {e}") from e
 
 
@@ -751,11 +886,10 @@ class MessageService:
     """CRUD operations for messages"""
 
     @staticmethod
-    async def create(session: AsyncSession, data: dict) -> Message:
-        """Create a new message
+    async def create(data: dict) -> Message:
+        """Create a new message (through the single-writer queue)
 
         Args:
-            session: Database session
             data: Message data dictionary
 
         Returns:
@@ -764,7 +898,8 @@ class MessageService:
         Raises:
             SQLiteServiceError: If creation fails
         """
-        try:
+
+        async def write(session: AsyncSession) -> Message:
             # Verify conversation exists
             conversation = await ConversationService.get(session, data.get("conversation_id"))
             if not conversation:
@@ -774,11 +909,12 @@ class MessageService:
 
             message = Message(**data)
             session.add(message)
-            await session.commit()
-            await session.refresh(message)
+            await session.flush()
             return message
+
+        try:
+            return await sqlite_writer.submit(write)
         except Exception as e:
-            await session.rollback()
             raise SQLiteServiceError(f"Failed to create message: {e}") from e
 
     @staticmethod
@@ -801,52 +937,57 @@ class MessageService:
 
     @staticmethod
     async def list_by_conversation(
-        session: AsyncSession, conversation_id: int, skip: int = 0, limit: int = 100
-    ) -> tuple[int, list[Message]]:
-        """List all messages in a conversation with pagination
+        session: AsyncSession,
+        conversation_id: int,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_total: bool = False,
+        skip: int = 0,
+    ) -> tuple[int | None, list[Message], str | None]:
+        """List all messages in a conversation with keyset pagination (oldest first)
 
         Args:
             session: Database session
             conversation_id: Conversation ID
-            skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: next_cursor of the previous page
+            include_total: Also return the total count (conversations.message_count)
+            skip: Number of records to skip (deprecated, ignored with a cursor)
 
         Returns:
-            Tuple of (total count, list of messages)
+            Tuple of (total count or None, list of messages, next cursor or None)
+
+        Raises:
+            InvalidQueryError: If the cursor is malformed
         """
+        # Served by the (conversation_id, sent_at, id) index
+        stmt = paginate(
+            select(Message).where(Message.conversation_id == conversation_id),
+            Message.sent_at,
+            Message.id,
+            limit,
+            cursor,
+        )
+        if cursor is None and skip:
+            stmt = stmt.offset(skip)
+
         try:
-            # Get total count for this conversation
-            count_stmt = (
-                select(func.count())
-                .select_from(Message)
-                .where(Message.conversation_id == conversation_id)
-            )
-            count_result = await session.execute(count_stmt)
-            total = count_result.scalar()
+            total = None
+            if include_total:
+                total = await TableStatsService.message_count(session, conversation_id)
 
-            # Get paginated results (oldest first for chat history)
-            stmt = (
-                select(Message)
-                .where(Message.conversation_id == conversation_id)
-                .offset(skip)
-                .limit(limit)
-                .order_by(Message.sent_at.asc())
-            )
             result = await session.execute(stmt)
-            messages = result.scalars().all()
+            messages, next_cursor = page_result(list(result.scalars().all()), limit, "sent_at")
 
-            return total, list(messages)
+            return total, messages, next_cursor
         except Exception as e:
             raise SQLiteServiceError(f"Failed to list messages: {e}") from e
 
     @staticmethod
-    async def update(
-        session: AsyncSession, message_id: int, data: MessageUpdate
-    ) -> Optional[Message]:
-        """Update a message
+    async def update(message_id: int, data: MessageUpdate) -> Optional[Message]:
+        """Update a message (through the single-writer queue)
 
         Args:
-            session: Database session
             message_id: Message ID
             data: Update data
 
@@ -856,7 +997,8 @@ class MessageService:
         Raises:
             SQLiteServiceError: If update fails
         """
-        try:
+
+        async def write(session: AsyncSession) -> Optional[Message]:
             message = await MessageService.get(session, message_id)
             if not message:
                 return None
@@ -865,19 +1007,19 @@ class MessageService:
             for field, value in update_data.items():
                 setattr(message, field, value)
 
-            await session.commit()
-            await session.refresh(message)
+            await session.flush()
             return message
+
+        try:
+            return await sqlite_writer.submit(write)
         except Exception as e:
-            await session.rollback()
             raise SQLiteServiceError(f"Failed to update message: {e}") from e
 
     @staticmethod
-    async def delete(session: AsyncSession, message_id: int) -> bool:
-        """Delete a message
+    async def delete(message_id: int) -> bool:
+        """Delete a message (through the single-writer queue)
 
         Args:
-            session: Database session
             message_id: Message ID
 
         Returns:
@@ -886,14 +1028,92 @@ class MessageService:
         Raises:
             SQLiteServiceError: If deletion fails
         """
-        try:
+
+        async def write(session: AsyncSession) -> bool:
             message = await MessageService.get(session, message_id)
             if not message:
                 return False
 
             await session.delete(message)
-            await session.commit()
+            await session.flush()
             return True
+
+        try:
+            return await sqlite_writer.submit(write)
         except Exception as e:
-            await session.rollback()
             raise SQLiteServiceError(f"Failed to delete message: {e}") from e
+
+
+# ============================================================================
+# Table Stats Service
+# ============================================================================
+
+
+class TableStatsService:
+    """Row counts maintained by triggers (table_stats, conversations.message_count)"""
+
+    @staticmethod
+    async def count(session: AsyncSession, table_name: str) -> int:
+        """Get the row count of a table in O(1)
+
+        Args:
+            session: Database session
+            table_name: One of COUNTED_TABLES
+
+        Returns:
+            Number of rows in the table
+        """
+        result = await session.execute(
+            select(TableStats.row_count).where(TableStats.table_name == table_name)
+        )
+        return result.scalar() or 0
+
+    @staticmethod
+    async def message_count(session: AsyncSession, conversation_id: int) -> int:
+        """Get the number of messages in a conversation in O(1)
+
+        Args:
+            session: Database session
+            conversation_id: Conversation ID
+
+        Returns:
+            Number of messages (0 for an unknown conversation)
+        """
+        result = await session.execute(
+            select(Conversation.message_count).where(Conversation.id == conversation_id)
+        )
+        return result.scalar() or 0
+
+    @staticmethod
+    async def check(session: AsyncSession) -> dict:
+        """Compare the maintained counts with COUNT(*) over the tables
+
+        Args:
+            session: Database session
+
+        Returns:
+            Mismatches: {"tables": {...}, "conversations": [...]} (both empty when consistent)
+
+        Raises:
+            SQLiteServiceError: If the check fails
+        """
+        try:
+            return await session.run_sync(check_row_counts)
+        except Exception as e:
+            raise SQLiteServiceError(f"Failed to check row counts: {e}") from e
+
+    @staticmethod
+    async def rebuild() -> None:
+        """Recompute all maintained counts (through the single-writer queue)
+
+        Raises:
+            SQLiteServiceError: If the rebuild fails
+        """
+
+        async def write(session: AsyncSession) -> None:
+            await session.run_sync(rebuild_row_counts)
+
+        try:
+            await sqlite_writer.submit(write)
+        except Exception as e:
+            raise SQLiteServiceError(f"Failed to rebuild row counts: {e}") from e
@@ -1,61 +1,292 @@
 """Vector Search Service"""
+import time
+from pathlib import Path
 
+from qdrant_client.models import SearchRequest as QdrantSearchRequest
+
+from app.models.local_index import LocalVectorIndex, local_vector_index
 from app.models.vector_db import qdrant_client
 from app.core.config import settings
-from app.core.exceptions import VectorSearchError
+from app.core.exceptions import ProviderUnavailableError, VectorSearchError
 from app.services.embedding_service import embedding_service
+from app.services.search_cache import SearchResultCache
+
+VECTOR_SEARCH_BACKENDS = ("qdrant", "local", "fallback")
 
 
 class VectorSearchService:
-    """Vector search service"""
+    """Vector search service
+
+    Results are cached (SEARCH_CACHE_ENABLED), so repeated searches are
+    served without calling the embedding provider or Qdrant until the
+    collection is written to or the entry expires.
+
+    VECTOR_SEARCH_BACKEND selects where queries run: qdrant, the in-process
+    local index, or fallback (Qdrant, switching to the local index for
+    queries Qdrant cannot answer).
+
+    Payload filters are passed to Qdrant as a query filter, so they are
+    applied during the HNSW traversal (backed by the payload indexes in
+    QDRANT_PAYLOAD_INDEXES) rather than by over-fetching and discarding.
+    """
 
     def __init__(self):
         self.client = qdrant_client
+        self.local_index = local_vector_index
+        self.cache = SearchResultCache() if settings.SEARCH_CACHE_ENABLED else None
+        self.fallbacks = 0
 
-    async def search(self, query: str, limit: int | None = None) -> list[dict]:
+    async def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        filters: dict | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> list[dict]:
         """
         Execute vector search
 
         Args:
             query: Query text
             limit: Number of results to return
+            filters: Payload field -> value (exact match) or list of values
+                (match any); all fields must match
+            timings: If given, receives the milliseconds spent in the embed
+                and vector_search stages (absent on a cache hit)
 
         Returns:
             List of matched medical information
         """
         try:
             limit = limit or settings.TOP_K_RESULTS
+            threshold = settings.SIMILARITY_THRESHOLD
+
+            if self.cache is not None:
+                version = self.client.collection_version
+                key = self.cache.make_key(query, limit, threshold, filters=_filters_key(filters))
+                cached = self.cache.get(key, version)
+                if cached is not None:
+                    return cached
 
             # Convert query text to embedding vector
+            start = time.perf_counter()
             query_vector = await embedding_service.embed_text(query)
+            embedded = time.perf_counter()
 
             # Execute vector search
-            results = self.client.client.search(
+            formatted_results = await self._search_vector(query_vector, limit, threshold, filters)
+            if timings is not None:
+                timings["embed"] = (embedded - start) * 1000
+                timings["vector_search"] = (time.perf_counter() - embedded) * 1000
+
+            if self.cache is not None:
+                self.cache.set(key, version, formatted_results)
+            return formatted_results
+
+        except (VectorSearchError, ProviderUnavailableError):
+            raise
+        except Exception as e:
+            raise VectorSearchError(f"Vector search failed: {str(e)}")
+
+    async def search_batch(
+        self, queries: list[str], limit: int | None = None, filters: dict | None = None
+    ) -> list[list[dict]]:
+        """
+        Execute many vector searches at once
+
+        Cached queries are served locally. The rest are embedded with one
+        embed_batch call and searched with one Qdrant search_batch request,
+        so N queries cost two round trips instead of 2N.
+
+        Args:
+            queries: Query texts
+            limit: Number of results to return per query
+            filters: Payload conditions applied to every query (see search)
+
+        Returns:
+            Results for each query, in input order
+        """
+        try:
+            limit = limit or settings.TOP_K_RESULTS
+            threshold = settings.SIMILARITY_THRESHOLD
+            version = self.client.collection_version
+
+            # Each distinct query is looked up, embedded and searched once
+            keys: dict = dict.fromkeys(queries)
+            found: dict[str, list[dict]] = {}
+            if self.cache is not None:
+                for query in keys:
+                    keys[query] = self.cache.make_key(query, limit, threshold, filters=_filters_key(filters))
+                    cached = self.cache.get(keys[query], version)
+                    if cached is not None:
+                        found[query] = cached
+
+            pending = [query for query in keys if query not in found]
+            if pending:
+                query_vectors = await embedding_service.embed_batch(pending)
+                results = await self._search_vector_batch(query_vectors, limit, threshold, filters)
+                for query, formatted_results in zip(pending, results):
+                    found[query] = formatted_results
+                    if self.cache is not None:
+                        self.cache.set(keys[query], version, formatted_results)
+
+            return [found[query] for query in queries]
+
+        except (VectorSearchError, ProviderUnavailableError):
+            raise
+        except Exception as e:
+            raise VectorSearchError(f"Batch vector search failed: {str(e)}")
+
+    async def _search_vector(
+        self, query_vector, limit: int, threshold: float | None, filters: dict | None = None
+    ) -> list[dict]:
+        """Run a vector query on the configured backend"""
+        backend = settings.VECTOR_SEARCH_BACKEND
+        if backend not in VECTOR_SEARCH_BACKENDS:
+            raise VectorSearchError(
+                f"Unknown vector search backend: {backend}, "
+                f"supported backends: {', '.join(VECTOR_SEARCH_BACKENDS)}"
+            )
+
+        if backend == "local":
+            return self.local_index.search(query_vector, limit, threshold, filters)
+
+        try:
+            results = await self.client.client.search(
                 collection_name=settings.QDRANT_COLLECTION_NAME,
                 query_vector=query_vector,
+                query_filter=self.client.build_filter(filters),
                 limit=limit,
-                score_threshold=settings.SIMILARITY_THRESHOLD,
+                score_threshold=threshold,
+                search_params=self.client.search_params(),
             )
+        except Exception:
+            if backend != "fallback" or not len(self.local_index):
+                raise
+            self.fallbacks += 1
+            return self.local_index.search(query_vector, limit, threshold, filters)
 
-            # Format results
-            formatted_results = []
-            for result in results:
-                formatted_results.append({
-                    "id": result.id,
-                    "score": result.score,
-                    "payload": result.payload,
-                })
+        # Format results
+        formatted_results = []
+        for result in results:
+            formatted_results.append({
+                "id": result.id,
+                "score": result.score,
+                "payload": result.payload,
+            })
+        return formatted_results
 
-            return formatted_results
+    async def _search_vector_batch(
+        self, query_vectors: list, limit: int, threshold: float | None, filters: dict | None = None
+    ) -> list[list[dict]]:
+        """Run many vector queries in one request on the configured backend"""
+        backend = settings.VECTOR_SEARCH_BACKEND
+        if backend not in VECTOR_SEARCH_BACKENDS:
+            raise VectorSearchError(
+                f"Unknown vector search backend: {backend}, "
+                f"supported backends: {', '.join(VECTOR_SEARCH_BACKENDS)}"
+            )
+
+        if backend == "local":
+            return [self.local_index.search(vector, limit, threshold, filters) for vector in query_vectors]
+
+        query_filter = self.client.build_filter(filters)
+        search_params = self.client.search_params()
+        try:
+            batches = await self.client.client.search_batch(
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                requests=[
+                    QdrantSearchRequest(
+                        vector=vector.tolist(),
+                        filter=query_filter,
+                        limit=limit,
+                        score_threshold=threshold,
+                        params=search_params,
+                        with_payload=True,
+                    )
+                    for vector in query_vectors
+                ],
+            )
+        except Exception:
+            if backend != "fallback" or not len(self.local_index):
+                raise
+            self.fallbacks += 1
+            return [self.local_index.search(vector, limit, threshold, filters) for vector in query_vectors]
+
+        return [
+            [{"id": result.id, "score": result.score, "payload": result.payload} for result in results]
+            for results in batches
+        ]
+
+    async def load_local_index(self) -> int:
+        """
+        Fill the local index (backends local and fallback)
 
+        The local backend loads its snapshot, falling back to a Qdrant
+        scroll if there is none. The fallback backend prefers a fresh
+        Qdrant scroll and uses the snapshot only if Qdrant is unreachable.
+        A snapshot or collection of another vector size than
+        EMBEDDING_OUTPUT_DIMENSION raises VectorSearchError.
+
+        Returns:
+            Number of indexed points
+        """
+        backend = settings.VECTOR_SEARCH_BACKEND
+        if backend == "qdrant":
+            return 0
+
+        snapshot = Path(settings.LOCAL_INDEX_PATH)
+        has_snapshot = (snapshot / "meta.json").exists()
+
+        if backend == "local" and has_snapshot:
+            self.local_index.replace(self._load_snapshot(snapshot))
+            return len(self.local_index)
+
+        try:
+            await self.client.check_vector_size()
+            await self.local_index.load_from_qdrant(self.client.client, settings.QDRANT_COLLECTION_NAME)
+            self.save_local_index()
         except VectorSearchError:
             raise
-        except Exception as e:
-            raise VectorSearchError(f"Vector search failed: {str(e)}")
+        except Exception:
+            if not has_snapshot:
+                raise
+            self.local_index.replace(self._load_snapshot(snapshot))
+        return len(self.local_index)
+
+    @staticmethod
+    def _load_snapshot(snapshot: Path) -> LocalVectorIndex:
+        """Load the local index snapshot, which must match EMBEDDING_OUTPUT_DIMENSION"""
+        return LocalVectorIndex.load(
+            snapshot, mmap=settings.LOCAL_INDEX_MMAP, dimension=settings.EMBEDDING_OUTPUT_DIMENSION
+        )
+
+    def save_local_index(self) -> None:
+        """Write the local index snapshot if it has unsaved changes"""
+        if settings.VECTOR_SEARCH_BACKEND != "qdrant" and self.local_index.dirty:
+            self.local_index.save(settings.LOCAL_INDEX_PATH)
+
+    def cache_stats(self) -> dict:
+        """Get search result cache counters"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
 
     async def health_check(self) -> bool:
         """Check vector database connection status"""
-        return self.client.health_check()
+        return await self.client.health_check()
+
+
+def _filters_key(filters: dict | None) -> tuple | None:
+    """Hashable, order-independent form of payload filters (for cache keys)"""
+    if not filters:
+        return None
+    return tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for key, value in filters.items()
+        )
+    )
 
 
 # Global service instance
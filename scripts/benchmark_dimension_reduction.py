@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Dimension Reduction Benchmark
+
+This script measures how much search quality is lost when embeddings are
+reduced (truncated or projected) to fewer dimensions. SympGAN symptom names
+are indexed, symptom aliases are used as queries, and top-k results of each
+reduced index are compared against the full-dimension baseline.
+
+Usage:
+    python scripts/benchmark_dimension_reduction.py [--corpus 2000] [--queries 200]
+        [--top-k 10] [--dims 256 512] [--modes truncate project]
+
+The embedding provider is taken from settings (EMBEDDING_PROVIDER), so set
+EMBEDDING_PROVIDER=local to run offline.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.vectors import DimensionReducer, normalize_rows
+from app.services.embedding_service import EmbeddingService
+from app.services.embedding_providers import get_embedding_provider
+
+# Data file path
+SYMPTOMS_FILE = Path("./data/sympgan/symptoms.tsv")
+
+
+def load_corpus(limit: int, query_limit: int) -> tuple[list[str], list[str]]:
+    """Load symptom names (documents) and one alias per symptom (queries)
+
+    Args:
+        limit: Maximum number of symptoms to index
+        query_limit: Maximum number of alias queries
+
+    Returns:
+        Tuple of (documents, queries)
+    """
+    documents, queries = [], []
+    with open(SYMPTOMS_FILE, "r", encoding="utf-8") as f:
+        header = f.readline().strip().split("\t")
+        for line in f:
+            row = dict(zip(header, line.rstrip("\n").split("\t")))
+            documents.append(row["Symptom_Name"])
+
+            aliases = [a for a in (row.get("Alias") or "").split("|") if a]
+            alias = next((a for a in aliases if a.lower() != row["Symptom_Name"].lower()), None)
+            if alias and len(queries) < query_limit:
+                queries.append(alias)
+
+            if len(documents) >= limit:
+                break
+
+    return documents, queries
+
+
+def top_k(index: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k (rows are normalized)"""
+    scores = queries @ index.T
+    candidates = np.argpartition(-scores, k, axis=1)[:, :k]
+    order = np.take_along_axis(scores, candidates, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def recall(baseline: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean fraction of baseline top-k ids also returned by the candidate"""
+    hits = [len(set(b) & set(c)) / len(b) for b, c in zip(baseline, candidate)]
+    return float(np.mean(hits))
+
+
+async def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Recall-vs-size benchmark for dimension reduction")
+    parser.add_argument("--corpus", type=int, default=2000, help="Number of symptoms to index")
+    parser.add_argument("--queries", type=int, default=200, help="Number of alias queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512], help="Reduced dimensions")
+    parser.add_argument(
+        "--modes", nargs="+", default=list(DimensionReducer.MODES), choices=DimensionReducer.MODES
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Dimension Reduction Benchmark")
+    print("=" * 60)
+
+    if not SYMPTOMS_FILE.exists():
+        print(f"\nError: Data file not found: {SYMPTOMS_FILE}")
+        return
+
+    documents, queries = load_corpus(args.corpus, args.queries)
+    print(f"\nProvider: {settings.EMBEDDING_PROVIDER}, documents: {len(documents)}, queries: {len(queries)}")
+
+    # Embed at full dimension; the reductions are applied here
+    settings.EMBEDDING_REDUCED_DIMENSION = None
+    provider = get_embedding_provider()
+    service = EmbeddingService(provider=provider)
+    start = time.perf_counter()
+    full_index = normalize_rows(np.stack(await service.embed_batch(documents)))
+    full_queries = normalize_rows(np.stack(await service.embed_batch(queries)))
+    service.close()
+    print(f"Embedded in {time.perf_counter() - start:.1f}s")
+
+    k = min(args.top_k, len(documents) - 1)
+    baseline = top_k(full_index, full_queries, k)
+
+    print(f"\n{'mode':<10} {'dim':>6} {'bytes/vec':>10} {'size':>7} {'recall@' + str(k):>10} {'ms/query':>9}")
+    print(f"{'full':<10} {provider.dimension:>6} {full_index.shape[1] * 4:>10} {'1.00x':>7} {1.0:>10.3f}", end="")
+    start = time.perf_counter()
+    top_k(full_index, full_queries, k)
+    print(f" {(time.perf_counter() - start) * 1000 / len(queries):>9.3f}")
+
+    for mode in args.modes:
+        for dim in sorted(args.dims):
+            if dim >= provider.dimension:
+                continue
+            reducer = DimensionReducer(
+                provider.dimension, dim, mode=mode, seed=settings.EMBEDDING_PROJECTION_SEED
+            )
+            index = reducer.reduce(full_index)
+            reduced_queries = reducer.reduce(full_queries)
+
+            start = time.perf_counter()
+            result = top_k(index, reduced_queries, k)
+            elapsed = (time.perf_counter() - start) * 1000 / len(queries)
+
+            ratio = provider.dimension / dim
+            print(
+                f"{mode:<10} {dim:>6} {dim * 4:>10} {f'{1 / ratio:.2f}x':>7} "
+                f"{recall(baseline, result):>10.3f} {elapsed:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Row Count Consistency Check
+
+The list endpoints report totals from counts maintained by triggers
+(table_stats and conversations.message_count) instead of running COUNT(*).
+This script compares those counts with the actual tables and can rebuild
+them, e.g. after rows were changed with the triggers dropped.
+
+Usage:
+    python scripts/check_row_counts.py [--rebuild]
+
+Exits with status 1 when mismatches are found and --rebuild is not given.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+from app.core.config import settings
+from app.models.sqlite_db import SQLiteClientWrapper
+from app.models.sqlite_writer import sqlite_writer
+from app.services.sqlite_crud import TableStatsService
+
+
+async def check() -> dict:
+    """Run the consistency check on a reader connection"""
+    session = await SQLiteClientWrapper.get_read_session()
+    try:
+        return await TableStatsService.check(session)
+    finally:
+        await session.close()
+
+
+def report(mismatches: dict) -> bool:
+    """Print mismatches, returning True when the counts are consistent"""
+    for table, counts in mismatches["tables"].items():
+        print(f"  table_stats.{table}: stored {counts['stored']}, actual {counts['actual']}")
+    for conversation in mismatches["conversations"][:20]:
+        print(
+            f"  conversation {conversation['id']}: message_count "
+            f"{conversation['stored']}, actual {conversation['actual']}"
+        )
+    if len(mismatches["conversations"]) > 20:
+        print(f"  ... and {len(mismatches['conversations']) - 20} more conversations")
+    return not mismatches["tables"] and not mismatches["conversations"]
+
+
+async def main(rebuild: bool) -> int:
+    """Main check function"""
+    print(f"Database: {settings.SQLITE_DATABASE_PATH}")
+    try:
+        consistent = report(await check())
+        if consistent:
+            print("Row counts are consistent")
+            return 0
+        if not rebuild:
+            print("Row counts are inconsistent, run with --rebuild to fix them")
+            return 1
+
+        print("Rebuilding row counts...")
+        await TableStatsService.rebuild()
+        if not report(await check()):
+            print("Row counts are still inconsistent after the rebuild")
+            return 1
+        print("Row counts rebuilt")
+        return 0
+    finally:
+        await sqlite_writer.close()
+        await SQLiteClientWrapper.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the counts when they are inconsistent")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.rebuild)))
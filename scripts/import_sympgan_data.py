@@ -12,6 +12,9 @@ Data files:
     - ./data/sympgan/diseases.tsv
     - ./data/sympgan/symptoms.tsv
     - ./data/sympgan/symptom_disease_associations.tsv
+
+The full-text (FTS5) indexes behind /sqlite/diseases/search and
+/sqlite/symptoms/search are rebuilt and optimized after the import.
 """
 import asyncio
 import os
@@ -23,7 +26,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 os.chdir(project_root)
 
-from app.models.sqlite_db import SQLiteClientWrapper, Disease, Symptom, DiseaseSymptomAssociation
+from app.models.sqlite_db import SQLiteClientWrapper, Disease, Symptom, DiseaseSymptomAssociation, rebuild_fts
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from tqdm import tqdm
@@ -72,7 +75,7 @@ async def import_diseases(session: AsyncSession) -> dict[str, int]:
     Returns:
         Dictionary with CUI to ID mapping
     """
-    print(f"\n[1/3] Importing diseases from {DISEASES_FILE}...")
+    print(f"\n[1/4] Importing diseases from {DISEASES_FILE}...")
 
     # Read TSV file
     rows = read_tsv(DISEASES_FILE)
@@ -137,7 +140,7 @@ async def import_symptoms(session: AsyncSession) -> dict[str, int]:
     Returns:
         Dictionary with CUI to ID mapping
     """
-    print(f"\n[2/3] Importing symptoms from {SYMPTOMS_FILE}...")
+    print(f"\n[2/4] Importing symptoms from {SYMPTOMS_FILE}...")
 
     # Read TSV file
     rows = read_tsv(SYMPTOMS_FILE)
@@ -203,7 +206,7 @@ async def import_associations(
         disease_cui_to_id: Mapping from disease CUI to database ID
         symptom_cui_to_id: Mapping from symptom CUI to database ID
     """
-    print(f"\n[3/3] Importing associations from {ASSOCIATIONS_FILE}...")
+    print(f"\n[3/4] Importing associations from {ASSOCIATIONS_FILE}...")
 
     # Read TSV file
     rows = read_tsv(ASSOCIATIONS_FILE)
@@ -262,6 +265,22 @@ async def import_associations(
     print(f"  Skipped - existing association: {skipped_existing}")
 
 
+async def rebuild_search_indexes(session: AsyncSession) -> None:
+    """Rebuild the full-text search indexes
+
+    Triggers keep the indexes in sync row by row during the import; the
+    rebuild and optimize then merge the many small index segments this
+    leaves behind, so searches read one compact index.
+
+    Args:
+        session: Database session
+    """
+    print("\n[4/4] Rebuilding full-text search indexes...")
+    await session.run_sync(rebuild_fts)
+    await session.commit()
+    print("  Done")
+
+
 async def main():
     """Main import function"""
     print("=" * 60)
@@ -286,6 +305,9 @@ async def main():
         # Import associations using mappings
         await import_associations(session, disease_cui_to_id, symptom_cui_to_id)
 
+        # Rebuild full-text search indexes
+        await rebuild_search_indexes(session)
+
     print("\n" + "=" * 60)
     print("Import completed successfully!")
     print("=" * 60)
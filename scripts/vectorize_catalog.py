@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+SympGAN Catalog Vectorization Script
+
+This script embeds symptoms and diseases from the SQLite database (see
+import_sympgan_data.py) and stores them in the vector database, so they can
+be found by vector and hybrid search.
+
+Usage:
+    python scripts/vectorize_catalog.py [--kinds symptom disease] [--batch-size 256] [--force]
+
+Progress is checkpointed after every batch: re-running after an
+interruption resumes where it stopped, and later runs only re-embed rows
+whose name, aliases or definition changed (or all rows with --force).
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+from tqdm import tqdm
+
+from app.core.config import settings
+from app.models.sqlite_db import SQLiteClientWrapper
+from app.models.sqlite_writer import sqlite_writer
+from app.models.vector_db import qdrant_client
+from app.services.catalog_vectorizer import CATALOG_MODELS, catalog_vectorizer
+from app.services.embedding_service import embedding_service
+from app.services.vector_search import vector_search_service
+
+
+async def main(kinds: list[str], batch_size: int, force: bool):
+    """Main vectorization function"""
+    print("=" * 60)
+    print("SympGAN Catalog Vectorization")
+    print("=" * 60)
+    print(f"Embedding model: {embedding_service.model_key} ({embedding_service.dimension} dimensions)")
+    print(f"Collection: {settings.QDRANT_COLLECTION_NAME} (backend: {settings.VECTOR_SEARCH_BACKEND})")
+
+    bars: dict[str, tqdm] = {}
+
+    def on_batch(kind: str, rows: int):
+        if kind not in bars:
+            total = catalog_vectorizer.progress["kinds"][kind]["total"]
+            bars[kind] = tqdm(total=total, desc=f"  {kind}")
+        bars[kind].update(rows)
+
+    await qdrant_client.open()
+    try:
+        try:
+            await vector_search_service.load_local_index()
+        except Exception as e:
+            print(f"Local vector index not loaded: {e}")
+        progress = await catalog_vectorizer.run(kinds, batch_size=batch_size, force=force, on_batch=on_batch)
+        vector_search_service.save_local_index()
+    finally:
+        for bar in bars.values():
+            bar.close()
+        await qdrant_client.close()
+        await sqlite_writer.close()
+        await SQLiteClientWrapper.close()
+        embedding_service.close()
+
+    print()
+    for kind, stats in progress["kinds"].items():
+        print(
+            f"{kind}: {stats['scanned']} scanned, {stats['embedded']} embedded, "
+            f"{stats['unchanged']} unchanged, {stats['failed']} failed"
+        )
+    print(f"Finished in {progress['finished_at'] - progress['started_at']:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", nargs="+", choices=list(CATALOG_MODELS), default=list(CATALOG_MODELS))
+    parser.add_argument("--batch-size", type=int, default=settings.CATALOG_VECTORIZE_BATCH_SIZE)
+    parser.add_argument("--force", action="store_true", help="Re-embed every row")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.kinds, args.batch_size, args.force))
@@ -0,0 +1,35 @@
+"""Shared test fixtures"""
+import os
+
+# Offline embeddings and no on-disk embedding cache (read when app.core.config is imported)
+os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+
+import pytest_asyncio
+from qdrant_client import AsyncQdrantClient
+
+from app.core.config import settings
+from app.models.sqlite_db import SQLiteClientWrapper
+from app.models.sqlite_writer import sqlite_writer
+from app.models.vector_db import qdrant_client
+from app.services.lexical_search import symptom_lexical_search
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(tmp_path, monkeypatch):
+    """Fresh SQLite database file for one test"""
+    monkeypatch.setattr(settings, "SQLITE_DATABASE_PATH", str(tmp_path / "test.db"))
+    await SQLiteClientWrapper.close()
+    symptom_lexical_search.invalidate()
+    yield SQLiteClientWrapper
+    await sqlite_writer.close()
+    await SQLiteClientWrapper.close()
+
+
+@pytest_asyncio.fixture
+async def qdrant_memory(monkeypatch):
+    """In-memory Qdrant behind the global client"""
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_BACKEND", "qdrant")
+    monkeypatch.setattr(qdrant_client, "_client", AsyncQdrantClient(location=":memory:"))
+    monkeypatch.setattr(qdrant_client, "_collection_ready", False)
+    yield qdrant_client
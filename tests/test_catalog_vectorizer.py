@@ -0,0 +1,46 @@
+"""Catalog vectorization tests"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.sqlite_db import Symptom, VectorSyncState
+from app.services.catalog_vectorizer import CatalogVectorizer
+from app.services.embedding_service import embedding_service
+from app.services.sqlite_crud import ConversationService
+
+
+@pytest.mark.asyncio
+async def test_vectorize_alongside_chat_writes(sqlite_db, qdrant_memory, monkeypatch):
+    """Conversation writes during a run must not break its checkpoints"""
+
+    session = await sqlite_db.get_session()
+    session.add_all([Symptom(cui=f"C{i}", name=f"symptom {i}") for i in range(20)])
+    await session.commit()
+    await session.close()
+
+    # Slow embedding, so chat writes land while a page is in flight
+    embed_batch = embedding_service.embed_batch
+
+    async def slow_embed_batch(texts, **kwargs):
+        await asyncio.sleep(0.05)
+        return await embed_batch(texts, **kwargs)
+
+    monkeypatch.setattr(embedding_service, "embed_batch", slow_embed_batch)
+
+    async def chat():
+        for i in range(5):
+            await ConversationService.create({"title": f"chat {i}", "started_at": datetime.utcnow()})
+            await asyncio.sleep(0.02)
+
+    progress, _ = await asyncio.gather(CatalogVectorizer().run(["symptom"], batch_size=5), chat())
+
+    assert progress["status"] == "completed"
+    assert progress["kinds"]["symptom"]["embedded"] == 20
+    session = await sqlite_db.get_read_session()
+    try:
+        synced = (await session.execute(select(func.count()).select_from(VectorSyncState))).scalar()
+        assert synced == 20
+    finally:
+        await session.close()
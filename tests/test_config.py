@@ -0,0 +1,17 @@
+"""Settings: path resolution"""
+from app.core.config import PROJECT_ROOT, Settings
+
+
+def test_relative_paths_resolve_against_project_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = Settings(LOCAL_INDEX_PATH="./data/vector_index", EMBEDDING_CACHE_PATH="./data/cache.db")
+
+    assert config.LOCAL_INDEX_PATH == str(PROJECT_ROOT / "data" / "vector_index")
+    assert config.EMBEDDING_CACHE_PATH == str(PROJECT_ROOT / "data" / "cache.db")
+
+
+def test_absolute_and_empty_paths_are_kept(tmp_path):
+    config = Settings(LOCAL_INDEX_PATH=str(tmp_path / "index"), EMBEDDING_CACHE_PATH="")
+
+    assert config.LOCAL_INDEX_PATH == str(tmp_path / "index")
+    assert config.EMBEDDING_CACHE_PATH == ""
@@ -0,0 +1,60 @@
+"""Consultation pipeline tests"""
+import pytest
+
+from app.core.config import settings
+from app.models.sqlite_db import Disease, DiseaseSymptomAssociation, Symptom
+from app.services.catalog_vectorizer import CatalogVectorizer
+from app.services.consultation_service import ConsultationService, consultation_service
+from app.services.hybrid_search import reciprocal_rank_fusion
+
+
+def test_fusion_keeps_disease_and_symptom_with_same_cui_apart():
+    symptom = {"id": "s", "score": 0.9, "payload": {"cui": "C1", "type": "symptom"}}
+    disease = {"id": "d", "score": 0.8, "payload": {"cui": "C1", "type": "disease"}}
+
+    results = reciprocal_rank_fusion({"lexical": [symptom], "vector": [disease, symptom]}, k=60)
+
+    assert sorted(result["id"] for result in results) == ["d", "s"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["vector", "hybrid"])
+async def test_disease_point_is_not_returned_as_symptom(sqlite_db, qdrant_memory, monkeypatch, mode):
+    monkeypatch.setattr(settings, "SIMILARITY_THRESHOLD", 0.0)
+
+    # A disease and a symptom with the same name, both vectorized into the collection
+    session = await sqlite_db.get_session()
+    symptom = Symptom(cui="C0033893", name="Tension headache", definition="Pressing head pain")
+    disease = Disease(cui="C0033893", name="Tension headache", definition="Primary headache disorder")
+    migraine = Disease(cui="C0149931", name="Migraine")
+    session.add_all([symptom, disease, migraine])
+    await session.flush()
+    session.add(DiseaseSymptomAssociation(disease_id=migraine.id, symptom_id=symptom.id))
+    await session.commit()
+    await session.close()
+    await CatalogVectorizer().run()
+
+    response = await consultation_service.query(f"tension headache ({mode})", limit=5, mode=mode)
+
+    results = response["results"]
+    assert [result["symptom_name"] for result in results] == ["Tension headache"]
+    assert results[0]["possible_diseases"] == ["Migraine"]
+
+
+@pytest.mark.asyncio
+async def test_confidence_is_cosine_similarity_not_rank_score():
+    lexical_only = {"id": "a", "score": 0.5, "payload": {"text": "Cough"}}
+    vector_only = {"id": "b", "score": 0.4, "payload": {"text": "Dry cough"}}
+    hits = reciprocal_rank_fusion(
+        {"lexical": [lexical_only], "vector": [{**vector_only, "score": 0.71}]}, k=60
+    )
+
+    results = await ConsultationService._hydrate(hits, "hybrid")
+
+    # Both are ranked first in their leg, so they tie on the fused score
+    assert [result["rank_score"] for result in results] == [0.5, 0.5]
+    confidence = {result["symptom_name"]: result["confidence_score"] for result in results}
+    assert confidence == {"Cough": None, "Dry cough": pytest.approx(0.71)}
+
+    results = await ConsultationService._hydrate([vector_only], "vector")
+    assert results[0]["confidence_score"] == results[0]["rank_score"] == 0.4
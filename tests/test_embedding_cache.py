@@ -0,0 +1,70 @@
+"""Embedding cache tests"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache
+
+
+def vector(value: float) -> np.ndarray:
+    return np.full(4, value, dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_runs_off_the_event_loop(tmp_path, monkeypatch):
+    cache = EmbeddingCache(path=str(tmp_path / "cache.db"), max_size=10, ttl=60)
+    threads = []
+    set_disk, get_disk = cache._set_disk, cache._get_disk
+
+    def recording_set_disk(items):
+        threads.append(threading.current_thread())
+        return set_disk(items)
+
+    def recording_get_disk(keys):
+        threads.append(threading.current_thread())
+        return get_disk(keys)
+
+    monkeypatch.setattr(cache, "_set_disk", recording_set_disk)
+    monkeypatch.setattr(cache, "_get_disk", recording_get_disk)
+
+    await cache.aset_many({"a": vector(1.0)})
+    cache.memory.clear()
+    found = await cache.aget_many(["a", "b"])
+
+    assert list(found) == ["a"]
+    np.testing.assert_array_equal(found["a"], vector(1.0))
+    assert len(threads) == 2
+    assert all(thread is not threading.main_thread() for thread in threads)
+    cache.close()
+
+
+def test_disk_tier_expires_entries(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "cache.db"), max_size=10, ttl=60, disk_ttl=60)
+    cache.set("old", vector(1.0))
+    cache._conn.execute("UPDATE embedding_cache SET created_at = ?", (time.time() - 120,))
+    cache._conn.commit()
+    cache.memory.clear()
+
+    assert cache.get("old") is None
+    cache.close()
+
+    # Expired rows are deleted when the store is reopened
+    cache = EmbeddingCache(path=str(tmp_path / "cache.db"), max_size=10, ttl=60, disk_ttl=60)
+    cache.get("missing")
+    assert cache._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0] == 0
+    cache.close()
+
+
+def test_disk_tier_keeps_newest_entries_within_limit(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "cache.db"), max_size=100, ttl=60, disk_max_entries=10)
+    for i in range(25):
+        cache.set(f"k{i}", vector(float(i)))
+
+    rows = cache._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+    assert rows <= 11
+    cache.memory.clear()
+    assert cache.get("k24") is not None
+    assert cache.get("k0") is None
+    cache.close()
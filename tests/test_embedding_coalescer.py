@@ -0,0 +1,105 @@
+"""Coalescing of concurrent embed_text calls"""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ProviderUnavailableError
+from app.services.embedding_coalescer import EmbeddingCoalescer
+from app.services.embedding_providers import HashingEmbeddingProvider
+from app.services.embedding_service import EmbeddingService
+
+
+class CountingProvider(HashingEmbeddingProvider):
+    """Local provider that records its requests and can be switched to fail"""
+
+    def __init__(self, error: Exception | None = None):
+        super().__init__()
+        self.error = error
+        self.requests: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        with self._lock:
+            self.requests.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return super().embed(texts)
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EMBEDDING_COALESCE_ENABLED", True)
+    monkeypatch.setattr(settings, "EMBEDDING_COALESCE_WINDOW_MS", 20.0)
+    monkeypatch.setattr(settings, "EMBEDDING_COALESCE_MAX_BATCH", 10)
+    monkeypatch.setattr(settings, "PROVIDER_MAX_RETRIES", 0)
+    services = []
+
+    def make_service(provider):
+        service = EmbeddingService(provider=provider)
+        services.append(service)
+        return service
+
+    yield make_service
+    for service in services:
+        service.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_provider_call(make_service):
+    provider = CountingProvider()
+    service = make_service(provider)
+    texts = ["fever", "cough", "headache", "fever", "nausea"]
+
+    vectors = await asyncio.gather(*(service.embed_text(text) for text in texts))
+
+    # One call, with the repeated text embedded once
+    assert provider.requests == [["fever", "cough", "headache", "nausea"]]
+    expected = HashingEmbeddingProvider().embed(texts)
+    for vector, row in zip(vectors, expected):
+        np.testing.assert_allclose(vector, row, atol=1e-6)
+    assert service.coalescer.stats() == {"requests": 5, "batches": 1}
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_before_the_window_ends(make_service, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_COALESCE_WINDOW_MS", 10_000.0)
+    monkeypatch.setattr(settings, "EMBEDDING_COALESCE_MAX_BATCH", 3)
+    provider = CountingProvider()
+    service = make_service(provider)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(service.embed_text(f"symptom {i}") for i in range(3))), timeout=1.0
+    )
+    assert len(provider.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_error_reaches_every_waiting_caller(make_service):
+    provider = CountingProvider(error=ConnectionError("connection reset"))
+    service = make_service(provider)
+
+    results = await asyncio.gather(
+        *(service.embed_text(text) for text in ["fever", "cough", "headache"]), return_exceptions=True
+    )
+
+    assert len(provider.requests) == 1
+    assert all(isinstance(result, ProviderUnavailableError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_function_failure_fails_every_future():
+    async def embed_batch(texts):
+        raise RuntimeError("boom")
+
+    coalescer = EmbeddingCoalescer(embed_batch, window=0.01, max_batch_size=10)
+
+    results = await asyncio.gather(
+        *(coalescer.submit(text) for text in ["a", "b", "a"]), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["boom"] * 3
+    assert coalescer.batches == 1
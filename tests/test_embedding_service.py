@@ -0,0 +1,71 @@
+"""Embedding service: chunk bisection around rejected items"""
+import threading
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ProviderResponseError, VectorSearchError
+from app.services.embedding_providers import HashingEmbeddingProvider
+from app.services.embedding_service import EmbeddingService
+
+
+class RejectingProvider(HashingEmbeddingProvider):
+    """Local provider that rejects every request containing one specific text"""
+
+    def __init__(self, rejected: str):
+        super().__init__()
+        self.rejected = rejected
+        self.requests: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        with self._lock:
+            self.requests.append(list(texts))
+        if self.rejected in texts:
+            raise ProviderResponseError("Input contains inappropriate content", status_code=400)
+        return super().embed(texts)
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_SIZE", 8)
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    services = []
+
+    def make_service(provider):
+        service = EmbeddingService(provider=provider)
+        services.append(service)
+        return service
+
+    yield make_service
+    for service in services:
+        service.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_chunk_is_bisected_down_to_the_bad_item(make_service):
+    texts = [f"symptom {i}" for i in range(8)]
+    provider = RejectingProvider(rejected=texts[5])
+    service = make_service(provider)
+
+    vectors = await service.embed_batch(texts, return_exceptions=True)
+
+    assert isinstance(vectors[5], VectorSearchError)
+    assert "inappropriate" in vectors[5].message
+    expected = HashingEmbeddingProvider().embed(texts)
+    for i, vector in enumerate(vectors):
+        if i != 5:
+            np.testing.assert_allclose(vector, expected[i], atol=1e-6)
+
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: only the halves holding the bad item are split again
+    assert sorted(map(len, provider.requests)) == [1, 1, 2, 2, 4, 4, 8]
+    assert [texts[5]] in provider.requests
+
+
+@pytest.mark.asyncio
+async def test_rejected_item_raises_without_return_exceptions(make_service):
+    service = make_service(RejectingProvider(rejected="bad"))
+
+    with pytest.raises(VectorSearchError):
+        await service.embed_batch(["good", "bad"])
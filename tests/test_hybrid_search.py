@@ -0,0 +1,109 @@
+"""Hybrid search: candidate sizing and lexical failures"""
+import logging
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import LexicalIndexUnavailableError
+from app.services.hybrid_search import HybridSearchService
+from app.services.lexical_search import SymptomLexicalSearch
+
+
+def _hit(cui: str, kind: str = "symptom") -> dict:
+    return {"id": cui, "score": 1.0, "payload": {"cui": cui, "type": kind, "name": cui}}
+
+
+class FakeLexical:
+    def __init__(self, hits=None, error=None):
+        self.hits = hits or []
+        self.error = error
+        self.limits: list[int] = []
+
+    async def search(self, query, limit=None):
+        self.limits.append(limit)
+        if self.error is not None:
+            raise self.error
+        return self.hits[:limit]
+
+
+class FakeVector:
+    def __init__(self, hits):
+        self.hits = hits
+        self.limits: list[int] = []
+
+    async def search(self, query, limit=None, filters=None, timings=None):
+        self.limits.append(limit)
+        return self.hits[:limit]
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(settings, "HYBRID_CANDIDATE_MULTIPLIER", 3)
+
+    def make_service(lexical, vector):
+        service = HybridSearchService()
+        service.lexical, service.vector = lexical, vector
+        return service
+
+    return make_service
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters", [None, {"type": "symptom"}])
+async def test_candidate_multiplier_is_applied_once(make_service, filters):
+    lexical = FakeLexical([_hit(f"C{i}") for i in range(100)])
+    vector = FakeVector([_hit(f"C{i}") for i in range(100)])
+    service = make_service(lexical, vector)
+
+    await service.search("fever", limit=5, mode="hybrid", filters=filters)
+    assert lexical.limits == vector.limits == [15]
+
+    lexical.limits.clear()
+    results = await service.search("fever", limit=5, mode="lexical", filters=filters)
+    assert lexical.limits == [15 if filters else 5]
+    assert len(results["results"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_lexical_filter_is_applied_after_fetch(make_service):
+    hits = [_hit("C1", "disease"), _hit("C2"), _hit("C3", "disease"), _hit("C4")]
+    service = make_service(FakeLexical(hits), FakeVector([]))
+
+    results = await service.search("fever", limit=1, mode="lexical", filters={"type": "symptom"})
+    assert [hit["id"] for hit in results["results"]] == ["C2"]
+
+
+@pytest.mark.asyncio
+async def test_missing_lexical_index_falls_back_quietly(make_service, caplog):
+    service = make_service(FakeLexical(error=LexicalIndexUnavailableError()), FakeVector([_hit("C1")]))
+
+    with caplog.at_level(logging.ERROR):
+        results = await service.search("fever", limit=5, mode="hybrid")
+
+    assert [hit["id"] for hit in results["results"]] == ["C1"]
+    assert not caplog.records
+
+
+@pytest.mark.asyncio
+async def test_lexical_bug_is_logged(make_service, caplog):
+    service = make_service(FakeLexical(error=KeyError("postings")), FakeVector([_hit("C1")]))
+
+    with caplog.at_level(logging.ERROR):
+        results = await service.search("fever", limit=5, mode="hybrid")
+
+    assert [hit["id"] for hit in results["results"]] == ["C1"]
+    assert "Lexical search failed" in caplog.text
+    assert "KeyError" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_uncreated_database_makes_lexical_index_unavailable(tmp_path, monkeypatch):
+    from app.models.sqlite_db import SQLiteClientWrapper
+
+    monkeypatch.setattr(settings, "SQLITE_DATABASE_PATH", str(tmp_path / "missing" / "test.db"))
+    await SQLiteClientWrapper.close()
+    try:
+        with pytest.raises(LexicalIndexUnavailableError):
+            await SymptomLexicalSearch().search("fever")
+    finally:
+        await SQLiteClientWrapper.close()
@@ -0,0 +1,29 @@
+"""Bulk ingest: invalid items fail individually"""
+import pytest
+
+from app.schemas.embedding import STORE_TEXT_MAX_LENGTH, StoreBatchItemResult, StoreBatchRequest
+from app.services.ingest_service import ingest_service
+
+
+@pytest.mark.asyncio
+async def test_invalid_items_are_reported_per_item(qdrant_memory):
+    request = StoreBatchRequest.model_validate({
+        "items": [
+            {"text": "Persistent dry cough"},
+            {"text": ""},
+            {"text": "x" * (STORE_TEXT_MAX_LENGTH + 1)},
+            {"text": "Fever and chills", "metadata": {"source": "test"}},
+        ],
+    })
+
+    results = await ingest_service.ingest(
+        [(item.text, item.metadata) for item in request.items],
+        wait=True,
+    )
+    results = [StoreBatchItemResult(**result) for result in results]
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert [result.status for result in results] == ["stored", "failed", "failed", "stored"]
+    assert "empty" in results[1].error
+    assert "too long" in results[2].error
+    assert results[0].point_id and results[3].point_id
@@ -0,0 +1,51 @@
+"""Lexical symptom search tests"""
+import sqlite3
+
+import pytest
+
+from app.core.config import settings
+from app.models.sqlite_db import Symptom
+from app.services.lexical_search import symptom_lexical_search
+
+
+@pytest.mark.asyncio
+async def test_index_picks_up_changes_made_outside_the_process(sqlite_db, monkeypatch):
+    monkeypatch.setattr(settings, "LEXICAL_VERSION_CHECK_INTERVAL", 0.0)
+    session = await sqlite_db.get_session()
+    session.add(Symptom(cui="C1", name="Headache"))
+    await session.commit()
+    await session.close()
+
+    assert [hit["id"] for hit in await symptom_lexical_search.search("dyspnea")] == []
+
+    # Another process (e.g. the import script) writes to the database directly
+    conn = sqlite3.connect(settings.SQLITE_DATABASE_PATH)
+    with conn:
+        conn.execute(
+            "INSERT INTO symptoms (cui, name, alias, created_at) "
+            "VALUES ('C2', 'Shortness of breath', 'Dyspnea', '2024-01-01')"
+        )
+    assert [hit["id"] for hit in await symptom_lexical_search.search("dyspnea")] == ["C2"]
+
+    with conn:
+        conn.execute("UPDATE symptoms SET alias = 'Cephalalgia' WHERE cui = 'C1'")
+    conn.close()
+    assert [hit["id"] for hit in await symptom_lexical_search.search("cephalalgia")] == ["C1"]
+
+
+@pytest.mark.asyncio
+async def test_version_check_is_rate_limited(sqlite_db, monkeypatch):
+    monkeypatch.setattr(settings, "LEXICAL_VERSION_CHECK_INTERVAL", 3600.0)
+    session = await sqlite_db.get_session()
+    session.add(Symptom(cui="C1", name="Headache"))
+    await session.commit()
+    await session.close()
+    await symptom_lexical_search.search("headache")
+
+    conn = sqlite3.connect(settings.SQLITE_DATABASE_PATH)
+    with conn:
+        conn.execute("INSERT INTO symptoms (cui, name, created_at) VALUES ('C2', 'Fever', '2024-01-01')")
+    conn.close()
+
+    # Within the interval the index is served without touching the database
+    assert await symptom_lexical_search.search("fever") == []
@@ -0,0 +1,64 @@
+"""Local vector index: filtered search"""
+import random
+
+import numpy as np
+
+from app.models.local_index import LocalVectorIndex, matches_filters
+
+
+def _random_index(size: int, dimension: int = 16) -> LocalVectorIndex:
+    rng = random.Random(7)
+    index = LocalVectorIndex(dimension)
+    payloads = [
+        {
+            "type": rng.choice(["symptom", "disease"]),
+            "department": rng.choice(["neurology", "cardiology", None]),
+            "tags": rng.sample(["acute", "chronic", "rare"], rng.randint(0, 2)),
+            "level": rng.randint(1, 3),
+        }
+        for _ in range(size)
+    ]
+    vectors = np.random.default_rng(7).standard_normal((size, dimension)).astype(np.float32)
+    index.add(list(range(size)), vectors, payloads)
+    return index
+
+
+def test_filter_rows_agree_with_matches_filters():
+    index = _random_index(500)
+    cases = [
+        {"type": "symptom"},
+        {"type": "disease", "department": "neurology"},
+        {"department": ["neurology", "cardiology"], "level": 2},
+        {"tags": "rare"},
+        {"tags": ["acute", "chronic"], "type": "symptom"},
+        {"department": "dermatology"},
+        {"missing": "x"},
+    ]
+    for filters in cases:
+        expected = [row for row, payload in enumerate(index.payloads) if matches_filters(payload, filters)]
+        assert index.filter_rows(filters).tolist() == expected, filters
+
+
+def test_filtered_search_follows_payload_updates():
+    index = _random_index(100)
+    query = index.vectors[3]
+    assert [hit["id"] for hit in index.search(query, 1, filters={"type": index.payloads[3]["type"]})] == [3]
+
+    # Re-adding a point replaces its payload in the inverted index
+    index.add([3], [query], [{"type": "archived"}])
+    assert [hit["id"] for hit in index.search(query, 5, filters={"type": "archived"})] == [3]
+    assert 3 not in [hit["id"] for hit in index.search(query, 100, filters={"type": "symptom"})]
+
+    # New points are indexed as they are added
+    index.add(["new"], [query], [{"type": "archived"}])
+    assert sorted(map(str, (hit["id"] for hit in index.search(query, 5, filters={"type": "archived"})))) == ["3", "new"]
+
+
+def test_filtered_search_on_loaded_snapshot(tmp_path):
+    index = _random_index(50)
+    index.save(tmp_path)
+    loaded = LocalVectorIndex.load(tmp_path)
+
+    filters = {"type": "disease", "level": [1, 2]}
+    query = index.vectors[0]
+    assert loaded.search(query, 10, filters=filters) == index.search(query, 10, filters=filters)
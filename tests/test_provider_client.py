@@ -0,0 +1,157 @@
+"""Provider call resilience: retry, circuit breaker, hedging and deadline"""
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ProviderResponseError, ProviderUnavailableError
+from app.services.provider_client import CircuitBreaker, ProviderClient
+
+
+class FakeProvider:
+    """Blocking callable that plays back scripted outcomes (value, exception or (delay, value))"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = itertools.chain(outcomes, itertools.repeat(outcomes[-1]))
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            self.calls += 1
+            outcome = next(self.outcomes)
+        if isinstance(outcome, tuple):
+            delay, outcome = outcome
+            time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return f"{outcome}:{text}"
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_RETRY_BACKOFF", 0.001)
+    monkeypatch.setattr(settings, "PROVIDER_CIRCUIT_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "PROVIDER_CIRCUIT_RESET_TIMEOUT", 0.05)
+    clients = []
+
+    def make_client(**kwargs):
+        options = {"max_workers": 4, "timeout": 1.0, "deadline": 2.0, "max_retries": 2, **kwargs}
+        client = ProviderClient("test", **options)
+        clients.append(client)
+        return client
+
+    yield make_client
+    for client in clients:
+        client.close()
+
+
+@pytest.mark.asyncio
+async def test_transient_error_is_retried(make_client):
+    client = make_client()
+    provider = FakeProvider(ConnectionError("reset"), ProviderResponseError("busy", status_code=503), "ok")
+
+    assert await client.call(provider, "a") == "ok:a"
+    assert provider.calls == 3
+    assert client.retries == 2
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted_raise_unavailable(make_client):
+    client = make_client(max_retries=1)
+    provider = FakeProvider(ConnectionError("reset"))
+
+    with pytest.raises(ProviderUnavailableError, match="reset"):
+        await client.call(provider, "a")
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_response_error_is_not_retried(make_client):
+    client = make_client()
+    provider = FakeProvider(ProviderResponseError("bad input", status_code=400))
+
+    with pytest.raises(ProviderResponseError):
+        await client.call(provider, "a")
+    assert provider.calls == 1
+    assert client.retries == 0
+    # The provider answered, so the failure does not count against the circuit
+    assert client.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_half_opens_after_cooldown(make_client):
+    client = make_client(max_retries=0)
+    failing = FakeProvider(ConnectionError("down"))
+
+    for _ in range(3):
+        with pytest.raises(ProviderUnavailableError, match="down"):
+            await client.call(failing, "a")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # Open: fail fast without calling the provider
+    with pytest.raises(ProviderUnavailableError, match="circuit open"):
+        await client.call(failing, "a")
+    assert failing.calls == 3
+    assert client.rejected == 1
+
+    # After the cooldown one probe is let through; a failed probe re-opens at once
+    await asyncio.sleep(0.06)
+    with pytest.raises(ProviderUnavailableError, match="down"):
+        await client.call(failing, "a")
+    assert failing.calls == 4
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # A successful probe closes the circuit
+    await asyncio.sleep(0.06)
+    assert await client.call(FakeProvider("ok"), "a") == "ok:a"
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_breaker_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_when_primary_stalls(make_client, monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_HEDGE_MIN_SAMPLES", 5)
+    client = make_client(hedge_percentile=95.0)
+    client._latencies.extend([0.01] * 5)
+    provider = FakeProvider((0.5, "primary"), "hedge")
+
+    started = time.perf_counter()
+    assert await client.call(provider, "a") == "hedge:a"
+    assert time.perf_counter() - started < 0.3
+    assert client.hedges == 1
+    assert client.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_latency_samples(make_client):
+    client = make_client(hedge_percentile=95.0)
+    provider = FakeProvider((0.05, "primary"), "hedge")
+
+    assert await client.call(provider, "a") == "primary:a"
+    assert client.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_retries_of_slow_attempts(make_client):
+    client = make_client(timeout=0.05, deadline=0.12, max_retries=5)
+    provider = FakeProvider((0.2, "late"))
+
+    started = time.perf_counter()
+    with pytest.raises(ProviderUnavailableError, match="timed out"):
+        await client.call(provider, "a")
+    assert time.perf_counter() - started < 0.2
+    assert provider.calls <= 3
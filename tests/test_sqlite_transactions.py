@@ -0,0 +1,43 @@
+"""Read-write session transaction tests"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.sqlite_db import Symptom
+
+
+@pytest.mark.asyncio
+async def test_read_then_write_while_another_connection_commits(sqlite_db):
+    """A session that reads, then writes after another connection committed, must not fail"""
+    session = await sqlite_db.get_session()
+    session.add(Symptom(cui="C1", name="Headache"))
+    await session.commit()
+
+    # Read first (the pattern of update/delete endpoints)
+    symptom = (await session.execute(select(Symptom).where(Symptom.cui == "C1"))).scalars().one()
+
+    async def insert_other():
+        other = await sqlite_db.get_session()
+        try:
+            other.add(Symptom(cui="C2", name="Fever"))
+            await other.commit()
+        finally:
+            await other.close()
+
+    # The other connection's commit lands (or waits) between our read and our write
+    other_task = asyncio.create_task(insert_other())
+    await asyncio.sleep(0.2)
+
+    symptom.name = "Cephalalgia"
+    await session.commit()
+    await session.close()
+    await other_task
+
+    session = await sqlite_db.get_read_session()
+    try:
+        names = (await session.execute(select(Symptom.name).order_by(Symptom.cui))).scalars().all()
+        assert names == ["Cephalalgia", "Fever"]
+        assert (await session.execute(select(func.count()).select_from(Symptom))).scalar() == 2
+    finally:
+        await session.close()
@@ -0,0 +1,43 @@
+"""Startup checks of the stored vector size"""
+import numpy as np
+import pytest
+from qdrant_client.models import Distance, VectorParams
+
+from app.core.config import settings
+from app.core.exceptions import VectorSearchError
+from app.models.local_index import LocalVectorIndex
+from app.services.vector_search import vector_search_service
+
+
+@pytest.mark.asyncio
+async def test_existing_collection_of_another_size_is_rejected(qdrant_memory):
+    await qdrant_memory.client.create_collection(
+        collection_name=settings.QDRANT_COLLECTION_NAME,
+        vectors_config=VectorParams(size=settings.EMBEDDING_OUTPUT_DIMENSION // 2, distance=Distance.COSINE),
+    )
+
+    with pytest.raises(VectorSearchError, match="EMBEDDING_OUTPUT_DIMENSION"):
+        await qdrant_memory.ensure_collection()
+    assert not qdrant_memory._collection_ready
+
+
+@pytest.mark.asyncio
+async def test_existing_collection_of_configured_size_is_accepted(qdrant_memory):
+    await qdrant_memory.ensure_collection()
+    qdrant_memory._collection_ready = False
+
+    await qdrant_memory.ensure_collection()
+    assert qdrant_memory._collection_ready
+
+
+@pytest.mark.asyncio
+async def test_snapshot_of_another_size_is_rejected(tmp_path, monkeypatch):
+    snapshot = LocalVectorIndex(8)
+    snapshot.add(["a"], np.ones((1, 8), dtype=np.float32), [{"text": "a"}])
+    snapshot.save(tmp_path)
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_INDEX_PATH", str(tmp_path))
+
+    with pytest.raises(VectorSearchError, match="EMBEDDING_OUTPUT_DIMENSION"):
+        await vector_search_service.load_local_index()
+    assert len(LocalVectorIndex.load(tmp_path, dimension=8)) == 1
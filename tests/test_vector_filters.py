@@ -0,0 +1,41 @@
+"""Payload filters on non-keyword fields"""
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.embedding import _parse_filters
+from app.core.config import settings
+from app.services.embedding_service import embedding_service
+from app.services.vector_search import vector_search_service
+
+
+@pytest.fixture
+def payload_indexes(monkeypatch):
+    indexes = {**settings.QDRANT_PAYLOAD_INDEXES, "severity": "float", "onset": "datetime"}
+    monkeypatch.setattr(settings, "QDRANT_PAYLOAD_INDEXES", indexes)
+
+
+def test_parse_filters_converts_float_and_rejects_datetime(payload_indexes):
+    assert _parse_filters(["severity:1.5", "severity:2"]) == {"severity": [1.5, 2.0]}
+
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_filters(["onset:2024-01-01"])
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_float_filter_matches_by_value(payload_indexes, qdrant_memory, monkeypatch):
+    monkeypatch.setattr(settings, "SIMILARITY_THRESHOLD", 0.0)
+    texts = ["Mild headache", "Severe headache", "Moderate headache"]
+    vectors = await embedding_service.embed_batch(texts)
+    await qdrant_memory.upsert_points(
+        vectors=vectors,
+        payloads=[{"text": text, "severity": severity} for text, severity in zip(texts, [1.0, 1.5, 2.5])],
+    )
+
+    results = await vector_search_service.search("headache severity 1.5", filters=_parse_filters(["severity:1.5"]))
+    assert [result["payload"]["text"] for result in results] == ["Severe headache"]
+
+    results = await vector_search_service.search(
+        "headache severity 1.5 or 2.5", filters=_parse_filters(["severity:1.5", "severity:2.5"])
+    )
+    assert sorted(result["payload"]["text"] for result in results) == ["Moderate headache", "Severe headache"]